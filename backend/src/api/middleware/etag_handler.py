@@ -0,0 +1,23 @@
+# backend/src/api/middleware/etag_handler.py
+from flask import request, Response
+from typing import Optional
+
+def request_variant(name: str) -> str:
+    """Describe the requested representation (endpoint plus query) for ETag derivation"""
+    args = sorted(f"{key}={value}" for key, value in request.args.items(multi=True))
+    return f"{name}?{'&'.join(args)}"
+
+def not_modified(etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds this ETag"""
+    if etag and request.if_none_match.contains(etag):
+        response = Response(status=304)
+        set_etag(response, etag)
+        return response
+    return None
+
+def set_etag(response: Response, etag: str) -> Response:
+    """Attach a strong ETag and require revalidation on every use"""
+    if etag:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -1,5 +1,5 @@
 # backend/src/api/routes/file_routes.py
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 from werkzeug.exceptions import BadRequest, NotFound
 import os
 
@@ -80,9 +80,22 @@ def save_file_content(file_path):
         # Save file content
         FileUtils.write_file_content(full_path, content)
         
+        from services.git.RepositoryManifest import RepositoryManifest
+        RepositoryManifest.apply_changes(repo_path, changed_paths=[file_path])
+        
+        # Patch the stored graph for this one file instead of re-analyzing
+        graph_update = None
+        try:
+            from services.graph.IncrementalGraphUpdater import IncrementalGraphUpdater
+            updater = IncrementalGraphUpdater(current_app.config.get('DB_MANAGER'))
+            graph_update = updater.update_files(project_id, repo_path, changed_paths=[file_path])
+        except Exception as e:
+            current_app.logger.error(f"Incremental graph update failed for {file_path}: {e}")
+        
         return jsonify({
             'status': 'saved',
-            'filePath': file_path
+            'filePath': file_path,
+            'graphUpdate': graph_update
         })
         
     except Exception as e:
@@ -119,6 +132,89 @@ def get_file_dependencies(file_path):
             'error': str(e)
         }), 500
 
+@file_bp.route('/<path:file_path>/edits', methods=['POST'])
+def apply_file_edits(file_path):
+    """Apply editor changes to an open buffer and return only import changes.
+    
+    Send ``content`` to open or resynchronize the buffer, then ``edits``
+    (Monaco content changes) on each keystroke. ``baseVersionId`` guards
+    against edits applied to the wrong buffer state.
+    """
+    try:
+        # Validate file path
+        if not ValidationUtils.is_safe_path(file_path):
+            raise BadRequest('Invalid file path')
+        
+        data = request.get_json()
+        if not data:
+            raise BadRequest('Edit data is required')
+        
+        project_id = data.get('project_id')
+        if not project_id or not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Valid project ID is required')
+        
+        session_id = request.headers.get('X-Session-ID') or data.get('session_id', 'anonymous')
+        version_id = data.get('versionId')
+        
+        from services.parsing.IncrementalDependencyTracker import dependency_tracker
+        
+        # Open or resynchronize with the full buffer content
+        if 'content' in data:
+            buffer = dependency_tracker.open_buffer(session_id, project_id, file_path, data['content'], version_id)
+            if not buffer:
+                raise BadRequest('Unsupported file type')
+            return jsonify({
+                'versionId': version_id,
+                'dependencies': buffer.get_dependencies()
+            })
+        
+        buffer = dependency_tracker.get_buffer(session_id, project_id, file_path)
+        base_version_id = data.get('baseVersionId')
+        out_of_sync = buffer is None
+        if buffer is not None:
+            # Check and apply atomically so concurrent batches with the same
+            # base cannot both pass and apply out of order
+            with buffer.lock:
+                out_of_sync = base_version_id is not None and base_version_id != buffer.version_id
+                if not out_of_sync:
+                    added, removed = buffer.apply_edits(data.get('edits', []))
+                    buffer.version_id = version_id
+        
+        if out_of_sync:
+            return jsonify({
+                'error': 'Buffer out of sync, resend full content',
+                'resync': True
+            }), 409
+        
+        return jsonify({
+            'versionId': version_id,
+            'added': added,
+            'removed': removed
+        })
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': e.description
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@file_bp.route('/<path:file_path>/edits', methods=['DELETE'])
+def close_file_edits(file_path):
+    """Close the open editor buffer for a file"""
+    project_id = request.args.get('project_id', '')
+    session_id = request.headers.get('X-Session-ID') or request.args.get('session_id', 'anonymous')
+    
+    from services.parsing.IncrementalDependencyTracker import dependency_tracker
+    closed = dependency_tracker.close_buffer(session_id, project_id, file_path)
+    
+    return jsonify({
+        'status': 'closed' if closed else 'not_open',
+        'filePath': file_path
+    })
+
 @file_bp.route('/<path:file_path>/dependents', methods=['GET'])
 def get_file_dependents(file_path):
     """Get files that depend on this file"""
@@ -1,14 +1,27 @@
 # backend/src/api/routes/graph_routes.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from werkzeug.exceptions import BadRequest, NotFound
 
+from api.middleware.etag_handler import request_variant, not_modified, set_etag
 from database.GraphDataManager import GraphDataManager
 from services.graph.CentralityCalculator import CentralityCalculator
+from services.graph.GraphBinaryEncoder import GraphBinaryEncoder
+from services.graph.GraphEventBroker import graph_event_broker
+from services.search.SymbolIndex import symbol_index
 from utils.ValidationUtils import ValidationUtils
+from config import Config
+import json
+import uuid
 
 graph_bp = Blueprint('graph', __name__)
 graph_data_manager = GraphDataManager()
 centrality_calculator = CentralityCalculator()
+graph_binary_encoder = GraphBinaryEncoder()
+
+@graph_bp.route('/cache/stats', methods=['GET'])
+def get_graph_cache_stats():
+    """Get in-process graph cache statistics"""
+    return jsonify(graph_data_manager.get_cache_stats())
 
 @graph_bp.route('/<project_id>', methods=['GET'])
 def get_graph_data(project_id):
@@ -18,19 +31,197 @@ def get_graph_data(project_id):
         if not ValidationUtils.is_valid_uuid(project_id):
             raise BadRequest('Invalid project ID format')
         
+        # Answer revalidation from the stored version alone
+        etag = graph_data_manager.get_graph_etag(project_id, request_variant('graph'))
+        if not etag:
+            raise NotFound('Project not found')
+        cached_response = not_modified(etag)
+        if cached_response:
+            return cached_response
+        
+        # Sparse fieldsets (?fields=id,path or ?exclude=functions,classes, edge_* for edges)
+        projection = {
+            'node_fields': _parse_field_list('fields'),
+            'node_exclude': _parse_field_list('exclude'),
+            'edge_fields': _parse_field_list('edge_fields'),
+            'edge_exclude': _parse_field_list('edge_exclude')
+        }
+        has_projection = any(projection.values())
+        
+        # Typed-array layout for the renderer (?format=binary)
+        response_format = request.args.get('format', 'json')
+        if response_format == 'binary':
+            if has_projection or request.args.get('stream'):
+                raise BadRequest('format=binary cannot be combined with stream or field projections')
+            return set_etag(_binary_graph_response(project_id), etag)
+        elif response_format != 'json':
+            raise BadRequest('format must be "json" or "binary"')
+        
+        # Stream straight from storage when requested (?stream=json|ndjson)
+        stream_mode = request.args.get('stream')
+        if stream_mode:
+            if has_projection:
+                raise BadRequest('stream cannot be combined with field projections')
+            return set_etag(_stream_graph_response(project_id, stream_mode), etag)
+        
         # Get graph data
-        graph_data = graph_data_manager.get_graph(project_id)
+        if has_projection:
+            try:
+                graph_data = graph_data_manager.get_graph_projection(project_id, **projection)
+            except ValueError as e:
+                raise BadRequest(str(e))
+        else:
+            graph_data = graph_data_manager.get_graph(project_id)
         
         if not graph_data:
             raise NotFound('Project not found')
         
-        return jsonify(graph_data)
+        return set_etag(jsonify(graph_data), etag)
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': e.description
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': e.description
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@graph_bp.route('/<project_id>/nodes/<path:node_id>', methods=['GET'])
+def get_node_data(project_id, node_id):
+    """Get a single node with all attributes, e.g. its functions and classes"""
+    try:
+        # Validate project ID
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        etag = graph_data_manager.get_graph_etag(project_id, request_variant(f'node:{node_id}'))
+        if not etag:
+            raise NotFound('Project not found')
+        cached_response = not_modified(etag)
+        if cached_response:
+            return cached_response
+        
+        node = graph_data_manager.get_node(project_id, node_id)
+        if not node:
+            raise NotFound('Node not found')
+        
+        return set_etag(jsonify(node), etag)
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': e.description
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': e.description
+        }), 404
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@graph_bp.route('/<project_id>/symbols', methods=['GET'])
+def search_symbols(project_id):
+    """Find functions, classes and interfaces by name.
+    
+    Query parameters: q (required), kind (class|interface|function|method),
+    mode (auto|prefix|fuzzy, default auto) and limit (default 20, max 100).
+    """
+    try:
+        # Validate project ID
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        query = request.args.get('q', '').strip()
+        if not query:
+            raise BadRequest('q is required')
+        
+        kind = request.args.get('kind') or None
+        mode = request.args.get('mode', 'auto')
+        try:
+            limit = max(1, min(int(request.args.get('limit', Config.SEARCH_RESULT_LIMIT)), 100))
+        except ValueError:
+            raise BadRequest('limit must be an integer')
+        
+        etag = graph_data_manager.get_graph_etag(
+            project_id, request_variant(f'symbols:{query}:{kind}:{mode}:{limit}')
+        )
+        if not etag:
+            raise NotFound('Project not found')
+        cached_response = not_modified(etag)
+        if cached_response:
+            return cached_response
+        
+        try:
+            symbols = symbol_index.search(graph_data_manager, project_id, query, kind, mode, limit)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        if symbols is None:
+            raise NotFound('Project not found')
         
+        return set_etag(jsonify({
+            'projectId': project_id,
+            'query': query,
+            'mode': mode,
+            'symbols': symbols
+        }), etag)
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': e.description
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': e.description
+        }), 404
     except Exception as e:
         return jsonify({
             'error': str(e)
         }), 500
 
+@graph_bp.route('/<project_id>/events', methods=['GET'])
+def stream_graph_events(project_id):
+    """Server-Sent Events channel pushing live graph deltas for a project.
+    
+    Clients resume with the standard Last-Event-ID header (or ?since=<seq>);
+    without either, only events published after connecting are sent.
+    """
+    if not ValidationUtils.is_valid_uuid(project_id):
+        return jsonify({'error': 'Invalid project ID format'}), 400
+    
+    resume_from = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        last_seq = int(resume_from) if resume_from else graph_event_broker.get_last_sequence(project_id)
+    except ValueError:
+        return jsonify({'error': 'Invalid sequence number'}), 400
+    
+    def generate(last_seq):
+        # Tell EventSource how long to wait before reconnecting
+        yield 'retry: 3000\n\n'
+        while True:
+            events = graph_event_broker.wait_for_events(project_id, last_seq, Config.GRAPH_EVENT_KEEPALIVE)
+            if not events:
+                yield ': keepalive\n\n'
+                continue
+            for event in events:
+                last_seq = event['seq']
+                payload = json.dumps({**event['data'], 'seq': event['seq'], 'timestamp': event['timestamp']})
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n"
+    
+    return Response(
+        stream_with_context(generate(last_seq)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @graph_bp.route('/<project_id>/centrality', methods=['GET'])
 def get_centrality_data(project_id):
     """Get centrality scores for graph nodes"""
@@ -39,6 +230,14 @@ def get_centrality_data(project_id):
         if not ValidationUtils.is_valid_uuid(project_id):
             raise BadRequest('Invalid project ID format')
         
+        # Centrality only changes with the stored graph
+        etag = graph_data_manager.get_graph_etag(project_id, request_variant('centrality'))
+        if not etag:
+            raise NotFound('Project not found')
+        cached_response = not_modified(etag)
+        if cached_response:
+            return cached_response
+        
         # Get graph data
         graph_data = graph_data_manager.get_graph(project_id)
         
@@ -48,8 +247,63 @@ def get_centrality_data(project_id):
         # Calculate centrality scores
         centrality_scores = centrality_calculator.calculate_all_centralities(graph_data)
         
-        return jsonify(centrality_scores)
+        return set_etag(jsonify(centrality_scores), etag)
+        
+    except Exception as e:
+        return jsonify({
+            'error': str(e)
+        }), 500
+
+@graph_bp.route('/<project_id>/cochange', methods=['POST'])
+def analyze_co_changes(project_id):
+    """Queue mining commit history into churn node attributes and co-change edges"""
+    try:
+        # Validate project ID
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        data = request.get_json(silent=True) or {}
+        max_commits = data.get('commits')
+        min_support = data.get('minSupport')
+        min_confidence = data.get('minConfidence')
+        
+        if max_commits is not None and (
+                not isinstance(max_commits, int) or not 1 <= max_commits <= Config.COCHANGE_MAX_COMMITS):
+            raise BadRequest(f'commits must be between 1 and {Config.COCHANGE_MAX_COMMITS}')
+        if min_support is not None and (not isinstance(min_support, int) or min_support < 1):
+            raise BadRequest('minSupport must be a positive integer')
+        if min_confidence is not None and (
+                not isinstance(min_confidence, (int, float)) or not 0 <= min_confidence <= 1):
+            raise BadRequest('minConfidence must be between 0 and 1')
+        
+        if graph_data_manager.get_graph_version(project_id) is None:
+            raise NotFound('Project not found')
+        
+        # Mining can take a while; it runs as a background job
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job_id = str(uuid.uuid4())
+        job = analysis_job_manager.submit_co_change(
+            job_id, project_id, graph_data_manager.db, max_commits, min_support, min_confidence
+        )
         
+        return jsonify({
+            'projectId': project_id,
+            'jobId': job.project_id,
+            'status': job.status,
+            'statusUrl': f"/api/repository/{job.project_id}/status",
+            'deduplicated': job.project_id != job_id,
+            'queuePosition': analysis_job_manager.get_queue_position(job.project_id),
+            'message': 'Co-change analysis queued'
+        }), 202
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': e.description
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': e.description
+        }), 404
     except Exception as e:
         return jsonify({
             'error': str(e)
@@ -67,8 +321,15 @@ def update_graph_data(project_id):
         if not data:
             raise BadRequest('Graph data is required')
         
-        # Update graph data
+        # Update graph data and push the delta to live subscribers
+        old_graph = graph_data_manager.get_graph(project_id) or {}
         graph_data_manager.update_graph(project_id, data)
+        graph_event_broker.publish_graph_delta(
+            project_id,
+            old_graph,
+            {**data, 'centrality_scores': old_graph.get('centrality_scores', {})},
+            graph_data_manager.get_graph_version(project_id)
+        )
         
         return jsonify({
             'projectId': project_id,
@@ -79,3 +340,50 @@ def update_graph_data(project_id):
         return jsonify({
             'error': str(e)
         }), 500
+
+def _parse_field_list(name: str):
+    """Parse a comma-separated field list query parameter"""
+    value = request.args.get(name, '')
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    return fields or None
+
+def _binary_graph_response(project_id: str) -> Response:
+    """Build the typed-array graph payload from a storage-level projection"""
+    graph_data = graph_data_manager.get_graph_projection(
+        project_id,
+        node_fields=GraphBinaryEncoder.NODE_FIELDS,
+        edge_fields=GraphBinaryEncoder.EDGE_FIELDS
+    )
+    if not graph_data:
+        raise NotFound('Project not found')
+    
+    graph_version = graph_data_manager.get_graph_version(project_id) or 0
+    payload = graph_binary_encoder.encode(graph_data, graph_version)
+    
+    return Response(
+        payload,
+        mimetype='application/octet-stream',
+        headers={'X-Graph-Version': str(graph_version)}
+    )
+
+def _stream_graph_response(project_id: str, stream_mode: str) -> Response:
+    """Build a chunked graph response generated directly from storage"""
+    if stream_mode not in ('json', 'ndjson'):
+        raise BadRequest('stream must be "json" or "ndjson"')
+    
+    graph_version = graph_data_manager.get_graph_version(project_id)
+    if graph_version is None:
+        raise NotFound('Project not found')
+    
+    if stream_mode == 'ndjson':
+        body = graph_data_manager.iter_graph_ndjson(project_id)
+        mimetype = 'application/x-ndjson'
+    else:
+        body = graph_data_manager.iter_graph_json(project_id)
+        mimetype = 'application/json'
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'X-Graph-Version': str(graph_version)}
+    )
@@ -10,11 +10,13 @@ repository_bp = Blueprint('repository', __name__)
 
 @repository_bp.route('/analyze', methods=['POST'])
 def analyze_repository():
-    """Analyze a Git repository and build dependency graph"""
+    """Queue analysis of a Git repository and return its project ID immediately"""
     try:
         data = request.get_json()
         git_url = data.get('gitUrl')
         version = data.get('version', 'personalized')
+        clone_mode = data.get('cloneMode')
+        ref = data.get('ref')
         
         # Log the request
         current_app.logger.info(f"Repository analysis request: {git_url}, version: {version}")
@@ -30,94 +32,37 @@ def analyze_repository():
         if version not in ['personalized', 'random']:
             raise BadRequest('Version must be "personalized" or "random"')
         
+        from services.git.GitObjectCache import GitObjectCache
+        if clone_mode is not None and clone_mode not in GitObjectCache.CLONE_MODES:
+            raise BadRequest(f"cloneMode must be one of: {', '.join(GitObjectCache.CLONE_MODES)}")
+        if ref is not None and not ValidationUtils.is_valid_git_ref(ref):
+            raise BadRequest('Invalid ref')
+        
         # Generate unique project ID
         project_id = str(uuid.uuid4())
         current_app.logger.info(f"Generated project ID: {project_id}")
         
-        # Try to import and initialize services
-        try:
-            from services.git.RepositoryManager import RepositoryManager
-            repo_manager = RepositoryManager()
-            current_app.logger.info("RepositoryManager initialized")
-        except Exception as e:
-            current_app.logger.error(f"Failed to initialize RepositoryManager: {e}")
-            return jsonify({
-                'error': f'Repository manager initialization failed: {str(e)}',
-                'status': 'error'
-            }), 500
-        
-        # Clone repository
-        try:
-            current_app.logger.info(f"Attempting to clone repository: {git_url}")
-            repo_path = repo_manager.clone_repository(git_url, project_id)
-            current_app.logger.info(f"Repository cloned to: {repo_path}")
-        except Exception as e:
-            current_app.logger.error(f"Repository cloning failed: {e}")
-            return jsonify({
-                'error': f'Repository cloning failed: {str(e)}',
-                'status': 'error',
-                'details': 'Make sure Git is installed and the repository is accessible'
-            }), 500
-        
-        # Try to build dependency graph
-        try:
-            from services.graph.GraphBuilder import GraphBuilder
-            graph_builder = GraphBuilder()
-            current_app.logger.info("GraphBuilder initialized")
-            
-            graph_data = graph_builder.build_graph(repo_path)
-            current_app.logger.info(f"Graph built with {len(graph_data.get('nodes', []))} nodes and {len(graph_data.get('edges', []))} edges")
-        except Exception as e:
-            current_app.logger.error(f"Graph building failed: {e}")
-            # Clean up cloned repo on failure
-            if os.path.exists(repo_path):
-                import shutil
-                shutil.rmtree(repo_path)
-            return jsonify({
-                'error': f'Graph building failed: {str(e)}',
-                'status': 'error',
-                'details': 'Failed to analyze repository structure'
-            }), 500
-        
-        # Apply version-specific processing
-        try:
-            from services.personalization.PersonalizationFactory import PersonalizationFactory
-            personalization_factory = PersonalizationFactory()
-            processor = personalization_factory.create_graph_processor(version)
-            processed_graph = processor.process_graph(graph_data)
-            current_app.logger.info("Graph processing completed")
-        except Exception as e:
-            current_app.logger.error(f"Graph processing failed: {e}")
-            processed_graph = graph_data  # Use unprocessed graph as fallback
+        # Run clone → discover → parse → build → centrality → save in the background
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job = analysis_job_manager.submit(
+            project_id, git_url, version,
+            db_manager=current_app.config.get('DB_MANAGER'),
+            clone_mode=clone_mode,
+            ref=ref
+        )
         
-        # Try to save graph data
-        try:
-            from database.GraphDataManager import GraphDataManager
-            graph_data_manager = GraphDataManager(current_app.config.get('DB_MANAGER'))
-            
-            metadata = {
-                'git_url': git_url,
-                'version': version,
-                'created_at': datetime.utcnow().isoformat(),
-                'node_count': len(processed_graph.get('nodes', [])),
-                'edge_count': len(processed_graph.get('edges', []))
-            }
-            
-            graph_data_manager.save_graph(project_id, processed_graph, metadata)
-            current_app.logger.info("Graph data saved to database")
-        except Exception as e:
-            current_app.logger.error(f"Database save failed: {e}")
-            # Continue without failing - return the data even if DB save fails
-            current_app.logger.warning("Continuing without database save")
+        # An identical analysis already in flight answers for this request too
+        deduplicated = job.project_id != project_id
         
         return jsonify({
-            'projectId': project_id,
-            'status': 'success',
-            'nodeCount': len(processed_graph.get('nodes', [])),
-            'edgeCount': len(processed_graph.get('edges', [])),
+            'projectId': job.project_id,
+            'status': job.status,
             'version': version,
-            'message': 'Repository analyzed successfully'
-        })
+            'statusUrl': f"/api/repository/{job.project_id}/status",
+            'deduplicated': deduplicated,
+            'queuePosition': analysis_job_manager.get_queue_position(job.project_id),
+            'message': 'Attached to in-flight repository analysis' if deduplicated else 'Repository analysis queued'
+        }), 202
         
     except BadRequest as e:
         current_app.logger.warning(f"Bad request: {e}")
@@ -134,6 +79,226 @@ def analyze_repository():
             'details': 'Check server logs for more information'
         }), 500
 
+@repository_bp.route('/import', methods=['POST'])
+def import_repository():
+    """Queue analysis of a local directory or archive on the server, without cloning"""
+    try:
+        data = request.get_json() or {}
+        path = data.get('path')
+        version = data.get('version', 'personalized')
+        
+        from config import Config
+        if not Config.LOCAL_IMPORT_ROOTS:
+            return jsonify({
+                'error': 'Local imports are not enabled on this server',
+                'status': 'error'
+            }), 403
+        
+        if not path:
+            raise BadRequest('Path is required')
+        
+        from utils.ValidationUtils import ValidationUtils
+        from services.git.LocalSourceImporter import LocalSourceImporter
+        if not ValidationUtils.is_importable_path(path, Config.LOCAL_IMPORT_ROOTS):
+            raise BadRequest('Path must be absolute and inside an allowed import root')
+        
+        # Import from the resolved path so a swapped symlink cannot redirect it
+        source_path = os.path.realpath(path)
+        if not os.path.isdir(source_path) and not (
+                os.path.isfile(source_path) and LocalSourceImporter.is_archive(source_path)):
+            raise BadRequest('Path must be a directory or a tar/zip archive')
+        
+        if version not in ['personalized', 'random']:
+            raise BadRequest('Version must be "personalized" or "random"')
+        
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        project_id = str(uuid.uuid4())
+        job = analysis_job_manager.submit_local(
+            project_id, source_path, version,
+            db_manager=current_app.config.get('DB_MANAGER')
+        )
+        deduplicated = job.project_id != project_id
+        
+        return jsonify({
+            'projectId': job.project_id,
+            'status': job.status,
+            'version': version,
+            'statusUrl': f"/api/repository/{job.project_id}/status",
+            'deduplicated': deduplicated,
+            'queuePosition': analysis_job_manager.get_queue_position(job.project_id),
+            'message': 'Attached to in-flight repository analysis' if deduplicated else 'Local import queued'
+        }), 202
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in import_repository: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@repository_bp.route('/upload', methods=['POST'])
+def upload_repository_archive():
+    """Queue analysis of an uploaded tar/zip archive of a source tree"""
+    temp_path = None
+    try:
+        from config import Config
+        if request.content_length and request.content_length > Config.MAX_ARCHIVE_SIZE:
+            return jsonify({
+                'error': f'Archive exceeds maximum size of {Config.MAX_ARCHIVE_SIZE // (1024 * 1024)}MB',
+                'status': 'error'
+            }), 413
+        
+        archive = request.files.get('archive')
+        version = request.form.get('version', 'personalized')
+        if archive is None or not archive.filename:
+            raise BadRequest('Archive file is required')
+        
+        from utils.ValidationUtils import ValidationUtils
+        from services.git.LocalSourceImporter import LocalSourceImporter
+        filename = ValidationUtils.sanitize_filename(archive.filename)
+        if not LocalSourceImporter.is_archive(filename):
+            raise BadRequest(f"Archive must be one of: {', '.join(LocalSourceImporter.ARCHIVE_SUFFIXES)}")
+        
+        if version not in ['personalized', 'random']:
+            raise BadRequest('Version must be "personalized" or "random"')
+        
+        # The job extracts from this copy and deletes it when it finishes
+        import tempfile
+        os.makedirs(Config.UPLOAD_STORAGE, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=Config.UPLOAD_STORAGE, suffix=f"-{filename}")
+        with os.fdopen(fd, 'wb') as f:
+            archive.save(f)
+        
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job = analysis_job_manager.submit_local(
+            str(uuid.uuid4()), temp_path, version,
+            db_manager=current_app.config.get('DB_MANAGER'),
+            label=filename,
+            upload=True
+        )
+        temp_path = None
+        
+        return jsonify({
+            'projectId': job.project_id,
+            'status': job.status,
+            'version': version,
+            'statusUrl': f"/api/repository/{job.project_id}/status",
+            'queuePosition': analysis_job_manager.get_queue_position(job.project_id),
+            'message': 'Archive analysis queued'
+        }), 202
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in upload_repository_archive: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+@repository_bp.route('/history', methods=['POST'])
+def analyze_repository_history():
+    """Queue a history analysis: one graph delta per commit over the last N commits"""
+    try:
+        data = request.get_json() or {}
+        git_url = data.get('gitUrl')
+        ref = data.get('ref')
+        max_commits = data.get('commits')
+        
+        if not git_url:
+            raise BadRequest('Git URL is required')
+        
+        from config import Config
+        from utils.ValidationUtils import ValidationUtils
+        if not ValidationUtils.is_valid_git_url(git_url):
+            raise BadRequest('Invalid Git URL format')
+        if ref is not None and not ValidationUtils.is_valid_git_ref(ref):
+            raise BadRequest('Invalid ref')
+        if max_commits is not None and (
+                not isinstance(max_commits, int) or not 1 <= max_commits <= Config.HISTORY_MAX_COMMITS):
+            raise BadRequest(f'commits must be between 1 and {Config.HISTORY_MAX_COMMITS}')
+        
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job_id = str(uuid.uuid4())
+        job = analysis_job_manager.submit_history(job_id, git_url, ref, max_commits)
+        
+        return jsonify({
+            'projectId': job.project_id,
+            'status': job.status,
+            'statusUrl': f"/api/repository/{job.project_id}/status",
+            'historyUrl': f"/api/repository/{job.project_id}/history",
+            'deduplicated': job.project_id != job_id,
+            'queuePosition': analysis_job_manager.get_queue_position(job.project_id),
+            'message': 'History analysis queued'
+        }), 202
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"Error in analyze_repository_history: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@repository_bp.route('/<project_id>/history', methods=['GET'])
+def get_repository_history(project_id):
+    """Get the per-commit graph delta series of a finished history analysis"""
+    try:
+        from utils.ValidationUtils import ValidationUtils
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        from services.analysis.AnalysisJobManager import analysis_job_manager, AnalysisJob
+        job = analysis_job_manager.get_job(project_id)
+        if not job or job.mode != AnalysisJob.HISTORY:
+            raise NotFound('History analysis not found')
+        
+        if job.history is None:
+            return jsonify({
+                'error': f'History analysis is {job.status}',
+                'status': job.status
+            }), 409
+        
+        return jsonify(job.history)
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 404
+    except Exception as e:
+        current_app.logger.error(f"Error in get_repository_history: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@repository_bp.route('/queue', methods=['GET'])
+def get_analysis_queue():
+    """Get analysis queue depth and worker usage"""
+    from services.analysis.AnalysisJobManager import analysis_job_manager
+    return jsonify(analysis_job_manager.get_stats())
+
 @repository_bp.route('/<project_id>/status', methods=['GET'])
 def get_repository_status(project_id):
     """Get the status of a repository analysis"""
@@ -143,21 +308,21 @@ def get_repository_status(project_id):
         if not ValidationUtils.is_valid_uuid(project_id):
             raise BadRequest('Invalid project ID format')
         
+        # Jobs tracked by this process report their live stage and progress
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job = analysis_job_manager.get_job(project_id)
+        if job:
+            return jsonify({
+                **job.to_dict(),
+                'queuePosition': analysis_job_manager.get_queue_position(project_id)
+            })
+        
         try:
             from database.GraphDataManager import GraphDataManager
             graph_data_manager = GraphDataManager(current_app.config.get('DB_MANAGER'))
             
             # Get project metadata
             project_data = graph_data_manager.get_project_metadata(project_id)
-            
-            if not project_data:
-                raise NotFound('Project not found')
-            
-            return jsonify({
-                'projectId': project_id,
-                'status': 'completed',
-                'metadata': project_data
-            })
         except Exception as e:
             current_app.logger.error(f"Error getting project status: {e}")
             return jsonify({
@@ -166,11 +331,26 @@ def get_repository_status(project_id):
                 'error': str(e)
             })
         
+        if not project_data:
+            raise NotFound('Project not found')
+        
+        return jsonify({
+            'projectId': project_id,
+            'status': 'completed',
+            'progress': 100.0,
+            'metadata': project_data
+        })
+        
     except BadRequest as e:
         return jsonify({
             'error': str(e),
             'status': 'error'
         }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 404
     except Exception as e:
         current_app.logger.error(f"Error in get_repository_status: {e}")
         return jsonify({
@@ -178,6 +358,105 @@ def get_repository_status(project_id):
             'status': 'error'
         }), 500
 
+@repository_bp.route('/<project_id>/cancel', methods=['POST'])
+def cancel_repository_analysis(project_id):
+    """Cancel a queued or running repository analysis"""
+    try:
+        from utils.ValidationUtils import ValidationUtils
+        # Validate project ID
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        job = analysis_job_manager.get_job(project_id)
+        if not job:
+            raise NotFound('Analysis job not found')
+        
+        if not analysis_job_manager.cancel(project_id):
+            return jsonify({
+                'error': f'Analysis already {job.status}',
+                'status': job.status
+            }), 409
+        
+        return jsonify(job.to_dict())
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 404
+    except Exception as e:
+        current_app.logger.error(f"Error in cancel_repository_analysis: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@repository_bp.route('/<project_id>/watch', methods=['GET', 'POST', 'DELETE'])
+def watch_repository(project_id):
+    """Start (POST), stop (DELETE) or inspect (GET) watching a project's checkout"""
+    try:
+        from utils.ValidationUtils import ValidationUtils
+        # Validate project ID
+        if not ValidationUtils.is_valid_uuid(project_id):
+            raise BadRequest('Invalid project ID format')
+        
+        from services.git.WatchScheduler import watch_scheduler
+        from services.graph.ChangeCoalescer import change_coalescer
+        
+        if request.method == 'POST':
+            from services.git.RepositoryManager import RepositoryManager
+            repo_path = RepositoryManager().get_repository_path(project_id)
+            if not repo_path:
+                raise NotFound('Repository checkout not found')
+            
+            data = request.get_json(silent=True) or {}
+            backend = data.get('backend')
+            from services.git.WatcherBackend import BACKENDS
+            if backend is not None and backend != 'auto' and backend not in BACKENDS:
+                raise BadRequest(f"backend must be one of: auto, {', '.join(BACKENDS)}")
+            
+            # Bursts of changes become one incremental graph update
+            callback = change_coalescer.callback_for(project_id, repo_path, current_app.config.get('DB_MANAGER'))
+            watch_scheduler.watch(project_id, repo_path, callback=callback, backend=backend)
+            return jsonify(watch_scheduler.get_stats(project_id)), 201
+        
+        if request.method == 'DELETE':
+            if not watch_scheduler.unwatch(project_id):
+                raise NotFound('Project is not being watched')
+            change_coalescer.discard(project_id)
+            return jsonify({
+                'projectId': project_id,
+                'status': 'unwatched'
+            })
+        
+        stats = watch_scheduler.get_stats(project_id)
+        if stats is None:
+            raise NotFound('Project is not being watched')
+        return jsonify({**stats, 'updates': change_coalescer.get_stats(project_id)})
+        
+    except BadRequest as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 400
+    except NotFound as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 404
+    except Exception as e:
+        current_app.logger.error(f"Error in watch_repository: {e}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
 @repository_bp.route('/<project_id>', methods=['DELETE'])
 def delete_repository(project_id):
     """Delete a repository and its associated data"""
@@ -187,6 +466,17 @@ def delete_repository(project_id):
         if not ValidationUtils.is_valid_uuid(project_id):
             raise BadRequest('Invalid project ID format')
         
+        # Stop any analysis still writing to this project
+        from services.analysis.AnalysisJobManager import analysis_job_manager
+        analysis_job_manager.cancel(project_id)
+        
+        from services.git.WatchScheduler import watch_scheduler
+        watch_scheduler.unwatch(project_id)
+        from services.graph.ChangeCoalescer import change_coalescer
+        change_coalescer.discard(project_id)
+        from services.graph.GraphEventBroker import graph_event_broker
+        graph_event_broker.forget(project_id)
+        
         # Delete repository files
         try:
             from services.git.RepositoryManager import RepositoryManager
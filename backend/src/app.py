@@ -1,9 +1,10 @@
 # backend/src/app.py
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
 import os
 import sys
+import json
 import logging
 from datetime import datetime
 
@@ -57,7 +58,8 @@ def create_app(config_class=None):
     CORS(app, 
          origins=app.config['CORS_ORIGINS'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         allow_headers=['Content-Type', 'Authorization', 'X-User-ID', 'X-Session-ID'],
+         allow_headers=['Content-Type', 'Authorization', 'X-User-ID', 'X-Session-ID', 'If-None-Match'],
+         expose_headers=['ETag', 'X-Graph-Version'],
          supports_credentials=True)
     
     # Setup error handlers
@@ -93,6 +95,13 @@ def create_app(config_class=None):
     except Exception as e:
         app.logger.warning(f"Analytics middleware initialization failed: {e}")
     
+    # Periodic pruning of the shared blob store and git cache
+    try:
+        from services.git.StoreMaintenance import store_maintenance
+        store_maintenance.start()
+    except Exception as e:
+        app.logger.warning(f"Store maintenance initialization failed: {e}")
+    
     # Register blueprints with error handling
     blueprints = [
         ('api.routes.repository_routes', 'repository_bp', '/api/repository'),
@@ -204,9 +213,25 @@ def create_app(config_class=None):
             if not app.config.get('DB_MANAGER'):
                 return jsonify({'error': 'Database not available'}), 503
             
+            from api.middleware.etag_handler import request_variant, not_modified, set_etag
             from database.GraphDataManager import GraphDataManager
             graph_data_manager = GraphDataManager(app.config['DB_MANAGER'])
             
+            # Answer revalidation from the stored version alone
+            etag = graph_data_manager.get_graph_etag(project_id, request_variant('project'))
+            if not etag:
+                return jsonify({'error': 'Project not found'}), 404
+            cached_response = not_modified(etag)
+            if cached_response:
+                return cached_response
+            
+            # Stream straight from storage when requested (?stream=json|ndjson)
+            stream_mode = request.args.get('stream')
+            if stream_mode:
+                if stream_mode not in ('json', 'ndjson'):
+                    return jsonify({'error': 'stream must be "json" or "ndjson"'}), 400
+                return set_etag(stream_project(graph_data_manager, project_id, stream_mode), etag)
+            
             # Get graph data
             graph_data = graph_data_manager.get_graph(project_id)
             if not graph_data:
@@ -215,14 +240,39 @@ def create_app(config_class=None):
             # Get project metadata
             metadata = graph_data_manager.get_project_metadata(project_id)
             
-            return jsonify({
+            return set_etag(jsonify({
                 'graph': graph_data,
                 'metadata': metadata
-            })
+            }), etag)
         except Exception as e:
             app.logger.error(f"Error getting project: {e}")
             return jsonify({'error': str(e)}), 500
     
+    def stream_project(graph_data_manager, project_id, stream_mode):
+        """Stream project metadata followed by the stored graph"""
+        graph_version = graph_data_manager.get_graph_version(project_id)
+        metadata = graph_data_manager.get_project_metadata(project_id)
+        
+        def generate_json():
+            yield b'{"metadata":' + json.dumps(metadata, default=str).encode() + b',"graph":'
+            yield from graph_data_manager.iter_graph_json(project_id)
+            yield b'}'
+        
+        def generate_ndjson():
+            yield json.dumps({'kind': 'metadata', 'data': metadata}, default=str).encode() + b'\n'
+            yield from graph_data_manager.iter_graph_ndjson(project_id)
+        
+        if stream_mode == 'ndjson':
+            body, mimetype = generate_ndjson(), 'application/x-ndjson'
+        else:
+            body, mimetype = generate_json(), 'application/json'
+        
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'X-Graph-Version': str(graph_version)}
+        )
+    
     # Search endpoint
     @app.route('/api/search', methods=['POST'])
     def search_files():
@@ -232,36 +282,29 @@ def create_app(config_class=None):
             if not data or 'query' not in data:
                 return jsonify({'error': 'Query is required'}), 400
             
-            query = data['query'].lower()
+            query = data['query']
             project_id = data.get('projectId')
             
             if not app.config.get('DB_MANAGER') or not project_id:
                 return jsonify([])
             
-            # Simple search implementation
+            from config import Config
+            try:
+                limit = int(data.get('limit', Config.SEARCH_RESULT_LIMIT))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'limit must be an integer'}), 400
+            limit = max(1, min(limit, 100))
+            
+            # Served from the per-project trigram index rather than a scan of every node
             from database.GraphDataManager import GraphDataManager
+            from services.search.SearchIndexManager import search_index_manager
             graph_data_manager = GraphDataManager(app.config['DB_MANAGER'])
-            graph_data = graph_data_manager.get_graph(project_id)
-            
-            if not graph_data:
-                return jsonify([])
-            
-            # Filter nodes by query
-            results = []
-            for node in graph_data.get('nodes', []):
-                node_name = node.get('name', '').lower()
-                node_path = node.get('path', '').lower()
-                
-                if query in node_name or query in node_path:
-                    results.append({
-                        **node,
-                        'relevanceScore': 0.8 if query in node_name else 0.5
-                    })
-            
-            # Sort by relevance
-            results.sort(key=lambda x: x.get('relevanceScore', 0), reverse=True)
+            matches = search_index_manager.search(graph_data_manager, project_id, query, limit)
             
-            return jsonify(results[:20])  # Return top 20 results
+            return jsonify([
+                {**node, 'relevanceScore': score}
+                for node, score in matches
+            ])
         except Exception as e:
             app.logger.error(f"Error in search: {e}")
             return jsonify([])
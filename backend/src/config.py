@@ -18,20 +18,84 @@ class Config:
     REPOSITORY_STORAGE = os.path.join(BASE_DIR, '../../data/repositories')
     CACHE_STORAGE = os.path.join(BASE_DIR, '../../data/cache')
     ANALYTICS_STORAGE = os.path.join(BASE_DIR, '../../data/analytics')
+    GIT_CACHE_STORAGE = os.path.join(BASE_DIR, '../../data/git-cache')
+    BLOB_STORE = os.path.join(BASE_DIR, '../../data/blob-store')
+    GRAPH_ARTIFACT_CACHE = os.path.join(BASE_DIR, '../../data/graph-artifacts')
+    UPLOAD_STORAGE = os.path.join(BASE_DIR, '../../data/uploads')
     
     # Git repository settings
     MAX_REPOSITORY_SIZE = 500 * 1024 * 1024  # 500MB
+    GIT_FETCH_TIMEOUT = 300  # 5 minutes
+    GIT_CLONE_MODE = 'sparse'  # full | blobless | sparse (analyzable files only)
+    GIT_SIZE_POLL_INTERVAL = 0.1  # seconds between size checks while fetching
+    GIT_CACHE_MAX_SIZE = 5 * 1024 * 1024 * 1024  # 5GB of cached object stores
+    BLOB_STORE_PRUNE_GRACE = 60 * 60  # seconds a new blob is kept before it can be pruned
+    STORE_MAINTENANCE_INTERVAL = 60 * 60  # seconds between blob store and git cache pruning
+    GRAPH_ARTIFACT_CACHE_MAX_SIZE = 1024 * 1024 * 1024  # 1GB of finished analyses
     ALLOWED_FILE_EXTENSIONS = {
         '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.c', '.h',
         '.css', '.scss', '.html', '.php', '.rb', '.go', '.rs', '.swift',
         '.json', '.xml', '.yml', '.yaml', '.md', '.txt'
     }
+    # Never analyzed (dot-directories are skipped as well)
+    IGNORED_DIRECTORIES = {'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build'}
+    
+    # Local ingestion: directories and archives under these roots can be
+    # imported by path (none by default); archives can always be uploaded
+    LOCAL_IMPORT_ROOTS = [root for root in os.environ.get('LOCAL_IMPORT_ROOTS', '').split(os.pathsep) if root]
+    MAX_ARCHIVE_SIZE = 1024 * 1024 * 1024  # 1GB uploaded archive
+    
+    # Repository watching
+    WATCH_BACKEND = 'auto'  # auto | inotify | polling
+    WATCH_IGNORE_PATTERNS = ['*.swp', '*.swx', '*~', '.#*', '*.tmp-*']  # editor and atomic-write temp files
+    WATCH_MIN_INTERVAL = 1  # seconds between polls of a project that just changed
+    WATCH_MAX_INTERVAL = 30  # seconds between polls of an idle project
+    WATCH_BACKOFF = 1.5  # interval multiplier after each idle poll
+    WATCH_WORKERS = 2
+    CHANGE_DEBOUNCE_WINDOW = 0.5  # seconds of quiet before a burst of changes is applied
+    CHANGE_MAX_DELAY = 5  # seconds a busy project waits at most for its update
+    
+    # Bump whenever parser or graph output changes, to invalidate cached results
+    ANALYZER_VERSION = 1
+    
+    # Background analysis settings
+    ANALYSIS_WORKERS = 2
+    CLONE_WORKERS = 2  # concurrent clones/fetches across all analysis workers
+    ANALYSIS_MAX_FINISHED_JOBS = 200
+    HISTORY_DEFAULT_COMMITS = 20
+    HISTORY_MAX_COMMITS = 500
+    
+    # Change history mining (churn and co-change coupling)
+    COCHANGE_DEFAULT_COMMITS = 10000
+    COCHANGE_MAX_COMMITS = 100000
+    COCHANGE_MIN_SUPPORT = 3  # commits a pair must share
+    COCHANGE_MIN_CONFIDENCE = 0.5  # share of one file's commits that touch the other
+    COCHANGE_MAX_FILES_PER_COMMIT = 50  # larger commits count for churn only
+    COCHANGE_MAX_PAIRS = 200000  # live pair counters before the weakest are evicted
+    COCHANGE_MAX_EDGES = 2000
     
     # Graph processing settings
     MAX_NODES = 10000
     MAX_EDGES = 50000
     CENTRALITY_ITERATIONS = 100
     
+    # In-process graph cache settings
+    GRAPH_CACHE_MAX_ENTRIES = 32
+    GRAPH_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+    
+    # Live graph update settings
+    GRAPH_EVENT_BUFFER_SIZE = 500  # events kept per project for resume
+    GRAPH_EVENT_KEEPALIVE = 15  # seconds between SSE keepalives
+    
+    # Editor session settings (keystroke-level dependency detection)
+    EDITOR_SESSION_LIMIT = 500
+    EDITOR_SESSION_TTL = 30 * 60  # 30 minutes idle
+    
+    # Search index settings
+    SEARCH_INDEX_MAX_PROJECTS = 16
+    SEARCH_INDEX_MAX_BYTES = 128 * 1024 * 1024  # 128MB
+    SEARCH_RESULT_LIMIT = 20
+    
     # User model settings
     USER_MODEL_UPDATE_INTERVAL = 300  # 5 minutes
     INTERACTION_BATCH_SIZE = 50
@@ -1,15 +1,41 @@
 # backend/src/database/GraphDataManager.py
 import json
-from typing import Dict, Any, Optional, List
+import re
+import codecs
+import hashlib
+from contextlib import contextmanager, closing
+from typing import Dict, Any, Optional, List, Iterator, Sequence
 from datetime import datetime
 
 from .SQLiteManager import SQLiteManager
+from .SymbolDataManager import SymbolDataManager
+from config import Config
+from utils.CacheUtils import MemoryLRUCache
+
+# Decoded graphs shared by every GraphDataManager in the process,
+# keyed by (db_path, project_id, graph_version)
+_graph_cache = MemoryLRUCache(
+    max_entries=Config.GRAPH_CACHE_MAX_ENTRIES,
+    max_bytes=Config.GRAPH_CACHE_MAX_BYTES
+)
 
 class GraphDataManager:
     """Manages graph data storage and retrieval"""
     
+    # Bytes read from a stored JSON column per streamed chunk
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
+    # Stored graph columns in streaming order, with their empty-value fallbacks
+    STREAM_COLUMNS = [
+        ('nodes', '[]'),
+        ('edges', '[]'),
+        ('metrics', '{}'),
+        ('centrality_scores', '{}')
+    ]
+    
     def __init__(self, db_manager: SQLiteManager = None):
         self.db = db_manager or SQLiteManager('codeflow.db')
+        self.cache = _graph_cache
     
     def save_graph(self, project_id: str, graph_data: Dict[str, Any], metadata: Dict[str, Any] = None):
         """Save graph data for a project"""
@@ -26,27 +52,47 @@ class GraphDataManager:
                 )
             )
             
-            # Save graph data
+            # Save graph data, keeping the version monotonic across replaces
+            nodes = json.dumps(graph_data.get('nodes', []))
             self.db.execute_update(
                 """INSERT OR REPLACE INTO graph_data 
-                   (project_id, nodes, edges, metrics)
-                   VALUES (?, ?, ?, ?)""",
+                   (project_id, nodes, edges, metrics, nodes_hash, graph_version)
+                   VALUES (?, ?, ?, ?, ?,
+                           COALESCE((SELECT graph_version FROM graph_data WHERE project_id = ?), 0) + 1)""",
                 (
                     project_id,
-                    json.dumps(graph_data.get('nodes', [])),
+                    nodes,
                     json.dumps(graph_data.get('edges', [])),
-                    json.dumps(graph_data.get('metrics', {}))
+                    json.dumps(graph_data.get('metrics', {})),
+                    self._content_hash(nodes),
+                    project_id
                 )
             )
             
         except Exception as e:
             raise RuntimeError(f"Failed to save graph data: {e}")
+        finally:
+            self.invalidate_cache(project_id)
     
     def get_graph(self, project_id: str) -> Optional[Dict[str, Any]]:
-        """Get graph data for a project"""
+        """Get graph data for a project.
+        
+        Decoded graphs are served from the in-process cache while the stored
+        graph version is unchanged. Callers must treat the returned nodes and
+        edges as read-only and copy them before modifying.
+        """
         try:
+            version = self.get_graph_version(project_id)
+            if version is None:
+                return None
+            
+            cache_key = (self.db.db_path, project_id, version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            
             rows = self.db.execute_query(
-                """SELECT nodes, edges, metrics, centrality_scores 
+                """SELECT nodes, edges, metrics, centrality_scores, graph_version 
                    FROM graph_data WHERE project_id = ?""",
                 (project_id,)
             )
@@ -55,46 +101,341 @@ class GraphDataManager:
                 return None
             
             row = rows[0]
-            return {
+            graph_data = {
                 'nodes': json.loads(row['nodes']),
                 'edges': json.loads(row['edges']),
                 'metrics': json.loads(row['metrics']) if row['metrics'] else {},
                 'centrality_scores': json.loads(row['centrality_scores']) if row['centrality_scores'] else {}
             }
             
+            # Raw JSON length is a cheap proxy for the decoded size
+            size = sum(len(row[column] or '') for column in ('nodes', 'edges', 'metrics', 'centrality_scores'))
+            self.cache.set((self.db.db_path, project_id, row['graph_version']), graph_data, size)
+            
+            return dict(graph_data)
+            
         except Exception as e:
             raise RuntimeError(f"Failed to get graph data: {e}")
     
+    def get_graph_projection(self, project_id: str,
+                             node_fields: Sequence[str] = None, node_exclude: Sequence[str] = None,
+                             edge_fields: Sequence[str] = None, edge_exclude: Sequence[str] = None) -> Optional[Dict[str, Any]]:
+        """Get graph data with only the requested node and edge attributes.
+        
+        The projection runs inside SQLite with the JSON1 functions, so large
+        attributes such as ``functions`` and ``classes`` are never decoded.
+        ``*_fields`` keeps only the listed keys; ``*_exclude`` drops them.
+        """
+        try:
+            version = self.get_graph_version(project_id)
+            if version is None:
+                return None
+            
+            projection = (
+                tuple(node_fields or ()), tuple(node_exclude or ()),
+                tuple(edge_fields or ()), tuple(edge_exclude or ())
+            )
+            cache_key = (self.db.db_path, project_id, version, projection)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return dict(cached)
+            
+            nodes_sql, nodes_params = self._projection_query('nodes', node_fields, node_exclude)
+            edges_sql, edges_params = self._projection_query('edges', edge_fields, edge_exclude)
+            
+            rows = self.db.execute_query(
+                f"""SELECT ({nodes_sql}) AS nodes, ({edges_sql}) AS edges,
+                          metrics, centrality_scores, graph_version
+                   FROM graph_data WHERE project_id = ?""",
+                (*nodes_params, *edges_params, project_id)
+            )
+            
+            if not rows:
+                return None
+            
+            row = rows[0]
+            graph_data = {
+                'nodes': json.loads(row['nodes']),
+                'edges': json.loads(row['edges']),
+                'metrics': json.loads(row['metrics']) if row['metrics'] else {},
+                'centrality_scores': json.loads(row['centrality_scores']) if row['centrality_scores'] else {}
+            }
+            
+            size = sum(len(row[column] or '') for column in ('nodes', 'edges', 'metrics', 'centrality_scores'))
+            self.cache.set((self.db.db_path, project_id, row['graph_version'], projection), graph_data, size)
+            
+            return dict(graph_data)
+            
+        except ValueError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Failed to get graph projection: {e}")
+    
+    def get_node(self, project_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single stored node with all of its attributes"""
+        try:
+            rows = self.db.execute_query(
+                """SELECT n.value AS node
+                   FROM graph_data g, json_each(g.nodes) n
+                   WHERE g.project_id = ? AND json_extract(n.value, '$.id') = ?
+                   LIMIT 1""",
+                (project_id, node_id)
+            )
+            return json.loads(rows[0]['node']) if rows else None
+            
+        except Exception as e:
+            raise RuntimeError(f"Failed to get node: {e}")
+    
+    def _projection_query(self, column: str, fields: Sequence[str] = None, exclude: Sequence[str] = None):
+        """Build a correlated subquery projecting each item of a stored JSON array"""
+        if fields and exclude:
+            raise ValueError(f"Cannot combine fields and exclude for {column}")
+        
+        for name in list(fields or []) + list(exclude or []):
+            if not re.fullmatch(r'\w+', name):
+                raise ValueError(f"Invalid field name: {name}")
+        
+        if fields:
+            placeholders = ', '.join('?' for _ in fields)
+            item_sql = f"""json((SELECT json_group_object(f.key, f.value)
+                                   FROM json_each(item.value) f
+                                   WHERE f.key IN ({placeholders})))"""
+            params = list(fields)
+        elif exclude:
+            paths = ', '.join(f"'$.\"{name}\"'" for name in exclude)
+            item_sql = f"json_remove(item.value, {paths})"
+            params = []
+        else:
+            item_sql = "json(item.value)"
+            params = []
+        
+        sql = f"""SELECT COALESCE(json_group_array({item_sql}), '[]')
+                   FROM (SELECT value FROM json_each(graph_data.{column}) ORDER BY key) item"""
+        return sql, params
+    
+    def get_graph_version(self, project_id: str) -> Optional[int]:
+        """Get the current stored graph version for a project"""
+        rows = self.db.execute_query(
+            "SELECT graph_version FROM graph_data WHERE project_id = ?",
+            (project_id,)
+        )
+        return rows[0]['graph_version'] if rows else None
+    
+    def get_nodes_hash(self, project_id: str) -> Optional[str]:
+        """Get the content hash of the stored nodes.
+        
+        Unlike the graph version, this only changes when nodes change, so
+        centrality-only saves leave it alone. Rows saved before the hash
+        existed fall back to a version-derived token.
+        """
+        rows = self.db.execute_query(
+            "SELECT COALESCE(nodes_hash, 'v' || graph_version) AS nodes_hash FROM graph_data WHERE project_id = ?",
+            (project_id,)
+        )
+        return rows[0]['nodes_hash'] if rows else None
+    
+    def _content_hash(self, serialized: str) -> str:
+        return hashlib.sha1(serialized.encode()).hexdigest()
+    
+    def get_graph_etag(self, project_id: str, variant: str = '') -> Optional[str]:
+        """Get a strong ETag for a representation of the stored graph.
+        
+        Derived from the stored graph version with a single indexed lookup,
+        so revalidation never loads or serializes the graph itself.
+        """
+        rows = self.db.execute_query(
+            "SELECT graph_version, updated_at FROM graph_data WHERE project_id = ?",
+            (project_id,)
+        )
+        if not rows:
+            return None
+        
+        row = rows[0]
+        token = f"{project_id}:{row['graph_version']}:{row['updated_at']}:{variant}"
+        return hashlib.sha1(token.encode()).hexdigest()
+    
+    def invalidate_cache(self, project_id: str) -> int:
+        """Drop all cached graph versions for a project"""
+        db_path = self.db.db_path
+        return self.cache.invalidate(lambda key: key[0] == db_path and key[1] == project_id)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get graph cache hit/miss and memory statistics"""
+        return self.cache.get_stats()
+    
+    def iter_graph_json(self, project_id: str) -> Iterator[bytes]:
+        """Stream the stored graph as a JSON object without decoding it.
+        
+        The stored column text is copied through in fixed-size chunks, with
+        nodes first, so memory use does not grow with the graph size.
+        """
+        with self._open_graph_snapshot(project_id) as (conn, row):
+            for index, (column, empty) in enumerate(self.STREAM_COLUMNS):
+                yield ('{' if index == 0 else ',').encode() + json.dumps(column).encode() + b':'
+                for chunk in self._iter_column_bytes(conn, row, column, empty):
+                    yield chunk
+            yield b'}'
+    
+    def iter_graph_ndjson(self, project_id: str) -> Iterator[bytes]:
+        """Stream the stored graph as newline-delimited JSON records.
+        
+        Emits a header, one record per node, one per edge, then metrics and
+        centrality scores. Nodes and edges are decoded one at a time.
+        """
+        with self._open_graph_snapshot(project_id) as (conn, row):
+            yield self._ndjson_line({
+                'kind': 'header',
+                'projectId': project_id,
+                'graphVersion': row['graph_version']
+            })
+            
+            for column, kind in (('nodes', 'node'), ('edges', 'edge')):
+                with closing(self._iter_column_text(conn, row, column, '[]')) as chunks:
+                    for item in self._iter_json_array(chunks):
+                        yield self._ndjson_line({'kind': kind, 'data': item})
+            
+            for column, kind in (('metrics', 'metrics'), ('centrality_scores', 'centrality')):
+                text = ''.join(self._iter_column_text(conn, row, column, '{}'))
+                yield self._ndjson_line({'kind': kind, 'data': json.loads(text)})
+            
+            yield self._ndjson_line({'kind': 'end'})
+    
+    @contextmanager
+    def _open_graph_snapshot(self, project_id: str):
+        """Open a read transaction pinned to the project's current graph row"""
+        conn = self.db.get_connection()
+        try:
+            conn.execute('BEGIN')
+            rows = conn.execute(
+                """SELECT rowid, graph_version,
+                          nodes IS NULL AS nodes_null,
+                          edges IS NULL AS edges_null,
+                          metrics IS NULL AS metrics_null,
+                          centrality_scores IS NULL AS centrality_scores_null
+                   FROM graph_data WHERE project_id = ?""",
+                (project_id,)
+            ).fetchall()
+            if not rows:
+                raise KeyError(f"No graph data for project {project_id}")
+            
+            yield conn, rows[0]
+        finally:
+            conn.rollback()
+            conn.close()
+    
+    def _iter_column_bytes(self, conn, row, column: str, empty: str) -> Iterator[bytes]:
+        """Read a stored JSON column incrementally"""
+        if row[f'{column}_null']:
+            yield empty.encode()
+            return
+        
+        with conn.blobopen('graph_data', column, row['rowid'], readonly=True) as blob:
+            if len(blob) == 0:
+                yield empty.encode()
+                return
+            while True:
+                chunk = blob.read(self.STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    
+    def _iter_column_text(self, conn, row, column: str, empty: str) -> Iterator[str]:
+        """Read a stored JSON column incrementally as text"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in self._iter_column_bytes(conn, row, column, empty):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+    
+    def _iter_json_array(self, chunks: Iterator[str]) -> Iterator[Any]:
+        """Decode the items of a JSON array of objects from text chunks"""
+        decoder = json.JSONDecoder()
+        buffer = ''
+        position = 0
+        exhausted = False
+        started = False
+        
+        while True:
+            # Skip separators between items
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if not started and position < len(buffer):
+                if buffer[position] != '[':
+                    raise ValueError('Expected JSON array')
+                started = True
+                position += 1
+                continue
+            if started and position < len(buffer) and buffer[position] == ']':
+                return
+            
+            if position < len(buffer):
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    # An item ending exactly at the buffer end may be truncated
+                    if end < len(buffer) or exhausted:
+                        yield item
+                        position = end
+                        continue
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise
+            elif exhausted:
+                return
+            
+            # Need more data: drop consumed text and append the next chunk
+            buffer = buffer[position:]
+            position = 0
+            try:
+                buffer += next(chunks)
+            except StopIteration:
+                exhausted = True
+    
+    def _ndjson_line(self, record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, separators=(',', ':')).encode() + b'\n'
+    
     def update_graph(self, project_id: str, graph_data: Dict[str, Any]):
         """Update existing graph data"""
         try:
+            nodes = json.dumps(graph_data.get('nodes', []))
             self.db.execute_update(
                 """UPDATE graph_data 
-                   SET nodes = ?, edges = ?, metrics = ?
+                   SET nodes = ?, edges = ?, metrics = ?, nodes_hash = ?,
+                       graph_version = graph_version + 1,
+                       updated_at = CURRENT_TIMESTAMP
                    WHERE project_id = ?""",
                 (
-                    json.dumps(graph_data.get('nodes', [])),
+                    nodes,
                     json.dumps(graph_data.get('edges', [])),
                     json.dumps(graph_data.get('metrics', {})),
+                    self._content_hash(nodes),
                     project_id
                 )
             )
             
         except Exception as e:
             raise RuntimeError(f"Failed to update graph data: {e}")
+        finally:
+            self.invalidate_cache(project_id)
     
     def save_centrality_scores(self, project_id: str, centrality_scores: Dict[str, Any]):
         """Save centrality scores for a project"""
         try:
             self.db.execute_update(
                 """UPDATE graph_data 
-                   SET centrality_scores = ?
+                   SET centrality_scores = ?,
+                       graph_version = graph_version + 1,
+                       updated_at = CURRENT_TIMESTAMP
                    WHERE project_id = ?""",
                 (json.dumps(centrality_scores), project_id)
             )
             
         except Exception as e:
             raise RuntimeError(f"Failed to save centrality scores: {e}")
+        finally:
+            self.invalidate_cache(project_id)
     
     def get_project_metadata(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get project metadata"""
@@ -126,6 +467,13 @@ class GraphDataManager:
     def delete_project(self, project_id: str) -> bool:
         """Delete a project and all associated data"""
         try:
+            # Foreign keys are not enforced, so ON DELETE CASCADE never
+            # fires; dependent rows are removed explicitly
+            SymbolDataManager(self.db).delete_symbols(project_id)
+            self.db.execute_update(
+                "DELETE FROM graph_data WHERE project_id = ?",
+                (project_id,)
+            )
             affected = self.db.execute_update(
                 "DELETE FROM projects WHERE id = ?",
                 (project_id,)
@@ -134,6 +482,8 @@ class GraphDataManager:
             
         except Exception as e:
             raise RuntimeError(f"Failed to delete project: {e}")
+        finally:
+            self.invalidate_cache(project_id)
     
     def list_projects(self, limit: int = 50) -> List[Dict[str, Any]]:
         """List recent projects"""
@@ -22,6 +22,9 @@ class SQLiteManager:
         """Initialize database with required tables"""
         try:
             with sqlite3.connect(self.db_path) as conn:
+                # WAL lets long-running streaming reads proceed alongside writes
+                conn.execute("PRAGMA journal_mode=WAL")
+                
                 conn.executescript("""
                     -- Projects table
                     CREATE TABLE IF NOT EXISTS projects (
@@ -41,11 +44,26 @@ class SQLiteManager:
                         edges TEXT NOT NULL,
                         metrics TEXT,
                         centrality_scores TEXT,
+                        graph_version INTEGER NOT NULL DEFAULT 1,
+                        nodes_hash TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
                     );
                     
+                    -- Symbol table (functions, classes, interfaces per file)
+                    CREATE TABLE IF NOT EXISTS symbols (
+                        project_id TEXT NOT NULL,
+                        name TEXT NOT NULL,
+                        name_lower TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        path TEXT NOT NULL,
+                        node_id TEXT NOT NULL,
+                        line INTEGER DEFAULT 0,
+                        container TEXT,
+                        FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+                    );
+                    
                     -- User models table
                     CREATE TABLE IF NOT EXISTS user_models (
                         user_id TEXT PRIMARY KEY,
@@ -97,8 +115,14 @@ class SQLiteManager:
                     CREATE INDEX IF NOT EXISTS idx_user_interactions_timestamp ON user_interactions (timestamp);
                     CREATE INDEX IF NOT EXISTS idx_bookmarks_user_id ON bookmarks (user_id);
                     CREATE INDEX IF NOT EXISTS idx_bookmarks_project_id ON bookmarks (project_id);
+                    CREATE INDEX IF NOT EXISTS idx_symbols_project_name ON symbols (project_id, name_lower);
+                    CREATE INDEX IF NOT EXISTS idx_symbols_project_path ON symbols (project_id, path);
                 """)
                 
+                # Columns added after the initial schema
+                self._ensure_column(conn, 'graph_data', 'graph_version', 'INTEGER NOT NULL DEFAULT 1')
+                self._ensure_column(conn, 'graph_data', 'nodes_hash', 'TEXT')
+                
                 conn.commit()
                 self.logger.info("Database initialized successfully")
                 
@@ -106,6 +130,13 @@ class SQLiteManager:
             self.logger.error(f"Database initialization failed: {e}")
             raise
     
+    def _ensure_column(self, conn: sqlite3.Connection, table: str, column: str, definition: str):
+        """Add a column to an existing table if it is missing"""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            self.logger.info(f"Added column {table}.{column}")
+    
     def get_connection(self) -> sqlite3.Connection:
         """Get database connection with row factory"""
         conn = sqlite3.connect(self.db_path)
@@ -0,0 +1,117 @@
+# backend/src/database/SymbolDataManager.py
+from typing import Dict, Any, Optional, List, Iterable
+
+from .SQLiteManager import SQLiteManager
+
+class SymbolDataManager:
+    """Manages the per-project symbol table (functions, classes, interfaces)"""
+    
+    # Symbol kinds produced by GraphBuilder._extract_symbols
+    KINDS = ('class', 'interface', 'function', 'method')
+    
+    def __init__(self, db_manager: SQLiteManager = None):
+        self.db = db_manager or SQLiteManager('codeflow.db')
+    
+    def replace_symbols(self, project_id: str, symbols: Iterable[Dict[str, Any]],
+                        paths: Optional[Iterable[str]] = None):
+        """Replace stored symbols in a single transaction.
+        
+        With ``paths`` only those files' symbols are replaced; otherwise the
+        whole project's symbol table is.
+        """
+        rows = [
+            (
+                project_id,
+                symbol['name'],
+                symbol['name'].lower(),
+                symbol['kind'],
+                symbol['path'],
+                symbol['nodeId'],
+                symbol.get('line', 0),
+                symbol.get('container')
+            )
+            for symbol in symbols
+        ]
+        
+        try:
+            with self.db.get_connection() as conn:
+                if paths is None:
+                    conn.execute("DELETE FROM symbols WHERE project_id = ?", (project_id,))
+                else:
+                    conn.executemany(
+                        "DELETE FROM symbols WHERE project_id = ? AND path = ?",
+                        [(project_id, path) for path in paths]
+                    )
+                
+                conn.executemany(
+                    """INSERT INTO symbols
+                       (project_id, name, name_lower, kind, path, node_id, line, container)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    rows
+                )
+                conn.commit()
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to save symbols: {e}")
+    
+    def find_by_prefix(self, project_id: str, prefix: str, kind: Optional[str] = None,
+                       limit: int = 20) -> List[Dict[str, Any]]:
+        """Find symbols whose name starts with ``prefix`` (case-insensitive).
+        
+        Runs as a range scan on the (project_id, name_lower) index, shortest
+        names first so exact matches lead.
+        """
+        prefix = prefix.lower()
+        sql = """SELECT rowid, name, kind, path, node_id, line, container
+                 FROM symbols
+                 WHERE project_id = ? AND name_lower >= ? AND name_lower < ?"""
+        params = [project_id, prefix, prefix + '\U0010ffff']
+        
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        
+        sql += " ORDER BY length(name), name LIMIT ?"
+        params.append(limit)
+        
+        try:
+            rows = self.db.execute_query(sql, tuple(params))
+            return [self._row_to_symbol(row) for row in rows]
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to search symbols: {e}")
+    
+    def get_symbols(self, project_id: str) -> List[Dict[str, Any]]:
+        """Get every symbol of a project"""
+        try:
+            rows = self.db.execute_query(
+                """SELECT rowid, name, kind, path, node_id, line, container
+                   FROM symbols WHERE project_id = ?""",
+                (project_id,)
+            )
+            return [self._row_to_symbol(row) for row in rows]
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to get symbols: {e}")
+    
+    def delete_symbols(self, project_id: str) -> int:
+        """Delete all symbols of a project"""
+        try:
+            return self.db.execute_update(
+                "DELETE FROM symbols WHERE project_id = ?",
+                (project_id,)
+            )
+        
+        except Exception as e:
+            raise RuntimeError(f"Failed to delete symbols: {e}")
+    
+    def _row_to_symbol(self, row) -> Dict[str, Any]:
+        return {
+            'id': row['rowid'],
+            'name': row['name'],
+            'kind': row['kind'],
+            'path': row['path'],
+            'nodeId': row['node_id'],
+            'line': row['line'],
+            'container': row['container']
+        }
@@ -0,0 +1,325 @@
+# backend/src/services/analysis/AnalysisJobManager.py
+import os
+import threading
+import logging
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from config import Config
+from .AnalysisPipeline import AnalysisPipeline, AnalysisCancelledError
+
+class AnalysisJob:
+    """State of a single background repository analysis"""
+    
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    
+    FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+    
+    # Full analysis saved as a project, a per-commit delta series, or
+    # co-change mining patched into an existing project's graph
+    SNAPSHOT = 'snapshot'
+    HISTORY = 'history'
+    CO_CHANGE = 'co-change'
+    
+    # Sources: a git remote, a local directory or archive, or an uploaded
+    # archive that is removed once the job finishes
+    GIT = 'git'
+    LOCAL = 'local'
+    UPLOAD = 'upload'
+    
+    def __init__(self, project_id: str, git_url: str, version: str, clone_mode: Optional[str] = None,
+                 ref: Optional[str] = None, mode: str = SNAPSHOT, max_commits: Optional[int] = None,
+                 source: str = GIT, source_path: Optional[str] = None,
+                 options: Optional[Dict[str, Any]] = None):
+        self.project_id = project_id
+        self.git_url = git_url
+        self.version = version
+        self.clone_mode = clone_mode
+        self.ref = ref
+        self.mode = mode
+        self.max_commits = max_commits
+        self.source = source
+        self.source_path = source_path
+        self.options = options or {}
+        self.requests = 1
+        self.history = None
+        self.status = self.QUEUED
+        self.stage = None
+        self.progress = 0.0
+        self.error = None
+        self.result = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+    
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATES
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'projectId': self.project_id,
+            'gitUrl': self.git_url,
+            'version': self.version,
+            'cloneMode': self.clone_mode,
+            'ref': self.ref,
+            'mode': self.mode,
+            'maxCommits': self.max_commits,
+            'source': self.source,
+            'options': self.options,
+            'requests': self.requests,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress, 1),
+            'error': self.error,
+            'result': self.result,
+            'createdAt': self.created_at.isoformat(),
+            'startedAt': self.started_at.isoformat() if self.started_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class AnalysisJobManager:
+    """Runs repository analyses on a background worker pool.
+    
+    Identical requests (same repository, ref, version and clone mode) that
+    arrive while one is queued or running attach to that job instead of
+    starting another. Clones are further limited to ``clone_workers`` at a
+    time, so a burst of requests cannot saturate disk and network while
+    other workers parse and build.
+    """
+    
+    def __init__(self, max_workers: int = None, max_finished_jobs: int = None,
+                 clone_workers: int = None):
+        self.max_workers = max_workers or Config.ANALYSIS_WORKERS
+        self.clone_workers = clone_workers or Config.CLONE_WORKERS
+        self.max_finished_jobs = max_finished_jobs or Config.ANALYSIS_MAX_FINISHED_JOBS
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='analysis'
+        )
+        self.jobs: Dict[str, AnalysisJob] = {}
+        self._in_flight: Dict[tuple, AnalysisJob] = {}
+        self._clone_slots = threading.BoundedSemaphore(self.clone_workers)
+        self._deduplicated = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+    
+    def submit(self, project_id: str, git_url: str, version: str, db_manager=None,
+               clone_mode: Optional[str] = None, ref: Optional[str] = None) -> AnalysisJob:
+        """Queue a repository analysis and return its job immediately.
+        
+        If an identical analysis is already queued or running, that job is
+        returned instead and ``project_id`` is not used.
+        """
+        return self._submit(AnalysisJob(project_id, git_url, version, clone_mode, ref), db_manager)
+    
+    def submit_local(self, project_id: str, source_path: str, version: str, db_manager=None,
+                     label: Optional[str] = None, upload: bool = False) -> AnalysisJob:
+        """Queue analysis of a local directory or archive.
+        
+        ``label`` is recorded as the project's origin in place of a Git URL
+        (default: the path). An ``upload`` archive is deleted when its job
+        finishes. Deduplicated like ``submit``.
+        """
+        return self._submit(
+            AnalysisJob(project_id, label or source_path, version,
+                        source=AnalysisJob.UPLOAD if upload else AnalysisJob.LOCAL, source_path=source_path),
+            db_manager
+        )
+    
+    def submit_history(self, job_id: str, git_url: str, ref: Optional[str] = None,
+                       max_commits: Optional[int] = None) -> AnalysisJob:
+        """Queue a history analysis; its delta series ends up in ``job.history``.
+        
+        Deduplicated like ``submit``.
+        """
+        return self._submit(
+            AnalysisJob(job_id, git_url, None, ref=ref, mode=AnalysisJob.HISTORY, max_commits=max_commits),
+            None
+        )
+    
+    def submit_co_change(self, job_id: str, project_id: str, db_manager=None,
+                         max_commits: Optional[int] = None, min_support: Optional[int] = None,
+                         min_confidence: Optional[float] = None) -> AnalysisJob:
+        """Queue co-change mining for a stored project; see ``CoChangeAnalyzer``.
+        
+        Deduplicated like ``submit``, per project and thresholds.
+        """
+        options = {'projectId': project_id, 'minSupport': min_support, 'minConfidence': min_confidence}
+        return self._submit(
+            AnalysisJob(job_id, None, None, mode=AnalysisJob.CO_CHANGE, max_commits=max_commits, options=options),
+            db_manager
+        )
+    
+    def _submit(self, job: AnalysisJob, db_manager) -> AnalysisJob:
+        key = self._job_key(job)
+        
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None and not in_flight.is_finished and not in_flight.cancel_event.is_set():
+                in_flight.requests += 1
+                self._deduplicated += 1
+                return in_flight
+            
+            self.jobs[job.project_id] = job
+            self._in_flight[key] = job
+            self._prune_finished_jobs()
+        
+        self.executor.submit(self._run_job, job, db_manager)
+        return job
+    
+    def get_job(self, project_id: str) -> Optional[AnalysisJob]:
+        """Get a job by project ID"""
+        with self._lock:
+            return self.jobs.get(project_id)
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """List all tracked jobs"""
+        with self._lock:
+            return [job.to_dict() for job in self.jobs.values()]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and pool usage"""
+        with self._lock:
+            queued = sum(1 for job in self.jobs.values() if job.status == AnalysisJob.QUEUED)
+            running = [job for job in self.jobs.values() if job.status == AnalysisJob.RUNNING]
+            return {
+                'queued': queued,
+                'running': len(running),
+                'cloning': sum(1 for job in running if job.stage == 'clone'),
+                'workers': self.max_workers,
+                'cloneWorkers': self.clone_workers,
+                'deduplicated': self._deduplicated
+            }
+    
+    def get_queue_position(self, project_id: str) -> Optional[int]:
+        """1-based position of a queued job, or None if it is not queued"""
+        with self._lock:
+            job = self.jobs.get(project_id)
+            if job is None or job.status != AnalysisJob.QUEUED:
+                return None
+            queued = sorted(
+                (other for other in self.jobs.values() if other.status == AnalysisJob.QUEUED),
+                key=lambda other: other.created_at
+            )
+            return queued.index(job) + 1
+    
+    def cancel(self, project_id: str) -> bool:
+        """Request cancellation of a queued or running job"""
+        job = self.get_job(project_id)
+        if not job or job.is_finished:
+            return False
+        
+        job.cancel_event.set()
+        
+        # Queued jobs are marked immediately; running jobs stop at the next checkpoint
+        if job.status == AnalysisJob.QUEUED:
+            self._finish(job, AnalysisJob.CANCELLED)
+        return True
+    
+    def _run_job(self, job: AnalysisJob, db_manager):
+        """Execute the analysis pipeline for a job on a worker thread"""
+        if job.cancel_event.is_set():
+            return
+        
+        job.status = AnalysisJob.RUNNING
+        job.started_at = datetime.utcnow()
+        
+        def report(stage: str, progress: float):
+            job.stage = stage
+            job.progress = progress
+        
+        try:
+            if job.mode == AnalysisJob.HISTORY:
+                from .HistoryAnalyzer import HistoryAnalyzer
+                job.history = HistoryAnalyzer().analyze(
+                    job.git_url, job.ref, job.max_commits,
+                    report=report,
+                    is_cancelled=job.cancel_event.is_set,
+                    clone_slots=self._clone_slots
+                )
+                job.result = {key: value for key, value in job.history.items() if key != 'commits'}
+            elif job.mode == AnalysisJob.CO_CHANGE:
+                from services.graph.CoChangeAnalyzer import CoChangeAnalyzer
+                job.result = CoChangeAnalyzer(db_manager).analyze(
+                    job.options['projectId'], job.max_commits,
+                    job.options['minSupport'], job.options['minConfidence'],
+                    report=report,
+                    is_cancelled=job.cancel_event.is_set,
+                    clone_slots=self._clone_slots
+                )
+                if job.result is None:
+                    raise ValueError('Project not found')
+            else:
+                pipeline = AnalysisPipeline(db_manager)
+                job.result = pipeline.run(
+                    job.project_id, job.git_url, job.version,
+                    report=report,
+                    is_cancelled=job.cancel_event.is_set,
+                    clone_mode=job.clone_mode,
+                    ref=job.ref,
+                    clone_slots=self._clone_slots,
+                    source_path=job.source_path
+                )
+            self._finish(job, AnalysisJob.COMPLETED)
+            self.logger.info(f"Analysis {job.project_id} completed")
+            
+        except AnalysisCancelledError:
+            self._finish(job, AnalysisJob.CANCELLED)
+            self.logger.info(f"Analysis {job.project_id} cancelled")
+            
+        except Exception as e:
+            job.error = f"{job.stage or 'analysis'} failed: {e}"
+            self._finish(job, AnalysisJob.FAILED)
+            self.logger.error(f"Analysis {job.project_id} failed: {e}")
+            self.logger.debug(traceback.format_exc())
+    
+    def _finish(self, job: AnalysisJob, status: str):
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        if status == AnalysisJob.COMPLETED:
+            job.progress = 100.0
+        
+        with self._lock:
+            key = self._job_key(job)
+            if self._in_flight.get(key) is job:
+                del self._in_flight[key]
+        
+        if job.source == AnalysisJob.UPLOAD:
+            try:
+                os.remove(job.source_path)
+            except OSError:
+                pass
+    
+    def _job_key(self, job: AnalysisJob) -> tuple:
+        from services.git.GitObjectCache import GitObjectCache
+        if job.mode == AnalysisJob.CO_CHANGE:
+            return (job.mode, job.max_commits, *sorted(job.options.items()))
+        return (
+            job.source_path or GitObjectCache.normalize_url(job.git_url),
+            job.ref or 'HEAD',
+            job.mode,
+            job.version,
+            job.clone_mode or Config.GIT_CLONE_MODE,
+            job.max_commits
+        )
+    
+    def _prune_finished_jobs(self):
+        """Forget the oldest finished jobs beyond the retention limit"""
+        finished = [job for job in self.jobs.values() if job.is_finished]
+        excess = len(finished) - self.max_finished_jobs
+        if excess > 0:
+            finished.sort(key=lambda job: job.finished_at)
+            for job in finished[:excess]:
+                del self.jobs[job.project_id]
+
+# Process-wide job manager shared by the API routes
+analysis_job_manager = AnalysisJobManager()
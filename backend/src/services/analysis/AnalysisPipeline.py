@@ -0,0 +1,232 @@
+# backend/src/services/analysis/AnalysisPipeline.py
+import os
+import shutil
+import logging
+import threading
+import contextlib
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+class AnalysisCancelledError(Exception):
+    """Raised inside the pipeline when its job has been cancelled"""
+    pass
+
+class AnalysisPipeline:
+    """Runs repository analysis as a sequence of progress-tracked stages"""
+    
+    # Stage name -> (start percent, end percent)
+    STAGES = {
+        'clone': (0, 20),
+        'discover': (20, 25),
+        'parse': (25, 70),
+        'build': (70, 80),
+        'centrality': (80, 90),
+        'save': (90, 100)
+    }
+    
+    def __init__(self, db_manager=None):
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+    
+    def run(self, project_id: str, git_url: str, version: str,
+            report: Callable[[str, float], None],
+            is_cancelled: Callable[[], bool],
+            clone_mode: Optional[str] = None, ref: Optional[str] = None,
+            clone_slots: Optional[threading.Semaphore] = None,
+            source_path: Optional[str] = None) -> Dict[str, Any]:
+        """Run the full clone → discover → parse → build → centrality → save pipeline.
+        
+        ``report(stage, percent)`` is called as work progresses and
+        ``is_cancelled()`` is polled between units of work. With
+        ``clone_slots`` the clone stage waits for a free slot first.
+        
+        The ref is resolved to a commit before anything is fetched; if that
+        commit has been analyzed with the same options before, the cached
+        artifact is saved for this project and only the checkout is made.
+        
+        With ``source_path`` (a local directory or archive) the clone stage
+        snapshots it instead and ``git_url`` only labels the project; the
+        snapshot's tree digest takes the place of the commit as cache key.
+        """
+        from config import Config
+        from services.git.RepositoryManager import RepositoryManager
+        from services.graph.GraphBuilder import GraphBuilder
+        from services.analysis.GraphArtifactCache import GraphArtifactCache
+        
+        repo_manager = RepositoryManager()
+        graph_builder = GraphBuilder(blob_store=repo_manager.blob_store)
+        artifact_cache = GraphArtifactCache()
+        repo_path = None
+        
+        def checkpoint(stage: str, fraction: float = 0.0):
+            if is_cancelled():
+                raise AnalysisCancelledError(f"Analysis cancelled during {stage}")
+            start, end = self.STAGES[stage]
+            report(stage, start + (end - start) * fraction)
+        
+        try:
+            if source_path is not None:
+                # Snapshot a local directory or archive
+                with clone_slots or contextlib.nullcontext():
+                    checkpoint('clone')
+                    checkout = repo_manager.import_source(source_path, project_id)
+                cache_key = checkout['digest']
+                options = {'source': 'local'}
+            else:
+                # Resolve
+                checkpoint('clone')
+                commit = repo_manager.object_cache.resolve_commit(git_url, ref)
+                
+                # Clone
+                with clone_slots or contextlib.nullcontext():
+                    checkpoint('clone')
+                    checkout = repo_manager.checkout_repository(
+                        git_url, project_id, ref=ref, clone_mode=clone_mode, commit=commit
+                    )
+                cache_key = checkout['commit']
+                options = {'cloneMode': clone_mode or Config.GIT_CLONE_MODE}
+            repo_path = checkout['path']
+            
+            artifact = artifact_cache.get(cache_key, options) if cache_key else None
+            if artifact is not None:
+                return self._save_artifact(
+                    project_id, git_url, version, artifact, checkout, report, checkpoint, source_path
+                )
+            
+            # Discover
+            checkpoint('discover')
+            source_files = graph_builder._discover_source_files(repo_path)
+            
+            # Parse
+            checkpoint('parse')
+            parsed_files = graph_builder._parse_files(
+                source_files, repo_path,
+                progress_callback=lambda done, total: checkpoint('parse', done / total if total else 1.0),
+                blob_shas=checkout['blobs']
+            )
+            
+            # Build
+            checkpoint('build')
+            graph = graph_builder._build_graph_structure(parsed_files, repo_path)
+            symbols = graph['symbols']
+            graph_data = {
+                'nodes': graph['nodes'],
+                'edges': graph['edges'],
+                'metrics': graph_builder._calculate_graph_metrics(graph),
+                'metadata': {
+                    'total_files': len(source_files),
+                    'parsed_files': len(parsed_files),
+                    'repository_path': repo_path,
+                    'discovery': graph_builder.discovery_stats
+                }
+            }
+            
+            # Centrality
+            checkpoint('centrality')
+            from services.graph.CentralityCalculator import CentralityCalculator
+            centrality_scores = CentralityCalculator().calculate_all_centralities(graph_data)
+            
+            # Save
+            checkpoint('save')
+            if cache_key:
+                self._store_artifact(artifact_cache, cache_key, options, {
+                    'graph': graph_data,
+                    'centrality': centrality_scores,
+                    'symbols': symbols,
+                    'discovery': graph_builder.discovery_stats
+                })
+            
+            # After caching: the artifact stays version-neutral and random
+            # values are drawn afresh on every run
+            graph_data = self._apply_version_processing(graph_data, version)
+            self._save(project_id, git_url, version, graph_data, centrality_scores, symbols,
+                       commit=checkout['commit'], source_path=source_path)
+            report('save', 100)
+            
+            return {
+                'projectId': project_id,
+                'nodeCount': len(graph_data.get('nodes', [])),
+                'edgeCount': len(graph_data.get('edges', [])),
+                'version': version,
+                'commit': checkout['commit'],
+                'cached': False,
+                'discovery': graph_builder.discovery_stats,
+                'ingest': checkout.get('ingest')
+            }
+            
+        except Exception:
+            # Do not leave a half-analyzed checkout behind
+            if repo_path and os.path.exists(repo_path):
+                shutil.rmtree(repo_path, ignore_errors=True)
+            raise
+    
+    def _save_artifact(self, project_id: str, git_url: str, version: str, artifact: Dict[str, Any],
+                       checkout: Dict[str, Any], report: Callable[[str, float], None],
+                       checkpoint: Callable[..., None], source_path: Optional[str] = None) -> Dict[str, Any]:
+        """Save a cached artifact as this project's analysis"""
+        graph_data = self._apply_version_processing(artifact['graph'], version)
+        graph_data.setdefault('metadata', {})['repository_path'] = checkout['path']
+        
+        checkpoint('save')
+        self._save(project_id, git_url, version, graph_data, artifact.get('centrality'),
+                   artifact.get('symbols', []), commit=checkout['commit'], source_path=source_path)
+        report('save', 100)
+        
+        return {
+            'projectId': project_id,
+            'nodeCount': len(graph_data.get('nodes', [])),
+            'edgeCount': len(graph_data.get('edges', [])),
+            'version': version,
+            'commit': checkout['commit'],
+            'cached': True,
+            'discovery': artifact.get('discovery', {}),
+            'ingest': checkout.get('ingest')
+        }
+    
+    def _store_artifact(self, artifact_cache, cache_key: str, options: Dict[str, Any], artifact: Dict[str, Any]):
+        # A cache write failure must not fail the analysis itself
+        try:
+            artifact_cache.put(cache_key, options, artifact)
+            artifact_cache.prune()
+        except Exception as e:
+            self.logger.warning(f"Could not cache graph artifact for {cache_key}: {e}")
+    
+    def _apply_version_processing(self, graph_data: Dict[str, Any], version: str) -> Dict[str, Any]:
+        """Apply personalized or random processing to the graph"""
+        try:
+            from services.personalization.PersonalizationFactory import PersonalizationFactory
+            processor = PersonalizationFactory().create_graph_processor(version)
+            return processor.process_graph(graph_data)
+        except Exception as e:
+            self.logger.error(f"Graph processing failed: {e}")
+            return graph_data
+    
+    def _save(self, project_id: str, git_url: str, version: str,
+              graph_data: Dict[str, Any], centrality_scores: Dict[str, Any],
+              symbols: List[Dict[str, Any]], commit: Optional[str] = None,
+              source_path: Optional[str] = None):
+        """Persist the graph, metadata, centrality scores and symbol table"""
+        from database.GraphDataManager import GraphDataManager
+        from database.SymbolDataManager import SymbolDataManager
+        graph_data_manager = GraphDataManager(self.db_manager)
+        
+        metadata = {
+            'git_url': git_url,
+            'version': version,
+            'commit': commit,
+            'source_path': source_path,
+            'created_at': datetime.utcnow().isoformat(),
+            'node_count': len(graph_data.get('nodes', [])),
+            'edge_count': len(graph_data.get('edges', []))
+        }
+        
+        # Symbols first: cached symbol lookups are tagged with the nodes hash
+        # that save_graph changes, so they can never outlive these rows
+        SymbolDataManager(graph_data_manager.db).replace_symbols(project_id, symbols)
+        graph_data_manager.save_graph(project_id, graph_data, metadata)
+        if centrality_scores:
+            graph_data_manager.save_centrality_scores(project_id, centrality_scores)
+        
+        # Build the search index now so the first search does not pay for it
+        from services.search.SearchIndexManager import search_index_manager
+        search_index_manager.index_graph(graph_data_manager, project_id, graph_data.get('nodes', []))
@@ -0,0 +1,87 @@
+# backend/src/services/analysis/GraphArtifactCache.py
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+
+from config import Config
+
+class GraphArtifactCache:
+    """Finished analysis results keyed by commit, analyzer version and options.
+    
+    An artifact holds everything the save stage writes for a project: the
+    processed graph, centrality scores, symbol table and discovery stats.
+    Since the commit SHA pins the sources and ``Config.ANALYZER_VERSION``
+    pins the parsers, a hit can be saved under a new project as-is. Files
+    are gzipped JSON written atomically; reads refresh the mtime for
+    least-recently-used pruning.
+    """
+    
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path or Config.GRAPH_ARTIFACT_CACHE
+        os.makedirs(self.cache_path, exist_ok=True)
+    
+    def get_artifact_path(self, commit: str, options: Dict[str, Any]) -> str:
+        key = json.dumps({
+            'commit': commit,
+            'analyzerVersion': Config.ANALYZER_VERSION,
+            'options': options
+        }, sort_keys=True)
+        return os.path.join(self.cache_path, f"{hashlib.sha1(key.encode()).hexdigest()}.json.gz")
+    
+    def get(self, commit: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached artifact for a commit and options, or None"""
+        artifact_path = self.get_artifact_path(commit, options)
+        try:
+            with gzip.open(artifact_path, 'rt', encoding='utf-8') as f:
+                artifact = json.load(f)
+            os.utime(artifact_path)
+        except (OSError, ValueError, EOFError):
+            return None
+        return artifact
+    
+    def put(self, commit: str, options: Dict[str, Any], artifact: Dict[str, Any]):
+        """Store an artifact, replacing any previous one for the same key"""
+        artifact_path = self.get_artifact_path(commit, options)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_path, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump({**artifact, 'commit': commit, 'options': options}, f, separators=(',', ':'))
+            os.replace(temp_path, artifact_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def prune(self, max_size: int = None) -> int:
+        """Remove least recently used artifacts until the cache fits ``max_size``.
+        
+        Returns the number of artifacts removed.
+        """
+        max_size = max_size if max_size is not None else Config.GRAPH_ARTIFACT_CACHE_MAX_SIZE
+        
+        entries = []
+        with os.scandir(self.cache_path) as iterator:
+            for entry in iterator:
+                if entry.name.endswith('.json.gz'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        
+        return removed
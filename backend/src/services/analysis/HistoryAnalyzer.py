@@ -0,0 +1,231 @@
+# backend/src/services/analysis/HistoryAnalyzer.py
+import logging
+import threading
+import contextlib
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from config import Config
+from utils.FileUtils import FileUtils
+from services.graph.GraphBuilder import GraphBuilder
+from services.graph.GraphDiffer import GraphDiffer
+from .AnalysisPipeline import AnalysisCancelledError
+
+class HistoryAnalyzer:
+    """Replays a repository's dependency graph over a range of commits.
+    
+    Commits come straight from the shared object cache (a blobless fetch of
+    the first-parent chain). The oldest commit's graph is built once; every
+    later commit is applied as the tree diff against its parent, so only
+    blobs whose SHA changed are parsed (through the blob store's parse
+    cache) and only edges of changed files, or of files that import a path
+    that appeared or disappeared, are re-resolved. Each step produces a
+    ``GraphDiffer`` delta, giving a per-commit delta series whose cost
+    follows the size of each diff rather than the size of the repository.
+    """
+    
+    # Stage name -> (start percent, end percent)
+    STAGES = {
+        'clone': (0, 20),
+        'diff': (20, 30),
+        'load': (30, 40),
+        'replay': (40, 100)
+    }
+    
+    def __init__(self, blob_store=None):
+        from services.git.GitObjectCache import GitObjectCache
+        from services.git.BlobStore import BlobStore
+        
+        self.object_cache = GitObjectCache()
+        self.blob_store = blob_store or BlobStore()
+        self.graph_builder = GraphBuilder(blob_store=self.blob_store)
+        self.differ = GraphDiffer()
+        self.logger = logging.getLogger(__name__)
+        
+        # Replay state for the commit being applied, keyed by file path
+        self.file_infos: Dict[str, Dict[str, Any]] = {}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.file_map: Dict[str, str] = {}
+        self.edges: Dict[str, List[Dict[str, Any]]] = {}
+        self.edge_count = 0
+        
+        # Candidate path -> files whose imports look it up, and the reverse
+        self.watchers: Dict[str, Set[str]] = {}
+        self.watched: Dict[str, Set[str]] = {}
+    
+    def analyze(self, git_url: str, ref: Optional[str] = None, max_commits: Optional[int] = None,
+                report: Callable[[str, float], None] = None,
+                is_cancelled: Callable[[], bool] = None,
+                clone_slots: Optional[threading.Semaphore] = None) -> Dict[str, Any]:
+        """Build the graph delta series for the last ``max_commits`` commits of ``ref``.
+        
+        The first entry's delta adds the whole graph of the oldest commit;
+        each later entry holds what its commit changed. With ``clone_slots``
+        the network fetches wait for a free slot.
+        """
+        from services.git.GitObjectCache import GitObjectCache
+        
+        max_commits = min(max_commits or Config.HISTORY_DEFAULT_COMMITS, Config.HISTORY_MAX_COMMITS)
+        
+        def checkpoint(stage: str, fraction: float = 0.0):
+            if is_cancelled and is_cancelled():
+                raise AnalysisCancelledError(f"History analysis cancelled during {stage}")
+            if report:
+                start, end = self.STAGES[stage]
+                report(stage, start + (end - start) * fraction)
+        
+        # Clone: commits and trees only; blobs are loaded for changed files
+        checkpoint('clone')
+        with clone_slots or contextlib.nullcontext():
+            head = self.object_cache.fetch(
+                git_url, ref, GitObjectCache.BLOBLESS, Config.MAX_REPOSITORY_SIZE, depth=max_commits
+            )
+        history = self.object_cache.first_parent_history(git_url, head, max_commits)
+        
+        # Diff every step up front (trees are local) so blobs arrive in one batch
+        steps: List[Tuple[Dict[str, Any], Dict[str, Optional[str]]]] = []
+        for index, commit in enumerate(history):
+            checkpoint('diff', index / len(history))
+            if index == 0:
+                entries = self.object_cache.list_tree(git_url, commit['commit'])
+            else:
+                entries = self.object_cache.diff_trees(git_url, history[index - 1]['commit'], commit['commit'])
+            
+            # Regular files only; a file turned symlink or submodule is gone
+            steps.append((commit, {
+                path: sha if mode and mode.startswith('100') else None
+                for mode, sha, path in entries if self._is_source(path)
+            }))
+        
+        checkpoint('load')
+        unparsed = {
+            sha for _, changes in steps for path, sha in changes.items()
+            if sha is not None and not self.blob_store.has_parse_result(sha, FileUtils.detect_language(path))
+        }
+        series = []
+        # Loaded blobs are read back while replaying
+        with self.blob_store.in_use():
+            with clone_slots or contextlib.nullcontext():
+                loaded = self.object_cache.load_blobs(git_url, unparsed, self.blob_store)
+            
+            for index, (commit, changes) in enumerate(steps):
+                checkpoint('replay', index / len(steps))
+                delta, stats = self._apply(changes, commit['timestamp'])
+                series.append({**commit, 'delta': delta, 'stats': stats})
+        
+        if report:
+            report('replay', 100)
+        return {
+            'gitUrl': git_url,
+            'ref': ref,
+            'head': head,
+            'commitCount': len(series),
+            'loadedBlobs': loaded,
+            'nodeCount': len(self.nodes),
+            'edgeCount': self.edge_count,
+            'commits': series
+        }
+    
+    def _is_source(self, path: str) -> bool:
+        from services.git.GitObjectCache import GitObjectCache
+        return GitObjectCache.is_analyzable_path(path) and FileUtils.detect_language(path) is not None
+    
+    def _apply(self, changes: Dict[str, Optional[str]], timestamp: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Apply one commit's changed blobs and return its delta and stats"""
+        old_nodes = []
+        new_nodes = []
+        membership = set()
+        reparsed = 0
+        
+        for path, sha in changes.items():
+            previous = self.nodes.get(path)
+            if previous is not None:
+                old_nodes.append(previous)
+            
+            file_info = self._parse(path, sha, timestamp) if sha else None
+            if file_info is None:
+                if previous is not None:
+                    del self.nodes[path]
+                    del self.file_map[path]
+                    del self.file_infos[path]
+                    membership.add(path)
+                continue
+            
+            reparsed += 1
+            node = self.graph_builder._create_node(path, file_info)
+            self.file_infos[path] = file_info
+            self.nodes[path] = node
+            new_nodes.append(node)
+            if previous is None:
+                self.file_map[path] = node['id']
+                membership.add(path)
+        
+        # Files whose imports may now resolve differently
+        sources = {path for path in changes if path in self.nodes} | membership
+        for path in membership:
+            sources |= self.watchers.get(path, set())
+        
+        old_edges = []
+        new_edges = []
+        for source in sources:
+            old_edges.extend(self.edges.pop(source, ()))
+            self._unwatch(source)
+            if source in self.nodes:
+                edges = self.graph_builder._create_edges(source, self.file_infos[source], self.file_map, None)
+                self.edges[source] = edges
+                new_edges.extend(edges)
+                self._watch(source)
+        self.edge_count += len(new_edges) - len(old_edges)
+        
+        delta = self.differ.diff(
+            {'nodes': old_nodes, 'edges': old_edges},
+            {'nodes': new_nodes, 'edges': new_edges}
+        )
+        stats = {
+            'changedFiles': len(changes),
+            'reparsedFiles': reparsed,
+            'relinkedFiles': len(sources),
+            'nodeCount': len(self.nodes),
+            'edgeCount': self.edge_count
+        }
+        return delta, stats
+    
+    def _parse(self, path: str, sha: str, timestamp: int) -> Optional[Dict[str, Any]]:
+        """Parse result for a blob, from the parse cache when possible"""
+        language = FileUtils.detect_language(path)
+        parser = self.graph_builder.parser_factory.create_parser(language)
+        if not parser:
+            return None
+        
+        file_info = self.blob_store.get_parse_result(sha, language)
+        if file_info is None:
+            if not self.blob_store.has(sha):
+                return None
+            # Parsers only read content, so the stored blob stands in for the file
+            file_info = parser.parse_file(self.blob_store.get_blob_path(sha))
+            if not file_info or 'error' in file_info:
+                return None
+            self.blob_store.put_parse_result(sha, language, file_info)
+        
+        file_info.update(path=path, lastModified=timestamp)
+        return file_info
+    
+    def _watch(self, source: str):
+        # Candidates up to the resolved one; a later candidate cannot win
+        watched = set()
+        for dependency in self.file_infos[source].get('dependencies', []):
+            for candidate in self.graph_builder._dependency_candidates(dependency, source):
+                watched.add(candidate)
+                if candidate in self.file_map:
+                    break
+        
+        for candidate in watched:
+            self.watchers.setdefault(candidate, set()).add(source)
+        self.watched[source] = watched
+    
+    def _unwatch(self, source: str):
+        for candidate in self.watched.pop(source, ()):
+            watchers = self.watchers.get(candidate)
+            if watchers is not None:
+                watchers.discard(source)
+                if not watchers:
+                    del self.watchers[candidate]
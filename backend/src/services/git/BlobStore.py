@@ -0,0 +1,252 @@
+# backend/src/services/git/BlobStore.py
+import os
+import sys
+import json
+import time
+import errno
+import shutil
+import tempfile
+import contextlib
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
+
+from config import Config
+from services.git.RepositoryManifest import blob_hash
+
+# ioctl request for copy-on-write clones (Linux FICLONE)
+_FICLONE = 0x40049409
+
+# errnos meaning "this filesystem cannot do that", not a real failure
+_UNSUPPORTED = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV, errno.EPERM}
+
+class BlobStore:
+    """Content-addressed store for checked-out files, keyed by git blob SHA.
+    
+    Project checkouts are trees of reflinks (copy-on-write clones) or
+    hardlinks into the store, so repeated checkouts of a repository cost
+    almost no disk or copy time. Stored blobs are read-only; writers must
+    replace files rather than write through them (see
+    ``FileUtils.write_file_content``). Parse results are kept next to the
+    blobs so identical file contents are only parsed once per analyzer
+    version.
+    
+    Code that puts or links blobs holds ``in_use()`` until whatever
+    references them (a checkout manifest) exists; ``prune_unreferenced``
+    only runs while nobody does.
+    """
+    
+    def __init__(self, store_path: str = None):
+        self.store_path = store_path or Config.BLOB_STORE
+        self.objects_path = os.path.join(self.store_path, 'objects')
+        self.parsed_path = os.path.join(self.store_path, 'parsed', str(Config.ANALYZER_VERSION))
+        self.lock_path = os.path.join(self.store_path, '.lock')
+        os.makedirs(self.objects_path, exist_ok=True)
+        os.makedirs(self.parsed_path, exist_ok=True)
+        
+        # Flipped off after the first unsupported attempt
+        self._reflink_supported = sys.platform.startswith('linux')
+        self._hardlink_supported = True
+    
+    @contextlib.contextmanager
+    def in_use(self) -> Iterator[None]:
+        """Keep pruning away while blobs are being stored, linked or read.
+        
+        A shared ``flock`` on the store, so it holds across threads and
+        processes alike; any number of users can hold it at once.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            # No flock here; prune_unreferenced does nothing either
+            yield
+            return
+        
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+            yield
+    
+    def get_blob_path(self, sha: str) -> str:
+        return os.path.join(self.objects_path, sha[:2], sha)
+    
+    def has(self, sha: str) -> bool:
+        return os.path.exists(self.get_blob_path(sha))
+    
+    def put(self, sha: str, content: bytes):
+        """Store blob content under its SHA (no-op if already present)"""
+        blob_path = self.get_blob_path(sha)
+        if os.path.exists(blob_path):
+            return
+        
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.chmod(temp_path, 0o444)
+            os.replace(temp_path, blob_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def put_file(self, source_path: str) -> Optional[str]:
+        """Store a file by reflinking it into the store; returns its blob SHA.
+        
+        The clone is hashed rather than the source, so the stored content
+        matches its SHA even if the source changes meanwhile. Returns None,
+        storing nothing, when the source cannot be reflinked here (another
+        filesystem, or one without copy-on-write, or no ``fcntl``).
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return None
+        
+        fd, temp_path = tempfile.mkstemp(dir=self.objects_path, prefix='.tmp-')
+        try:
+            source_fd = os.open(source_path, os.O_RDONLY)
+            try:
+                fcntl.ioctl(fd, _FICLONE, source_fd)
+            except OSError as e:
+                if e.errno in _UNSUPPORTED:
+                    return None
+                raise
+            finally:
+                os.close(source_fd)
+            
+            with open(temp_path, 'rb') as f:
+                sha = blob_hash(f.read())
+            blob_path = self.get_blob_path(sha)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.chmod(temp_path, 0o444)
+                os.replace(temp_path, blob_path)
+            return sha
+        finally:
+            os.close(fd)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+    
+    def read(self, sha: str) -> bytes:
+        with open(self.get_blob_path(sha), 'rb') as f:
+            return f.read()
+    
+    def link(self, sha: str, target_path: str) -> str:
+        """Materialize a blob at ``target_path``; returns 'reflink', 'hardlink' or 'copy'"""
+        blob_path = self.get_blob_path(sha)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+        
+        if self._reflink_supported:
+            if self._reflink(blob_path, target_path):
+                return 'reflink'
+        
+        if self._hardlink_supported:
+            try:
+                os.link(blob_path, target_path)
+                return 'hardlink'
+            except OSError as e:
+                # EMLINK is per-inode; anything else means the store and the
+                # checkout cannot share inodes at all
+                if e.errno != errno.EMLINK:
+                    self._hardlink_supported = False
+        
+        shutil.copyfile(blob_path, target_path)
+        return 'copy'
+    
+    def _reflink(self, source_path: str, target_path: str) -> bool:
+        import fcntl
+        
+        source_fd = os.open(source_path, os.O_RDONLY)
+        try:
+            target_fd = os.open(target_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            try:
+                fcntl.ioctl(target_fd, _FICLONE, source_fd)
+                return True
+            except OSError as e:
+                os.close(target_fd)
+                target_fd = None
+                os.remove(target_path)
+                if e.errno in _UNSUPPORTED:
+                    self._reflink_supported = False
+                    return False
+                raise
+            finally:
+                if target_fd is not None:
+                    os.close(target_fd)
+        finally:
+            os.close(source_fd)
+    
+    def get_parse_result(self, sha: str, language: str) -> Optional[Dict[str, Any]]:
+        """Cached parser output for a blob, or None"""
+        try:
+            with open(self._parse_result_path(sha, language), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def has_parse_result(self, sha: str, language: str) -> bool:
+        return os.path.exists(self._parse_result_path(sha, language))
+    
+    def put_parse_result(self, sha: str, language: str, result: Dict[str, Any]):
+        """Cache parser output for a blob.
+        
+        Location-specific fields (``path``, ``lastModified``) are dropped;
+        callers fill them in for the checkout they are parsing.
+        """
+        result_path = self._parse_result_path(sha, language)
+        os.makedirs(os.path.dirname(result_path), exist_ok=True)
+        
+        payload = {key: value for key, value in result.items() if key not in ('path', 'lastModified')}
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(result_path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(temp_path, result_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _parse_result_path(self, sha: str, language: str) -> str:
+        return os.path.join(self.parsed_path, sha[:2], f"{sha}-{language}.json")
+    
+    def prune_unreferenced(self, referenced: Callable[[], Iterable[str]], grace: float = None) -> int:
+        """Remove blobs that are neither referenced nor hardlinked.
+        
+        ``referenced()`` is called once the store is locked and returns
+        every blob SHA some checkout still uses (see
+        ``RepositoryManager.prune_blob_store``); link counts alone cannot
+        tell, since reflinked and copied files do not show up in them.
+        Blobs younger than ``grace`` seconds (default
+        ``Config.BLOB_STORE_PRUNE_GRACE``) are kept for callers that store
+        blobs without holding ``in_use()``. Skipped, returning 0, while the
+        store is in use; otherwise returns the number removed.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            return 0
+        
+        cutoff = time.time() - (grace if grace is not None else Config.BLOB_STORE_PRUNE_GRACE)
+        removed = 0
+        with open(self.lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0
+            
+            keep = set(referenced())
+            for root, _, files in os.walk(self.objects_path):
+                for name in files:
+                    if name in keep:
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        info = os.stat(path)
+                        if info.st_nlink <= 1 and info.st_mtime < cutoff:
+                            os.remove(path)
+                            removed += 1
+                    except OSError:
+                        continue
+        return removed
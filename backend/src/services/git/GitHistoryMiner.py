@@ -0,0 +1,279 @@
+# backend/src/services/git/GitHistoryMiner.py
+import os
+import math
+import contextlib
+import subprocess
+from itertools import combinations
+from typing import Dict, Any, Callable, Iterator, List, Optional, Set, Tuple
+
+from config import Config
+
+# Record separator that starts each commit header in our log format
+_COMMIT_MARK = '\x1e'
+
+class FileHistory:
+    """Churn counters for one file"""
+    
+    __slots__ = ('commits', 'transactions', 'lines_added', 'lines_deleted', 'authors', 'last_commit')
+    
+    def __init__(self):
+        self.commits = 0
+        self.transactions = 0
+        self.lines_added = 0
+        self.lines_deleted = 0
+        self.authors: Set[int] = set()
+        self.last_commit = 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'commitCount': self.commits,
+            'linesAdded': self.lines_added,
+            'linesDeleted': self.lines_deleted,
+            'authorCount': len(self.authors),
+            'lastCommitted': self.last_commit
+        }
+
+class GitHistoryMiner:
+    """Streams ``git log --numstat`` into per-file churn and co-change counts.
+    
+    The log is read from a pipe token by token, so memory is bounded by the
+    tracked files and ``max_pairs`` co-change counters, not by the length
+    of the history. Renames are followed backwards: changes to a file's
+    older names count for its current path. Commits touching more than
+    ``max_files_per_commit`` tracked files (mass reformats, vendoring)
+    count towards churn but not towards co-change. When more than
+    ``max_pairs`` pairs are live, the least supported half is evicted, so
+    counts of rare pairs are approximate while frequent pairs stay exact
+    enough to pass the thresholds.
+    
+    Line counts need blob contents. On partial clones that lack them the
+    log is re-read with ``--name-status`` (exact renames only) and
+    ``lineStats`` is reported as False.
+    
+    With ``subdir`` only that directory's history is read, with paths
+    relative to it, for projects imported from part of a repository.
+    """
+    
+    def __init__(self, git_dir: str, paths: Optional[Set[str]] = None,
+                 max_files_per_commit: int = None, max_pairs: int = None,
+                 subdir: Optional[str] = None):
+        self.git_dir = git_dir
+        self.paths = paths
+        self.subdir = subdir.strip('/') + '/' if subdir and subdir.strip('/') else None
+        self.max_files_per_commit = max_files_per_commit or Config.COCHANGE_MAX_FILES_PER_COMMIT
+        self.max_pairs = max_pairs or Config.COCHANGE_MAX_PAIRS
+        self._reset()
+    
+    # Commits read between polls of ``is_cancelled``
+    CANCEL_CHECK_COMMITS = 500
+    
+    def mine(self, rev: str = 'HEAD', max_commits: Optional[int] = None,
+             is_cancelled: Callable[[], bool] = None) -> Dict[str, Any]:
+        """Mine up to ``max_commits`` non-merge commits reachable from ``rev``.
+        
+        ``is_cancelled()`` is polled every ``CANCEL_CHECK_COMMITS`` commits;
+        once it returns True the ``git log`` process is killed and
+        ``AnalysisCancelledError`` raised.
+        """
+        max_commits = max_commits or Config.COCHANGE_DEFAULT_COMMITS
+        try:
+            self._mine(rev, max_commits, True, is_cancelled)
+            line_stats = True
+        except RuntimeError:
+            self._reset()
+            self._mine(rev, max_commits, False, is_cancelled)
+            line_stats = False
+        
+        return {
+            'commits': self.commit_count,
+            'lineStats': line_stats,
+            'files': len(self.files),
+            'pairs': len(self.pairs),
+            'evictedPairs': self.evicted_pairs,
+            'skippedCommits': self.skipped_commits
+        }
+    
+    def co_changes(self, min_support: int = None, min_confidence: float = None) -> List[Dict[str, Any]]:
+        """File pairs that changed together often enough, strongest first.
+        
+        ``confidence`` is the share of commits touching ``source`` that also
+        touched ``target``; the direction with the higher confidence is used.
+        """
+        min_support = min_support or Config.COCHANGE_MIN_SUPPORT
+        min_confidence = min_confidence if min_confidence is not None else Config.COCHANGE_MIN_CONFIDENCE
+        
+        results = []
+        for (first, second), support in self.pairs.items():
+            if support < min_support:
+                continue
+            forward = support / max(self.files[first].transactions, 1)
+            backward = support / max(self.files[second].transactions, 1)
+            if max(forward, backward) < min_confidence:
+                continue
+            source, target = (first, second) if forward >= backward else (second, first)
+            results.append({
+                'source': source,
+                'target': target,
+                'support': support,
+                'confidence': round(max(forward, backward), 4)
+            })
+        
+        results.sort(key=lambda pair: (pair['confidence'], pair['support']), reverse=True)
+        return results
+    
+    def hotspots(self) -> Dict[str, float]:
+        """Per-file hotspot score in [0, 1], log-scaled from churn and commit count"""
+        if not self.files:
+            return {}
+        
+        def weight(history: FileHistory) -> float:
+            return math.log1p(history.commits) * math.log1p(history.lines_added + history.lines_deleted + 1)
+        
+        highest = max(weight(history) for history in self.files.values()) or 1.0
+        return {path: round(weight(history) / highest, 4) for path, history in self.files.items()}
+    
+    def _reset(self):
+        self.files: Dict[str, FileHistory] = {}
+        self.pairs: Dict[Tuple[str, str], int] = {}
+        self.aliases: Dict[str, str] = {}
+        self.authors: Dict[str, int] = {}
+        self.commit_count = 0
+        self.evicted_pairs = 0
+        self.skipped_commits = 0
+    
+    def _log(self, rev: str, max_commits: int, line_stats: bool) -> Iterator[str]:
+        """NUL-separated tokens of ``git log`` for the range, streamed from a pipe"""
+        args = [
+            'git', '--git-dir', self.git_dir, 'log', '-z', '--no-merges', f'--max-count={max_commits}',
+            f'--format={_COMMIT_MARK}%ct%x1f%ae'
+        ]
+        # Exact renames need no blob contents; similarity scoring does
+        args += ['--numstat', '-M'] if line_stats else ['--name-status', '-M100%']
+        if self.subdir:
+            args += [f'--relative={self.subdir}', rev, '--', self.subdir]
+        else:
+            args += [rev, '--']
+        
+        # No remote is configured for cached repositories, so missing blobs
+        # fail the command instead of being fetched one at a time
+        env = {**os.environ, 'GIT_NO_LAZY_FETCH': '1'}
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+        try:
+            pending = b''
+            for chunk in iter(lambda: process.stdout.read(1 << 16), b''):
+                *tokens, pending = (pending + chunk).split(b'\0')
+                for token in tokens:
+                    yield token.decode('utf-8', 'surrogateescape').lstrip('\n')
+            if pending:
+                yield pending.decode('utf-8', 'surrogateescape').lstrip('\n')
+            
+            stderr = process.stderr.read().decode('utf-8', 'replace').strip()
+            if process.wait() != 0:
+                raise RuntimeError(f"git log failed: {stderr}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+    
+    def _mine(self, rev: str, max_commits: int, line_stats: bool, is_cancelled: Optional[Callable[[], bool]]):
+        # Closing the stream early kills git log
+        with contextlib.closing(self._log(rev, max_commits, line_stats)) as tokens:
+            self._consume(tokens, line_stats, is_cancelled)
+    
+    def _consume(self, tokens: Iterator[str], line_stats: bool,
+                 is_cancelled: Optional[Callable[[], bool]] = None):
+        commit = None
+        files: Dict[str, Tuple[int, int]] = {}
+        seen = 0
+        
+        for token in tokens:
+            if token.startswith(_COMMIT_MARK):
+                if commit is not None:
+                    self._record(commit, files)
+                seen += 1
+                if is_cancelled and seen % self.CANCEL_CHECK_COMMITS == 0 and is_cancelled():
+                    from services.analysis.AnalysisPipeline import AnalysisCancelledError
+                    raise AnalysisCancelledError('Co-change analysis cancelled during mine')
+                timestamp, _, author = token[1:].partition('\x1f')
+                commit = (int(timestamp or 0), author)
+                files = {}
+                continue
+            if not token:
+                continue
+            
+            if line_stats:
+                added, deleted, path = token.split('\t', 2)
+                if not path:
+                    # Rename: old and new path follow as separate tokens
+                    old_path, path = next(tokens), next(tokens)
+                    self._rename(old_path, path)
+                lines = (int(added) if added != '-' else 0, int(deleted) if deleted != '-' else 0)
+            else:
+                status, path = token, next(tokens)
+                if status[0] in 'RC':
+                    old_path, path = path, next(tokens)
+                    if status[0] == 'R':
+                        self._rename(old_path, path)
+                lines = (0, 0)
+            
+            current = self.aliases.get(path, path)
+            if self.paths is None or current in self.paths:
+                previous = files.get(current, (0, 0))
+                files[current] = (previous[0] + lines[0], previous[1] + lines[1])
+        
+        if commit is not None:
+            self._record(commit, files)
+    
+    def _rename(self, old_path: str, new_path: str):
+        # The log runs newest first, so older changes to old_path follow
+        current = self.aliases.get(new_path, new_path)
+        if self.paths is None or current in self.paths:
+            self.aliases[old_path] = current
+    
+    def _record(self, commit: Tuple[int, str], files: Dict[str, Tuple[int, int]]):
+        timestamp, author = commit
+        author_id = self.authors.setdefault(author, len(self.authors))
+        self.commit_count += 1
+        
+        # Oversized commits say little about which files belong together
+        counted = len(files) <= self.max_files_per_commit
+        if not counted:
+            self.skipped_commits += 1
+        
+        for path, (added, deleted) in files.items():
+            history = self.files.get(path)
+            if history is None:
+                history = self.files[path] = FileHistory()
+            history.commits += 1
+            history.lines_added += added
+            history.lines_deleted += deleted
+            history.authors.add(author_id)
+            history.last_commit = max(history.last_commit, timestamp)
+            if counted:
+                history.transactions += 1
+        
+        if counted and len(files) > 1:
+            for pair in combinations(sorted(files), 2):
+                self.pairs[pair] = self.pairs.get(pair, 0) + 1
+            if len(self.pairs) > self.max_pairs:
+                self._evict_pairs()
+    
+    def _evict_pairs(self):
+        """Drop the least supported pairs until at most half of ``max_pairs`` remain"""
+        counts: Dict[int, int] = {}
+        for support in self.pairs.values():
+            counts[support] = counts.get(support, 0) + 1
+        
+        remaining = len(self.pairs)
+        cutoff = 0
+        for support in sorted(counts):
+            if remaining <= self.max_pairs // 2:
+                break
+            remaining -= counts[support]
+            cutoff = support
+        
+        before = len(self.pairs)
+        self.pairs = {pair: support for pair, support in self.pairs.items() if support > cutoff}
+        self.evicted_pairs += before - len(self.pairs)
@@ -1,73 +1,43 @@
 # backend/src/services/git/GitWatcher.py
 import os
 import time
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, List, Iterable, Optional
+
+from services.git.WatcherBackend import WatcherBackend, WatchIgnoreRules, create_watcher_backend
+from services.git.RepositoryManifest import RepositoryManifest
 
 class GitWatcher:
-    """Watches for changes in Git repositories"""
+    """Watches for changes in Git repositories.
+    
+    Changes come from a pluggable ``WatcherBackend`` (inotify on Linux,
+    ``os.scandir`` polling elsewhere). The backend is started on the first
+    check, which records the current state (from the checkout's manifest
+    when it has one); later checks report what changed since.
+    """
     
-    def __init__(self, repo_path: str):
+    def __init__(self, repo_path: str, backend: Optional[str] = None,
+                 ignore_patterns: Optional[Iterable[str]] = None):
         self.repo_path = repo_path
         self.last_check = time.time()
-        self.file_timestamps = {}
         self.callbacks = []
+        self.backend_name = backend
+        self.ignore_rules = WatchIgnoreRules(ignore_patterns)
+        self.backend: Optional[WatcherBackend] = None
     
     def add_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Add a callback for file changes"""
         self.callbacks.append(callback)
     
-    def check_for_changes(self) -> List[Dict[str, Any]]:
+    def check_for_changes(self, timeout: float = 0) -> List[Dict[str, Any]]:
         """Check for file changes since last check"""
-        changes = []
-        
-        if not os.path.exists(self.repo_path):
-            return changes
-        
-        for root, dirs, files in os.walk(self.repo_path):
-            # Skip hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                try:
-                    mtime = os.path.getmtime(file_path)
-                    
-                    # Check if file is new or modified
-                    if file_path not in self.file_timestamps:
-                        changes.append({
-                            'type': 'added',
-                            'path': file_path,
-                            'timestamp': mtime
-                        })
-                    elif mtime > self.file_timestamps[file_path]:
-                        changes.append({
-                            'type': 'modified',
-                            'path': file_path,
-                            'timestamp': mtime
-                        })
-                    
-                    self.file_timestamps[file_path] = mtime
-                    
-                except OSError:
-                    continue
-        
-        # Check for deleted files
-        current_files = set(self.file_timestamps.keys())
-        actual_files = set()
-        
-        for root, dirs, files in os.walk(self.repo_path):
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            for file in files:
-                actual_files.add(os.path.join(root, file))
+        if self.backend is None:
+            self.backend = create_watcher_backend(
+                self.repo_path, self.backend_name, self.ignore_rules, self._known_files()
+            )
+            self.last_check = time.time()
+            return []
         
-        deleted_files = current_files - actual_files
-        for deleted_file in deleted_files:
-            changes.append({
-                'type': 'deleted',
-                'path': deleted_file,
-                'timestamp': time.time()
-            })
-            del self.file_timestamps[deleted_file]
+        changes = self.backend.poll(timeout)
         
         # Notify callbacks
         for change in changes:
@@ -80,20 +50,34 @@ class GitWatcher:
         self.last_check = time.time()
         return changes
     
-    def start_watching(self, interval: int = 5):
-        """Start watching for changes"""
-        import threading
-        import time
+    def _known_files(self) -> Optional[Dict[str, tuple]]:
+        """Watched files and their (mtime_ns, size) according to the manifest"""
+        manifest = RepositoryManifest.load(self.repo_path)
+        if manifest is None:
+            return None
         
-        def watch_loop():
-            while True:
-                try:
-                    self.check_for_changes()
-                    time.sleep(interval)
-                except Exception as e:
-                    print(f"Watcher error: {e}")
-                    time.sleep(interval)
-        
-        thread = threading.Thread(target=watch_loop, daemon=True)
-        thread.start()
-        return thread
\ No newline at end of file
+        known = {}
+        for path, entry in manifest.files.items():
+            parts = path.split(os.sep)
+            if any(self.ignore_rules.is_ignored_directory(part) for part in parts[:-1]):
+                continue
+            if self.ignore_rules.is_ignored_file(parts[-1]):
+                continue
+            known[os.path.join(manifest.repo_path, path)] = (entry['mtime'], entry['size'])
+        return known
+    
+    def close(self):
+        """Release the backend (inotify descriptor and watches)"""
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+    
+    def start_watching(self, project_id: str = None):
+        """Start watching for changes on the shared watch scheduler"""
+        from services.git.WatchScheduler import watch_scheduler
+        return watch_scheduler.watch(project_id or self.repo_path, watcher=self)
+    
+    def stop_watching(self, project_id: str = None) -> bool:
+        """Stop watching for changes"""
+        from services.git.WatchScheduler import watch_scheduler
+        return watch_scheduler.unwatch(project_id or self.repo_path)
@@ -0,0 +1,231 @@
+# backend/src/services/git/LocalSourceImporter.py
+import os
+import stat
+import errno
+import hashlib
+import tarfile
+import zipfile
+import posixpath
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+
+from services.git.GitObjectCache import GitObjectCache, RepositoryTooLargeError
+from services.git.RepositoryManifest import blob_hash
+
+class LocalSourceImporter:
+    """Turns a local directory or a source archive into a project checkout.
+    
+    Directories are snapshotted file by file: each discovered file is
+    reflinked into the ``BlobStore`` (copy-on-write, so the snapshot is
+    immune to later edits) and linked from there. Where the filesystem
+    cannot reflink, files are hardlinked to the source instead and only
+    content the store already holds is linked from the store. Content is
+    copied only when the source is on another filesystem than the store,
+    so an import costs little more than reading each file once to hash
+    it. ``.gitignore`` files are honored while walking, so ignored trees
+    are never read.
+    
+    Archives (tar, optionally compressed, and zip) are read member by
+    member; only analyzable regular files are decompressed, straight into
+    the blob store. Links, unsafe paths and everything else are skipped,
+    and a single top-level directory (as in release tarballs) is dropped.
+    
+    After an import, ``shared`` holds the paths hardlinked to the source:
+    their content can still change in place, so callers must not cache
+    anything by their SHA. ``stats`` counts how files were materialized.
+    """
+    
+    ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.zip')
+    
+    def __init__(self, blob_store):
+        self.blob_store = blob_store
+        self.shared = set()
+        self.stats: Dict[str, Any] = {}
+        
+        # Flipped off after the first unsupported attempt; the store knows
+        # whether this platform can reflink at all
+        self._reflink_supported = blob_store._reflink_supported
+        self._hardlink_supported = True
+    
+    @classmethod
+    def is_archive(cls, path: str) -> bool:
+        return path.lower().endswith(cls.ARCHIVE_SUFFIXES)
+    
+    @staticmethod
+    def tree_digest(blobs: Dict[str, str]) -> str:
+        """Stable key for a path -> blob SHA map, like a tree id for trees without a commit"""
+        digest = hashlib.sha1()
+        for path in sorted(blobs):
+            digest.update(f"{path}\0{blobs[path]}\n".encode('utf-8', 'surrogateescape'))
+        return f"tree-{digest.hexdigest()}"
+    
+    def snapshot_directory(self, source_path: str, target_path: str,
+                           size_limit: Optional[int] = None) -> Dict[str, str]:
+        """Snapshot the source files of a directory into ``target_path``.
+        
+        The total size is enforced against ``size_limit`` before anything
+        is linked. Returns a manifest mapping relative paths to blob SHAs.
+        """
+        from services.graph.SourceDiscovery import SourceDiscovery
+        
+        discovery = SourceDiscovery(source_path)
+        paths = [path.replace(os.sep, '/') for path in discovery.discover()]
+        self._reset(discovery.stats)
+        
+        sizes = {}
+        for path in paths:
+            try:
+                sizes[path] = os.lstat(os.path.join(source_path, path)).st_size
+            except OSError:
+                continue
+        total = sum(sizes.values())
+        if size_limit and total > size_limit:
+            raise RepositoryTooLargeError(total, size_limit)
+        
+        os.makedirs(target_path, exist_ok=True)
+        
+        manifest = {}
+        for path in sizes:
+            source_file = os.path.join(source_path, path)
+            target_file = os.path.join(target_path, path)
+            try:
+                sha = self._snapshot_file(source_file, target_file, path)
+            except FileNotFoundError:
+                # Removed since discovery
+                continue
+            manifest[path] = sha
+            self.stats['files'] += 1
+            self.stats['bytes'] += sizes[path]
+        
+        return manifest
+    
+    def extract_archive(self, archive_path: str, target_path: str,
+                        size_limit: Optional[int] = None) -> Dict[str, str]:
+        """Extract the analyzable files of an archive into ``target_path``.
+        
+        ``size_limit`` applies to the extracted files and is enforced as
+        members are read. Returns a manifest mapping relative paths to blob
+        SHAs.
+        """
+        self._reset(None)
+        if not os.path.isfile(archive_path):
+            raise ValueError(f"Archive not found: {archive_path}")
+        
+        members = self._zip_members if zipfile.is_zipfile(archive_path) else self._tar_members
+        total = 0
+        blobs = {}
+        try:
+            for path, size, read in members(archive_path):
+                path = self._member_path(path)
+                if path is None or not GitObjectCache.is_analyzable_path(path):
+                    self.stats['skipped'] += 1
+                    continue
+                
+                total += size
+                if size_limit and total > size_limit:
+                    raise RepositoryTooLargeError(total, size_limit)
+                
+                content = read()
+                sha = blob_hash(content)
+                if self.blob_store.has(sha):
+                    self.stats['reused'] += 1
+                else:
+                    self.blob_store.put(sha, content)
+                    self.stats['copied'] += 1
+                blobs[path] = sha
+                self.stats['bytes'] += len(content)
+        except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+            raise ValueError(f"Unreadable archive: {e}")
+        
+        # Release archives wrap everything in one "<name>-<version>/" directory
+        roots = {path.split('/', 1)[0] for path in blobs}
+        if len(roots) == 1 and all('/' in path for path in blobs):
+            blobs = {path.split('/', 1)[1]: sha for path, sha in blobs.items()}
+        
+        os.makedirs(target_path, exist_ok=True)
+        for path, sha in blobs.items():
+            self.blob_store.link(sha, os.path.join(target_path, path))
+        self.stats['files'] = len(blobs)
+        
+        return blobs
+    
+    def _reset(self, discovery: Optional[Dict[str, Any]]):
+        self.shared = set()
+        self.stats = {
+            'files': 0,
+            'bytes': 0,
+            'reflinked': 0,
+            'hardlinked': 0,
+            'reused': 0,
+            'copied': 0,
+            'skipped': 0,
+            'discovery': discovery
+        }
+    
+    def _snapshot_file(self, source_file: str, target_file: str, path: str) -> str:
+        """Materialize one source file at ``target_file`` and return its blob SHA"""
+        mode = os.lstat(source_file).st_mode
+        if stat.S_ISLNK(mode):
+            link = os.readlink(source_file)
+            os.makedirs(os.path.dirname(target_file), exist_ok=True)
+            os.symlink(link, target_file)
+            return blob_hash(os.fsencode(link))
+        
+        if self._reflink_supported:
+            sha = self.blob_store.put_file(source_file)
+            if sha is not None:
+                self.blob_store.link(sha, target_file)
+                self.stats['reflinked'] += 1
+                return sha
+            self._reflink_supported = False
+        
+        with open(source_file, 'rb') as f:
+            content = f.read()
+        sha = blob_hash(content)
+        if self.blob_store.has(sha):
+            self.blob_store.link(sha, target_file)
+            self.stats['reused'] += 1
+            return sha
+        
+        if self._hardlink_supported:
+            os.makedirs(os.path.dirname(target_file), exist_ok=True)
+            try:
+                os.link(source_file, target_file)
+                self.shared.add(path)
+                self.stats['hardlinked'] += 1
+                return sha
+            except OSError as e:
+                # EMLINK is per-inode; anything else means the source and the
+                # checkout cannot share inodes at all
+                if e.errno != errno.EMLINK:
+                    self._hardlink_supported = False
+        
+        self.blob_store.put(sha, content)
+        self.blob_store.link(sha, target_file)
+        self.stats['copied'] += 1
+        return sha
+    
+    def _member_path(self, name: str) -> Optional[str]:
+        """Normalized relative path of an archive member, or None if it escapes the root"""
+        path = posixpath.normpath(name.replace('\\', '/').lstrip('/'))
+        if path in ('.', '..') or path.startswith('../'):
+            return None
+        return path
+    
+    def _tar_members(self, archive_path: str) -> Iterator[Tuple[str, int, Callable[[], bytes]]]:
+        # Stream mode reads the archive once, front to back
+        with tarfile.open(archive_path, 'r|*') as archive:
+            for member in archive:
+                if not member.isreg():
+                    self.stats['skipped'] += 1
+                    continue
+                yield member.name, member.size, lambda member=member: archive.extractfile(member).read()
+    
+    def _zip_members(self, archive_path: str) -> Iterator[Tuple[str, int, Callable[[], bytes]]]:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                # Symlinks are stored as files whose Unix mode says otherwise
+                unix_mode = info.external_attr >> 16
+                if info.is_dir() or (unix_mode and not stat.S_ISREG(unix_mode)):
+                    self.stats['skipped'] += 1
+                    continue
+                yield info.filename, info.file_size, lambda info=info: archive.read(info)
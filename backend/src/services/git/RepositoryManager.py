@@ -1,13 +1,16 @@
 # backend/src/services/git/RepositoryManager.py
 import os
 import shutil
-import subprocess
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 from config import Config
 from utils.FileUtils import FileUtils
 from utils.ValidationUtils import ValidationUtils
+from services.git.GitObjectCache import GitObjectCache
+from services.git.BlobStore import BlobStore
+from services.git.RepositoryManifest import RepositoryManifest
+from services.git.LocalSourceImporter import LocalSourceImporter
 
 class RepositoryManager:
     """Manages Git repository operations"""
@@ -15,59 +18,100 @@ class RepositoryManager:
     def __init__(self):
         self.storage_path = Config.REPOSITORY_STORAGE
         os.makedirs(self.storage_path, exist_ok=True)
+        self.object_cache = GitObjectCache()
+        self.blob_store = BlobStore()
     
-    def clone_repository(self, git_url: str, project_id: str) -> str:
+    def clone_repository(self, git_url: str, project_id: str, ref: Optional[str] = None,
+                         clone_mode: Optional[str] = None) -> str:
         """Clone a Git repository"""
-        try:
-            # Validate Git URL
-            if not ValidationUtils.is_valid_git_url(git_url):
-                raise ValueError("Invalid Git URL format")
-            
-            # Create project directory
-            repo_path = os.path.join(self.storage_path, project_id)
-            
-            if os.path.exists(repo_path):
-                shutil.rmtree(repo_path)
-            
-            # Clone repository with limited depth for performance
-            cmd = [
-                'git', 'clone',
-                '--depth', '1',
-                '--single-branch',
-                git_url,
-                repo_path
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minutes timeout
-            )
-            
-            if result.returncode != 0:
-                raise RuntimeError(f"Git clone failed: {result.stderr}")
-            
-            # Check repository size
-            repo_size = FileUtils.get_directory_size(repo_path)
-            if repo_size > Config.MAX_REPOSITORY_SIZE:
-                shutil.rmtree(repo_path)
-                raise ValueError("Repository size exceeds maximum allowed size")
-            
-            # Remove .git directory to save space
-            git_dir = os.path.join(repo_path, '.git')
-            if os.path.exists(git_dir):
-                shutil.rmtree(git_dir)
-            
-            return repo_path
-            
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Repository clone timed out")
-        except Exception as e:
-            # Clean up on failure
-            if os.path.exists(repo_path):
-                shutil.rmtree(repo_path)
-            raise e
+        return self.checkout_repository(git_url, project_id, ref, clone_mode)['path']
+    
+    def checkout_repository(self, git_url: str, project_id: str, ref: Optional[str] = None,
+                            clone_mode: Optional[str] = None, commit: Optional[str] = None) -> Dict[str, Any]:
+        """Check out a repository from the shared object cache.
+        
+        Repositories seen before are updated with an incremental shallow
+        fetch instead of a fresh clone, and files are linked from the shared
+        blob store instead of written out again. ``clone_mode`` (default
+        ``Config.GIT_CLONE_MODE``) selects a full, blobless or sparse
+        checkout; see ``GitObjectCache``. Returns the checkout path,
+        the commit it was taken from and a path -> blob SHA manifest.
+        Pass ``commit`` when ``ref`` has already been resolved.
+        A ``RepositoryManifest`` is written alongside the checkout.
+        """
+        # Validate Git URL
+        if not ValidationUtils.is_valid_git_url(git_url):
+            raise ValueError("Invalid Git URL format")
+        
+        # Create project directory
+        repo_path = os.path.join(self.storage_path, project_id)
+        
+        with self.blob_store.in_use():
+            try:
+                if os.path.exists(repo_path):
+                    shutil.rmtree(repo_path)
+                RepositoryManifest.delete(repo_path)
+                
+                try:
+                    commit = self.object_cache.fetch(git_url, ref, clone_mode, Config.MAX_REPOSITORY_SIZE, commit)
+                except RuntimeError as e:
+                    raise RuntimeError(f"Git clone failed: {e}")
+                
+                # Size is enforced while objects arrive and before files are written
+                blobs = self.object_cache.checkout(
+                    git_url, commit, repo_path, self.blob_store, clone_mode, Config.MAX_REPOSITORY_SIZE
+                )
+                
+                RepositoryManifest.build(repo_path, blobs, commit)
+                
+                return {'path': repo_path, 'commit': commit, 'blobs': blobs}
+                
+            except Exception as e:
+                # Clean up on failure
+                if os.path.exists(repo_path):
+                    shutil.rmtree(repo_path)
+                RepositoryManifest.delete(repo_path)
+                raise e
+    
+    def import_source(self, source_path: str, project_id: str) -> Dict[str, Any]:
+        """Snapshot a local directory or source archive as a project checkout.
+        
+        See ``LocalSourceImporter``. Returns the checkout path, no commit,
+        a path -> blob SHA map of the files whose content is pinned (safe to
+        cache parse results for), a digest of the tree when every file is
+        pinned (usable as an artifact cache key, else None) and ingestion
+        stats. A ``RepositoryManifest`` is written alongside the checkout.
+        """
+        repo_path = os.path.join(self.storage_path, project_id)
+        importer = LocalSourceImporter(self.blob_store)
+        
+        with self.blob_store.in_use():
+            try:
+                if os.path.exists(repo_path):
+                    shutil.rmtree(repo_path)
+                RepositoryManifest.delete(repo_path)
+                
+                if os.path.isdir(source_path):
+                    blobs = importer.snapshot_directory(source_path, repo_path, Config.MAX_REPOSITORY_SIZE)
+                else:
+                    blobs = importer.extract_archive(source_path, repo_path, Config.MAX_REPOSITORY_SIZE)
+                
+                RepositoryManifest.build(repo_path, blobs)
+                
+                return {
+                    'path': repo_path,
+                    'commit': None,
+                    'blobs': {path: sha for path, sha in blobs.items() if path not in importer.shared},
+                    'digest': None if importer.shared else importer.tree_digest(blobs),
+                    'ingest': importer.stats
+                }
+                
+            except Exception as e:
+                # Clean up on failure
+                if os.path.exists(repo_path):
+                    shutil.rmtree(repo_path)
+                RepositoryManifest.delete(repo_path)
+                raise e
     
     def get_repository_path(self, project_id: str) -> Optional[str]:
         """Get the file system path for a project"""
@@ -81,10 +125,30 @@ class RepositoryManager:
         """Delete a cloned repository"""
         repo_path = self.get_repository_path(project_id)
         if repo_path and os.path.exists(repo_path):
-            shutil.rmtree(repo_path)
+            with self.blob_store.in_use():
+                shutil.rmtree(repo_path)
+                RepositoryManifest.delete(repo_path)
             return True
         return False
     
+    def prune_blob_store(self) -> int:
+        """Remove blobs that no checkout's manifest refers to anymore.
+        
+        Run periodically by ``StoreMaintenance`` rather than on every
+        delete, as it walks the whole store. Returns the number removed.
+        """
+        def referenced():
+            # Called with the store locked, so no checkout is half made
+            shas = set()
+            for name in os.listdir(self.storage_path):
+                repo_path = os.path.join(self.storage_path, name)
+                if os.path.isdir(repo_path):
+                    manifest = RepositoryManifest.load(repo_path) or RepositoryManifest.build(repo_path)
+                    shas.update(entry['hash'] for entry in manifest.files.values())
+            return shas
+        
+        return self.blob_store.prune_unreferenced(referenced)
+    
     def get_repository_info(self, project_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a repository"""
         repo_path = self.get_repository_path(project_id)
@@ -92,21 +156,19 @@ class RepositoryManager:
             return None
         
         try:
+            # Checkouts made before manifests existed get one on first use
+            manifest = RepositoryManifest.load(repo_path) or RepositoryManifest.build(repo_path)
+            
             file_count = 0
             total_size = 0
             languages = set()
             
-            for root, dirs, files in os.walk(repo_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if FileUtils.is_allowed_file(file):
-                        file_count += 1
-                        total_size += os.path.getsize(file_path)
-                        
-                        # Detect language
-                        language = FileUtils.detect_language(file)
-                        if language:
-                            languages.add(language)
+            for path, entry in manifest.files.items():
+                if FileUtils.is_allowed_file(path):
+                    file_count += 1
+                    total_size += entry['size']
+                    if entry['language']:
+                        languages.add(entry['language'])
             
             return {
                 'projectId': project_id,
@@ -114,7 +176,7 @@ class RepositoryManager:
                 'totalSize': total_size,
                 'languages': list(languages),
                 'lastModified': datetime.fromtimestamp(
-                    os.path.getmtime(repo_path)
+                    manifest.last_modified() or os.path.getmtime(repo_path)
                 ).isoformat()
             }
             
@@ -0,0 +1,194 @@
+# backend/src/services/git/RepositoryManifest.py
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Any, Iterable, List, Optional
+
+from utils.FileUtils import FileUtils
+
+# Serializes read-modify-write updates per manifest file
+_manifest_locks: Dict[str, threading.Lock] = {}
+_manifest_locks_guard = threading.Lock()
+
+# Parsed manifests keyed by file path, tagged with the file's mtime
+_loaded: Dict[str, tuple] = {}
+
+def _manifest_lock(manifest_path: str) -> threading.Lock:
+    with _manifest_locks_guard:
+        return _manifest_locks.setdefault(manifest_path, threading.Lock())
+
+def blob_hash(content: bytes) -> str:
+    """Git blob SHA of some content, so hashes match checkout manifests"""
+    return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+class RepositoryManifest:
+    """Persisted list of the files in a checkout.
+    
+    Each entry records size, mtime (ns), content hash (the git blob SHA)
+    and language. The manifest is written once at checkout time from the
+    tree the checkout was made from, and patched as files change, so
+    discovery, repository info, size accounting, reverse-dependency lookups
+    and watchers can read it instead of walking the checkout. It lives next
+    to the checkout (``<checkout>.manifest.json``) so it is never part of
+    the tree it describes.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, repo_path: str, files: Dict[str, Dict[str, Any]] = None,
+                 commit: Optional[str] = None, updated_at: float = None):
+        self.repo_path = os.path.abspath(repo_path)
+        self.files = files if files is not None else {}
+        self.commit = commit
+        self.updated_at = updated_at or time.time()
+    
+    @staticmethod
+    def get_manifest_path(repo_path: str) -> str:
+        return os.path.abspath(repo_path).rstrip(os.sep) + '.manifest.json'
+    
+    @classmethod
+    def build(cls, repo_path: str, blobs: Optional[Dict[str, str]] = None,
+              commit: Optional[str] = None) -> 'RepositoryManifest':
+        """Create and save a manifest for a checkout.
+        
+        With a path -> blob SHA map from the checkout, hashes come for free
+        and only a stat per file is needed; otherwise the tree is scanned
+        and hashed once.
+        """
+        manifest = cls(repo_path, commit=commit)
+        if blobs is not None:
+            for path, sha in blobs.items():
+                manifest._set_entry(path, sha)
+        else:
+            manifest._set_entries(manifest._scan())
+        manifest.save()
+        return manifest
+    
+    @classmethod
+    def load(cls, repo_path: str) -> Optional['RepositoryManifest']:
+        """Load the manifest of a checkout, or None if it has none"""
+        manifest_path = cls.get_manifest_path(repo_path)
+        try:
+            mtime = os.stat(manifest_path).st_mtime_ns
+        except OSError:
+            return None
+        
+        loaded = _loaded.get(manifest_path)
+        if loaded is not None and loaded[0] == mtime:
+            return cls(repo_path, dict(loaded[1]['files']), loaded[1].get('commit'), loaded[1].get('updatedAt'))
+        
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != cls.FORMAT_VERSION:
+            return None
+        
+        _loaded[manifest_path] = (mtime, data)
+        return cls(repo_path, dict(data['files']), data.get('commit'), data.get('updatedAt'))
+    
+    @classmethod
+    def delete(cls, repo_path: str):
+        manifest_path = cls.get_manifest_path(repo_path)
+        _loaded.pop(manifest_path, None)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+    
+    @classmethod
+    def apply_changes(cls, repo_path: str, changed_paths: Iterable[str] = (),
+                      deleted_paths: Iterable[str] = ()) -> Optional['RepositoryManifest']:
+        """Refresh entries for changed files and drop deleted ones.
+        
+        Paths are relative to the repository root. Changed paths that no
+        longer exist are dropped as well. Does nothing if the checkout has
+        no manifest.
+        """
+        manifest_path = cls.get_manifest_path(repo_path)
+        with _manifest_lock(manifest_path):
+            manifest = cls.load(repo_path)
+            if manifest is None:
+                return None
+            
+            for path in deleted_paths:
+                manifest.files.pop(os.path.normpath(path), None)
+            manifest._set_entries(os.path.normpath(path) for path in changed_paths)
+            
+            manifest.updated_at = time.time()
+            manifest.save()
+            return manifest
+    
+    def save(self):
+        """Write the manifest atomically"""
+        manifest_path = self.get_manifest_path(self.repo_path)
+        data = {
+            'version': self.FORMAT_VERSION,
+            'commit': self.commit,
+            'updatedAt': self.updated_at,
+            'files': self.files
+        }
+        
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(manifest_path), prefix='.manifest-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, manifest_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        _loaded[manifest_path] = (os.stat(manifest_path).st_mtime_ns, data)
+    
+    def total_size(self) -> int:
+        return sum(entry['size'] for entry in self.files.values())
+    
+    def last_modified(self) -> float:
+        """Latest file mtime in seconds"""
+        return max((entry['mtime'] for entry in self.files.values()), default=0) / 1e9
+    
+    def _set_entries(self, paths: Iterable[str]):
+        for path in paths:
+            full_path = os.path.join(self.repo_path, path)
+            try:
+                if os.path.islink(full_path):
+                    content = os.fsencode(os.readlink(full_path))
+                else:
+                    with open(full_path, 'rb') as f:
+                        content = f.read()
+            except OSError:
+                self.files.pop(path, None)
+                continue
+            self._set_entry(path, blob_hash(content))
+    
+    def _set_entry(self, path: str, sha: str):
+        try:
+            stat = os.lstat(os.path.join(self.repo_path, path))
+        except OSError:
+            self.files.pop(path, None)
+            return
+        self.files[path] = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': sha,
+            'language': FileUtils.detect_language(path)
+        }
+    
+    def _scan(self) -> List[str]:
+        paths = []
+        stack = [self.repo_path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != '.git':
+                                stack.append(entry.path)
+                        else:
+                            paths.append(os.path.relpath(entry.path, self.repo_path))
+            except OSError:
+                continue
+        return paths
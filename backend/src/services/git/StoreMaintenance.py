@@ -0,0 +1,65 @@
+# backend/src/services/git/StoreMaintenance.py
+import time
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from config import Config
+
+class StoreMaintenance:
+    """Prunes the shared repository stores on a background timer.
+    
+    Pruning walks a whole store, so it runs every ``interval`` seconds on
+    its own thread instead of inline in the requests and analyses that
+    make stores grow.
+    """
+    
+    def __init__(self, interval: float = None):
+        self.interval = interval or Config.STORE_MAINTENANCE_INTERVAL
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, Any] = {
+            'runs': 0, 'blobsRemoved': 0, 'repositoriesRemoved': 0, 'lastRun': None, 'lastError': None
+        }
+    
+    def start(self):
+        """Start the timer thread (no-op if already running)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='store-maintenance', daemon=True)
+                self._thread.start()
+    
+    def run_once(self) -> Dict[str, Any]:
+        """Prune every store now, on the calling thread"""
+        from services.git.RepositoryManager import RepositoryManager
+        
+        error = None
+        blobs = repositories = 0
+        try:
+            repo_manager = RepositoryManager()
+            repositories = repo_manager.object_cache.prune()
+            blobs = repo_manager.prune_blob_store()
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Store maintenance failed: {e}")
+        
+        with self._lock:
+            self._stats['runs'] += 1
+            self._stats['blobsRemoved'] += blobs
+            self._stats['repositoriesRemoved'] += repositories
+            self._stats['lastRun'] = time.time()
+            self._stats['lastError'] = error
+            return dict(self._stats)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+    
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.run_once()
+
+# Process-wide maintenance timer, started with the app
+store_maintenance = StoreMaintenance()
@@ -0,0 +1,269 @@
+# backend/src/services/git/WatchScheduler.py
+import os
+import time
+import select
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+
+from config import Config
+from services.git.GitWatcher import GitWatcher
+
+class WatchedProject:
+    """Scheduling state and counters for one watched checkout"""
+    
+    def __init__(self, project_id: str, watcher: GitWatcher, interval: float):
+        self.project_id = project_id
+        self.watcher = watcher
+        self.interval = interval
+        self.next_check = time.monotonic()
+        self.in_flight = False
+        self.removed = False
+        self.checks = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_check = None
+        self.last_change = None
+        self.last_error = None
+        self.check_time = 0.0
+    
+    @property
+    def fileno(self) -> Optional[int]:
+        backend = self.watcher.backend
+        return backend.fileno() if backend is not None else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        backend = self.watcher.backend
+        return {
+            'projectId': self.project_id,
+            'repoPath': self.watcher.repo_path,
+            'backend': backend.name if backend is not None else None,
+            'interval': round(self.interval, 2),
+            'checks': self.checks,
+            'changes': self.changes,
+            'errors': self.errors,
+            'lastError': self.last_error,
+            'lastCheck': self.last_check,
+            'lastChange': self.last_change,
+            'averageCheckMs': round(self.check_time * 1000 / self.checks, 2) if self.checks else 0.0
+        }
+
+class WatchScheduler:
+    """Multiplexes every watched repository onto one scheduler thread.
+    
+    Event-driven backends (inotify) are waited on together with a single
+    ``select``; with none of them active the loop just waits on an event,
+    so it also runs where ``select`` only takes sockets (Windows). Polling backends are checked on a per-project timer whose
+    interval adapts: it drops to ``min_interval`` after a change and backs
+    off towards ``max_interval`` while the project stays idle. The checks
+    themselves, and the change callbacks they fire, run on a small worker
+    pool so one slow tree does not delay the others.
+    """
+    
+    def __init__(self, min_interval: float = None, max_interval: float = None,
+                 max_workers: int = None):
+        self.min_interval = min_interval or Config.WATCH_MIN_INTERVAL
+        self.max_interval = max_interval or Config.WATCH_MAX_INTERVAL
+        self.max_workers = max_workers or Config.WATCH_WORKERS
+        self.projects: Dict[str, WatchedProject] = {}
+        self.logger = logging.getLogger(__name__)
+        
+        self._lock = threading.Lock()
+        self._thread = None
+        self._executor = None
+        self._stopping = False
+        self._wake_event = threading.Event()
+        self._wake_read, self._wake_write = None, None
+    
+    def watch(self, project_id: str, repo_path: str = None, callback: Callable[[Dict[str, Any]], None] = None,
+              backend: str = None, watcher: GitWatcher = None) -> WatchedProject:
+        """Start watching a checkout, replacing any existing watch for the project"""
+        if watcher is None:
+            watcher = GitWatcher(repo_path, backend)
+        if callback is not None:
+            watcher.add_callback(callback)
+        
+        project = WatchedProject(project_id, watcher, self.min_interval)
+        with self._lock:
+            previous = self.projects.get(project_id)
+            self.projects[project_id] = project
+            self._ensure_running()
+        
+        if previous is not None:
+            self._release(previous)
+        self._wake()
+        return project
+    
+    def unwatch(self, project_id: str) -> bool:
+        """Stop watching a project; returns False if it was not watched"""
+        with self._lock:
+            project = self.projects.pop(project_id, None)
+        if project is None:
+            return False
+        
+        self._release(project)
+        self._wake()
+        return True
+    
+    def is_watching(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self.projects
+    
+    def get_stats(self, project_id: str = None):
+        """Stats for one project (None if not watched), or a list for all"""
+        with self._lock:
+            if project_id is not None:
+                project = self.projects.get(project_id)
+                return project.to_dict() if project else None
+            return [project.to_dict() for project in self.projects.values()]
+    
+    def stop(self):
+        """Stop the scheduler thread and release every watch"""
+        with self._lock:
+            self._stopping = True
+            projects = list(self.projects.values())
+            self.projects.clear()
+            thread = self._thread
+        
+        self._wake()
+        if thread is not None:
+            thread.join()
+        for project in projects:
+            self._release(project)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        
+        with self._lock:
+            self._thread = None
+            self._executor = None
+            self._stopping = False
+            for fd in (self._wake_read, self._wake_write):
+                if fd is not None:
+                    os.close(fd)
+            self._wake_read, self._wake_write = None, None
+    
+    def _ensure_running(self):
+        # Called with the lock held
+        if self._thread is not None:
+            return
+        
+        # Only needed to interrupt a select on inotify fds, which are POSIX-only
+        if os.name == 'posix':
+            self._wake_read, self._wake_write = os.pipe()
+            os.set_blocking(self._wake_read, False)
+            os.set_blocking(self._wake_write, False)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='watch')
+        self._thread = threading.Thread(target=self._run, name='watch-scheduler', daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                # Wakes from here on interrupt the wait below
+                self._wake_event.clear()
+                now = time.monotonic()
+                waiting = {}
+                due = []
+                next_check = now + self.max_interval
+                
+                for project in self.projects.values():
+                    if project.in_flight:
+                        continue
+                    fileno = project.fileno
+                    if fileno is not None:
+                        waiting[fileno] = project
+                    elif project.next_check <= now:
+                        due.append(project)
+                    else:
+                        next_check = min(next_check, project.next_check)
+                
+                for project in due:
+                    self._dispatch(project)
+                wake_read = self._wake_read
+            
+            # Dispatched checks wake the loop when they finish
+            timeout = max(0.0, next_check - time.monotonic())
+            if not waiting or wake_read is None:
+                self._wake_event.wait(timeout)
+                continue
+            
+            try:
+                readable, _, _ = select.select([wake_read] + list(waiting), [], [], timeout)
+            except (OSError, ValueError) as e:
+                # Usually a watch closed while we waited; back off rather than
+                # spin if the error persists
+                self.logger.warning(f"Watch select failed: {e}")
+                self._wake_event.wait(self.min_interval)
+                continue
+            
+            if wake_read in readable:
+                try:
+                    while os.read(wake_read, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            
+            with self._lock:
+                for fileno in readable:
+                    project = waiting.get(fileno)
+                    if project is not None and not project.in_flight and not project.removed:
+                        self._dispatch(project)
+    
+    def _dispatch(self, project: WatchedProject):
+        # Called with the lock held
+        project.in_flight = True
+        self._executor.submit(self._check, project)
+    
+    def _check(self, project: WatchedProject):
+        started = time.monotonic()
+        changes = []
+        try:
+            changes = project.watcher.check_for_changes()
+        except Exception as e:
+            project.errors += 1
+            project.last_error = str(e)
+            self.logger.warning(f"Watch check failed for {project.project_id}: {e}")
+        
+        finished = time.monotonic()
+        with self._lock:
+            project.checks += 1
+            project.check_time += finished - started
+            project.last_check = time.time()
+            
+            if changes:
+                project.changes += len(changes)
+                project.last_change = project.last_check
+                project.interval = self.min_interval
+            else:
+                project.interval = min(project.interval * Config.WATCH_BACKOFF, self.max_interval)
+            project.next_check = finished + project.interval
+            project.in_flight = False
+            removed = project.removed
+        
+        if removed:
+            project.watcher.close()
+        self._wake()
+    
+    def _release(self, project: WatchedProject):
+        with self._lock:
+            project.removed = True
+            in_flight = project.in_flight
+        # An in-flight check closes the watcher itself when it finishes
+        if not in_flight:
+            project.watcher.close()
+    
+    def _wake(self):
+        self._wake_event.set()
+        fd = self._wake_write
+        if fd is not None:
+            try:
+                os.write(fd, b'\0')
+            except (BlockingIOError, OSError):
+                pass
+
+# Process-wide scheduler shared by the API routes
+watch_scheduler = WatchScheduler()
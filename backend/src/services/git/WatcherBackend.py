@@ -0,0 +1,407 @@
+# backend/src/services/git/WatcherBackend.py
+import os
+import re
+import sys
+import time
+import errno
+import struct
+import select
+import fnmatch
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Iterable
+
+from config import Config
+
+class WatchIgnoreRules:
+    """Decides which paths a watcher reports.
+    
+    Dot-directories and ``Config.IGNORED_DIRECTORIES`` are never entered;
+    file names matching any of ``patterns`` (shell globs, e.g. editor swap
+    files) are never reported.
+    """
+    
+    def __init__(self, patterns: Optional[Iterable[str]] = None, directories: Optional[Iterable[str]] = None):
+        self.directories = set(Config.IGNORED_DIRECTORIES if directories is None else directories)
+        patterns = list(Config.WATCH_IGNORE_PATTERNS if patterns is None else patterns)
+        
+        # One compiled alternation instead of an fnmatch call per pattern
+        self._file_pattern = re.compile('|'.join(fnmatch.translate(p) for p in patterns)) if patterns else None
+    
+    def is_ignored_directory(self, name: str) -> bool:
+        return name.startswith('.') or name in self.directories
+    
+    def is_ignored_file(self, name: str) -> bool:
+        return bool(self._file_pattern and self._file_pattern.match(name))
+
+class WatcherBackend(ABC):
+    """Source of file change events for one repository checkout.
+    
+    ``start`` records the current state without reporting anything;
+    each ``poll`` then returns the changes since the previous call as
+    ``{'type': 'added' | 'modified' | 'deleted', 'path', 'timestamp'}``
+    dicts with absolute paths. ``start`` can be given the known files
+    (absolute path -> ``(mtime_ns, size)``, e.g. from a repository
+    manifest) instead of scanning the tree for them.
+    """
+    
+    name = 'base'
+    
+    def __init__(self, repo_path: str, ignore_rules: WatchIgnoreRules = None):
+        self.repo_path = os.path.abspath(repo_path)
+        self.ignore_rules = ignore_rules or WatchIgnoreRules()
+    
+    @abstractmethod
+    def start(self, known_files: Optional[Dict[str, tuple]] = None):
+        """Record the current state of the tree"""
+        pass
+    
+    @abstractmethod
+    def poll(self, timeout: float = 0) -> List[Dict[str, Any]]:
+        """Changes since the previous call"""
+        pass
+    
+    def fileno(self) -> Optional[int]:
+        """Descriptor that becomes readable when events are pending, if any"""
+        return None
+    
+    def close(self):
+        pass
+    
+    def _scan(self, top: str):
+        """Yield ``os.DirEntry`` objects for every watched file under ``top``"""
+        stack = [top]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self.ignore_rules.is_ignored_directory(entry.name):
+                                    stack.append(entry.path)
+                            elif not self.ignore_rules.is_ignored_file(entry.name):
+                                yield entry
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+class PollingWatcherBackend(WatcherBackend):
+    """Portable fallback: one ``os.scandir`` pass per poll.
+    
+    Deletions fall out of the same pass (previously known paths that were
+    not seen), so the tree is only walked once.
+    """
+    
+    name = 'polling'
+    
+    def __init__(self, repo_path: str, ignore_rules: WatchIgnoreRules = None):
+        super().__init__(repo_path, ignore_rules)
+        self._files: Dict[str, tuple] = {}
+    
+    def start(self, known_files: Optional[Dict[str, tuple]] = None):
+        self._files = dict(known_files) if known_files is not None else self._snapshot()
+    
+    def poll(self, timeout: float = 0) -> List[Dict[str, Any]]:
+        if timeout:
+            time.sleep(timeout)
+        
+        previous = self._files
+        current = self._snapshot()
+        changes = []
+        
+        for path, signature in current.items():
+            before = previous.pop(path, None)
+            if before is None:
+                changes.append({'type': 'added', 'path': path, 'timestamp': signature[0] / 1e9})
+            elif before != signature:
+                changes.append({'type': 'modified', 'path': path, 'timestamp': signature[0] / 1e9})
+        
+        now = time.time()
+        for path in previous:
+            changes.append({'type': 'deleted', 'path': path, 'timestamp': now})
+        
+        self._files = current
+        return changes
+    
+    def _snapshot(self) -> Dict[str, tuple]:
+        files = {}
+        for entry in self._scan(self.repo_path):
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE |
+               _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    return _libc
+
+class InotifyWatcherBackend(WatcherBackend):
+    """Linux backend: the kernel reports changes, so a poll costs nothing
+    when the tree is idle and is proportional to the number of events
+    otherwise.
+    
+    One watch is registered per (non-ignored) directory when watching
+    starts. If the kernel event queue overflows, the next poll falls back
+    to a single rescan against the known file set.
+    """
+    
+    name = 'inotify'
+    
+    def __init__(self, repo_path: str, ignore_rules: WatchIgnoreRules = None):
+        super().__init__(repo_path, ignore_rules)
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise self._error("inotify_init1")
+        
+        self._paths: Dict[int, str] = {}  # watch descriptor -> directory
+        self._watches: Dict[str, int] = {}  # directory -> watch descriptor
+        self._files = set()
+        self._last_poll = time.time()
+    
+    def start(self, known_files: Optional[Dict[str, tuple]] = None):
+        self._files = set()
+        if known_files is None:
+            self._watch_tree(self.repo_path, report=None)
+        else:
+            # Directories follow from the known files; nothing is listed
+            self._files = set(known_files)
+            directories = {self.repo_path}
+            for path in self._files:
+                directory = os.path.dirname(path)
+                while directory not in directories and directory.startswith(self.repo_path):
+                    directories.add(directory)
+                    directory = os.path.dirname(directory)
+            for directory in directories:
+                self._add_watch(directory)
+        self._last_poll = time.time()
+    
+    def fileno(self) -> Optional[int]:
+        return self._fd
+    
+    def poll(self, timeout: float = 0) -> List[Dict[str, Any]]:
+        changes = []
+        if timeout:
+            select.select([self._fd], [], [], timeout)
+        
+        overflowed = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode(errors='surrogateescape')
+                offset += length
+                
+                if mask & _IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                self._handle_event(wd, mask, name, changes)
+        
+        if overflowed:
+            changes.extend(self._rescan())
+        
+        self._last_poll = time.time()
+        return changes
+    
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+    
+    def _handle_event(self, wd: int, mask: int, name: str, changes: List[Dict[str, Any]]):
+        directory = self._paths.get(wd)
+        if directory is None:
+            return
+        
+        if mask & _IN_IGNORED:
+            # Watch removed by the kernel (directory deleted or unmounted)
+            self._paths.pop(wd, None)
+            if self._watches.get(directory) == wd:
+                del self._watches[directory]
+            return
+        if mask & _IN_DELETE_SELF:
+            return
+        
+        path = os.path.join(directory, name)
+        now = time.time()
+        
+        if mask & _IN_ISDIR:
+            if self.ignore_rules.is_ignored_directory(name):
+                return
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._watch_tree(path, report=changes)
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                self._forget_tree(path, changes)
+            return
+        
+        if self.ignore_rules.is_ignored_file(name):
+            return
+        
+        if mask & (_IN_DELETE | _IN_MOVED_FROM):
+            if path in self._files:
+                self._files.discard(path)
+                changes.append({'type': 'deleted', 'path': path, 'timestamp': now})
+        elif mask & _IN_CREATE:
+            # Contents follow with IN_CLOSE_WRITE, reported as part of the add
+            if path not in self._files:
+                self._files.add(path)
+                changes.append({'type': 'added', 'path': path, 'timestamp': now})
+        elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+            # Atomic replace (write temp file, rename over) arrives as MOVED_TO
+            if path in self._files:
+                if not (changes and changes[-1]['path'] == path):
+                    changes.append({'type': 'modified', 'path': path, 'timestamp': now})
+            else:
+                self._files.add(path)
+                changes.append({'type': 'added', 'path': path, 'timestamp': now})
+    
+    def _watch_tree(self, top: str, report: Optional[List[Dict[str, Any]]]):
+        """Watch ``top`` and its subdirectories; report files found if asked.
+        
+        The directory is watched before it is listed, so files created in
+        between are seen by one or the other.
+        """
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            if not self._add_watch(directory):
+                continue
+            
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not self.ignore_rules.is_ignored_directory(entry.name):
+                                    stack.append(entry.path)
+                            elif not self.ignore_rules.is_ignored_file(entry.name) and entry.path not in self._files:
+                                self._files.add(entry.path)
+                                if report is not None:
+                                    report.append({'type': 'added', 'path': entry.path, 'timestamp': time.time()})
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    
+    def _add_watch(self, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            error = self._error("inotify_add_watch")
+            if error.errno == errno.ENOSPC:
+                raise error
+            return False
+        self._paths[wd] = directory
+        self._watches[directory] = wd
+        return True
+    
+    def _forget_tree(self, top: str, changes: List[Dict[str, Any]]):
+        prefix = top + os.sep
+        for directory in [d for d in self._watches if d == top or d.startswith(prefix)]:
+            wd = self._watches.pop(directory)
+            self._paths.pop(wd, None)
+            # Still valid after a move out of the tree; already gone after a delete
+            self._libc.inotify_rm_watch(self._fd, wd)
+        
+        now = time.time()
+        for path in [p for p in self._files if p.startswith(prefix)]:
+            self._files.discard(path)
+            changes.append({'type': 'deleted', 'path': path, 'timestamp': now})
+    
+    def _rescan(self) -> List[Dict[str, Any]]:
+        """Recover from a queue overflow by diffing against the known files"""
+        changes = []
+        seen = set()
+        since = self._last_poll
+        
+        for entry in self._scan(self.repo_path):
+            seen.add(entry.path)
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+            if entry.path not in self._files:
+                changes.append({'type': 'added', 'path': entry.path, 'timestamp': mtime})
+            elif mtime >= since:
+                changes.append({'type': 'modified', 'path': entry.path, 'timestamp': mtime})
+        
+        now = time.time()
+        for path in self._files - seen:
+            changes.append({'type': 'deleted', 'path': path, 'timestamp': now})
+        
+        # Directories created while events were lost need watches too
+        for directory in list(self._watches):
+            self._libc.inotify_rm_watch(self._fd, self._watches.pop(directory))
+        self._paths.clear()
+        self._files = set()
+        self._watch_tree(self.repo_path, report=None)
+        return changes
+    
+    def _error(self, call: str) -> OSError:
+        import ctypes
+        code = ctypes.get_errno()
+        return OSError(code, f"{call} failed: {os.strerror(code)}")
+
+BACKENDS = {
+    'inotify': InotifyWatcherBackend,
+    'polling': PollingWatcherBackend
+}
+
+def create_watcher_backend(repo_path: str, backend: str = None, ignore_rules: WatchIgnoreRules = None,
+                           known_files: Optional[Dict[str, tuple]] = None) -> WatcherBackend:
+    """Create and start a watcher backend.
+    
+    ``backend`` is ``inotify``, ``polling`` or ``auto`` (default
+    ``Config.WATCH_BACKEND``): inotify where available, falling back to
+    polling if it cannot be set up (non-Linux, or out of watches).
+    """
+    backend = backend or Config.WATCH_BACKEND
+    if backend != 'auto' and backend not in BACKENDS:
+        raise ValueError(f"backend must be one of: auto, {', '.join(BACKENDS)}")
+    
+    names = ['inotify', 'polling'] if backend == 'auto' else [backend]
+    for name in names:
+        watcher = None
+        try:
+            watcher = BACKENDS[name](repo_path, ignore_rules)
+            watcher.start(known_files)
+            return watcher
+        except OSError:
+            if watcher is not None:
+                watcher.close()
+            if name == names[-1]:
+                raise
@@ -36,6 +36,46 @@ class CentralityCalculator:
             self.logger.error(f"Failed to calculate centralities: {e}")
             return {}
     
+    def refresh_centralities(self, graph_data: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Recalculate centralities after a small graph change.
+        
+        PageRank and eigenvector centrality are warm-started from the previous
+        scores, so they converge in a few iterations when little has changed.
+        """
+        if not previous:
+            return self.calculate_all_centralities(graph_data)
+        
+        try:
+            G = self._build_networkx_graph(graph_data)
+            
+            if G.number_of_nodes() == 0:
+                return {}
+            
+            centralities = {}
+            centralities['pagerank'] = self._calculate_pagerank(G, self._warm_start(G, previous.get('pagerank')))
+            centralities['betweenness'] = self._calculate_betweenness_centrality(G)
+            centralities['degree'] = self._calculate_degree_centrality(G)
+            centralities['eigenvector'] = self._calculate_eigenvector_centrality(G, self._warm_start(G, previous.get('eigenvector')))
+            centralities['closeness'] = self._calculate_closeness_centrality(G)
+            centralities['importance'] = self._calculate_composite_importance(centralities)
+            
+            return centralities
+            
+        except Exception as e:
+            self.logger.error(f"Failed to refresh centralities: {e}")
+            return self.calculate_all_centralities(graph_data)
+    
+    def _warm_start(self, G: nx.DiGraph, scores: Optional[Dict[str, float]]) -> Optional[Dict[str, float]]:
+        """Seed an iterative measure with previous scores, defaulting new nodes"""
+        if not scores:
+            return None
+        
+        default = 1.0 / G.number_of_nodes()
+        start = {node: scores.get(node, default) for node in G.nodes()}
+        
+        # Iterative solvers reject an all-zero starting vector
+        return start if any(start.values()) else None
+    
     def _build_networkx_graph(self, graph_data: Dict[str, Any]) -> nx.DiGraph:
         """Convert graph data to NetworkX directed graph"""
         G = nx.DiGraph()
@@ -59,15 +99,19 @@ class CentralityCalculator:
             if isinstance(target, dict):
                 target = target.get('id')
             
+            # Co-change coupling is not a structural dependency
+            if edge.get('type') == 'co-change':
+                continue
+            
             if source and target and source in G and target in G:
                 G.add_edge(source, target, **edge)
         
         return G
     
-    def _calculate_pagerank(self, G: nx.DiGraph) -> Dict[str, float]:
+    def _calculate_pagerank(self, G: nx.DiGraph, nstart: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """Calculate PageRank centrality"""
         try:
-            return nx.pagerank(G, alpha=0.85, max_iter=100, tol=1e-06)
+            return nx.pagerank(G, alpha=0.85, max_iter=100, tol=1e-06, nstart=nstart)
         except Exception as e:
             self.logger.warning(f"PageRank calculation failed: {e}")
             return {node: 0.0 for node in G.nodes()}
@@ -106,12 +150,12 @@ class CentralityCalculator:
             self.logger.warning(f"Degree centrality calculation failed: {e}")
             return {node: 0.0 for node in G.nodes()}
     
-    def _calculate_eigenvector_centrality(self, G: nx.DiGraph) -> Dict[str, float]:
+    def _calculate_eigenvector_centrality(self, G: nx.DiGraph, nstart: Optional[Dict[str, float]] = None) -> Dict[str, float]:
         """Calculate eigenvector centrality"""
         try:
             # Convert to undirected for eigenvector centrality
             G_undirected = G.to_undirected()
-            return nx.eigenvector_centrality(G_undirected, max_iter=1000, tol=1e-06)
+            return nx.eigenvector_centrality(G_undirected, max_iter=1000, tol=1e-06, nstart=nstart)
         except Exception as e:
             self.logger.warning(f"Eigenvector centrality calculation failed: {e}")
             return {node: 0.0 for node in G.nodes()}
@@ -0,0 +1,185 @@
+# backend/src/services/graph/ChangeCoalescer.py
+import os
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Optional, Callable
+
+from config import Config
+from services.git.RepositoryManifest import RepositoryManifest
+from services.graph.SourceDiscovery import SourceDiscovery
+
+class ChangeBatch:
+    """Pending, already-collapsed file changes for one project"""
+    
+    # (previous, incoming) -> collapsed state; None drops the path entirely
+    TRANSITIONS = {
+        ('added', 'modified'): 'added',
+        ('added', 'deleted'): None,
+        ('modified', 'added'): 'modified',
+        ('modified', 'deleted'): 'deleted',
+        ('deleted', 'added'): 'modified',
+        ('deleted', 'modified'): 'modified'
+    }
+    
+    def __init__(self, project_id: str, repo_path: str, db_manager=None):
+        self.project_id = project_id
+        self.repo_path = repo_path
+        self.db_manager = db_manager
+        self.changes: Dict[str, str] = {}
+        self.events = 0
+        self.first_event = None
+        self.last_event = None
+    
+    def add(self, change_type: str, path: str):
+        now = time.monotonic()
+        self.first_event = self.first_event or now
+        self.last_event = now
+        self.events += 1
+        
+        previous = self.changes.get(path)
+        state = self.TRANSITIONS.get((previous, change_type), change_type) if previous else change_type
+        if state is None:
+            del self.changes[path]
+        else:
+            self.changes[path] = state
+    
+    def deadline(self, window: float, max_delay: float) -> float:
+        """Flush once the batch has been quiet for ``window`` or open for ``max_delay``"""
+        return min(self.last_event + window, self.first_event + max_delay)
+
+class ChangeCoalescer:
+    """Debounces watcher events into one incremental graph update per burst.
+    
+    A branch switch or formatter run touches many files within a second.
+    Events are collected per project until the project has been quiet for
+    ``window`` seconds (or ``max_delay`` has passed since the first event),
+    add/modify/delete sequences for the same path are collapsed, and the
+    surviving changes are handed to ``IncrementalGraphUpdater.update_files``
+    as a single changeset. Updates run on one background worker.
+    
+    A batch affects more files than it changes: files importing a path
+    that was added or removed are relinked too. ``affectedFiles`` in the
+    stats counts both.
+    """
+    
+    def __init__(self, window: float = None, max_delay: float = None):
+        self.window = window or Config.CHANGE_DEBOUNCE_WINDOW
+        self.max_delay = max_delay or Config.CHANGE_MAX_DELAY
+        self.logger = logging.getLogger(__name__)
+        
+        self._batches: Dict[str, ChangeBatch] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graph-update')
+    
+    def callback_for(self, project_id: str, repo_path: str, db_manager=None) -> Callable[[Dict[str, Any]], None]:
+        """Watcher callback that feeds a project's changes into the coalescer"""
+        def on_change(change: Dict[str, Any]):
+            self.add(project_id, repo_path, [change], db_manager)
+        return on_change
+    
+    def add(self, project_id: str, repo_path: str, changes: Iterable[Dict[str, Any]], db_manager=None):
+        """Queue watcher change events (absolute paths) for a project"""
+        with self._condition:
+            batch = self._batches.get(project_id)
+            if batch is None:
+                batch = self._batches[project_id] = ChangeBatch(project_id, repo_path, db_manager)
+            
+            for change in changes:
+                batch.add(change['type'], os.path.relpath(change['path'], repo_path))
+            
+            if not batch.events:
+                del self._batches[project_id]
+                return
+            
+            self._ensure_running()
+            self._condition.notify()
+    
+    def discard(self, project_id: str):
+        """Drop pending changes for a project (e.g. when it stops being watched)"""
+        with self._condition:
+            self._batches.pop(project_id, None)
+            self._stats.pop(project_id, None)
+    
+    def flush(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Apply a project's pending changes now, on the calling thread"""
+        with self._condition:
+            batch = self._batches.pop(project_id, None)
+        return self._apply(batch) if batch else None
+    
+    def get_stats(self, project_id: str) -> Dict[str, Any]:
+        with self._condition:
+            batch = self._batches.get(project_id)
+            stats = dict(self._stats.get(project_id, {}))
+            stats['pendingFiles'] = len(batch.changes) if batch else 0
+            return stats
+    
+    def _ensure_running(self):
+        # Called with the condition held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='change-coalescer', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._batches:
+                    self._condition.wait()
+                
+                now = time.monotonic()
+                ready = [
+                    project_id for project_id, batch in self._batches.items()
+                    if batch.deadline(self.window, self.max_delay) <= now
+                ]
+                if not ready:
+                    next_deadline = min(
+                        batch.deadline(self.window, self.max_delay) for batch in self._batches.values()
+                    )
+                    self._condition.wait(next_deadline - now)
+                    continue
+                
+                for project_id in ready:
+                    self._executor.submit(self._apply, self._batches.pop(project_id))
+    
+    def _apply(self, batch: ChangeBatch) -> Optional[Dict[str, Any]]:
+        changed = [path for path, state in batch.changes.items() if state != 'deleted']
+        deleted = [path for path, state in batch.changes.items() if state == 'deleted']
+        
+        result = None
+        error = None
+        try:
+            # The manifest tracks every file; the graph only non-ignored source files
+            RepositoryManifest.apply_changes(batch.repo_path, changed, deleted)
+            discovery = SourceDiscovery(batch.repo_path)
+            changed = discovery.discover(changed)
+            deleted = discovery.discover(deleted)
+            
+            if changed or deleted:
+                from services.graph.IncrementalGraphUpdater import IncrementalGraphUpdater
+                updater = IncrementalGraphUpdater(batch.db_manager)
+                result = updater.update_files(batch.project_id, batch.repo_path, changed, deleted)
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Incremental update failed for {batch.project_id}: {e}")
+        
+        with self._condition:
+            stats = self._stats.setdefault(batch.project_id, {
+                'batches': 0, 'events': 0, 'files': 0, 'affectedFiles': 0,
+                'lastUpdate': None, 'lastResult': None, 'lastError': None
+            })
+            stats['batches'] += 1
+            stats['events'] += batch.events
+            stats['files'] += len(batch.changes)
+            if result:
+                # Reparsed files and their importers, plus removed files
+                stats['affectedFiles'] += result['relinkedFiles'] + result['removedFiles']
+            stats['lastUpdate'] = time.time()
+            stats['lastResult'] = result
+            stats['lastError'] = error
+        return result
+
+# Process-wide coalescer fed by the watch scheduler
+change_coalescer = ChangeCoalescer()
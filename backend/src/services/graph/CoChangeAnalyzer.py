@@ -0,0 +1,154 @@
+# backend/src/services/graph/CoChangeAnalyzer.py
+import os
+import logging
+import threading
+import contextlib
+import subprocess
+from typing import Dict, Any, Callable, Optional
+
+from config import Config
+from database.GraphDataManager import GraphDataManager
+from services.git.GitHistoryMiner import GitHistoryMiner
+from services.graph.GraphEventBroker import graph_event_broker
+from services.graph.IncrementalGraphUpdater import _project_lock
+
+class CoChangeAnalyzer:
+    """Adds change-history signals to a stored graph.
+    
+    Mines the commit history behind a project and writes per-file churn
+    (``commitCount``, ``linesAdded``, ``linesDeleted``, ``authorCount``,
+    ``lastCommitted``, ``hotspot``) onto its nodes, and logical coupling as
+    weighted ``co-change`` edges between files that keep changing together.
+    Co-change edges replace those of any earlier run; import edges are left
+    alone and centrality ignores co-change edges.
+    """
+    
+    EDGE_TYPE = 'co-change'
+    NODE_ATTRIBUTES = ('commitCount', 'linesAdded', 'linesDeleted', 'authorCount', 'lastCommitted', 'hotspot')
+    
+    def __init__(self, db_manager=None):
+        self.graph_data_manager = GraphDataManager(db_manager)
+        self.logger = logging.getLogger(__name__)
+    
+    def analyze(self, project_id: str, max_commits: Optional[int] = None, min_support: Optional[int] = None,
+                min_confidence: Optional[float] = None,
+                report: Callable[[str, float], None] = None,
+                is_cancelled: Callable[[], bool] = None,
+                clone_slots: Optional[threading.Semaphore] = None) -> Optional[Dict[str, Any]]:
+        """Mine the project's history and patch its graph; None if the project has no graph.
+        
+        ``report(stage, percent)`` is called as work progresses and
+        ``is_cancelled()`` is polled between stages and while mining; a
+        cancelled run raises ``AnalysisCancelledError`` and leaves the graph
+        untouched. With ``clone_slots`` fetching the history waits for a
+        free slot first.
+        """
+        from services.analysis.AnalysisPipeline import AnalysisCancelledError
+        
+        report = report or (lambda stage, progress: None)
+        is_cancelled = is_cancelled or (lambda: False)
+        
+        def checkpoint(stage: str, progress: float):
+            if is_cancelled():
+                raise AnalysisCancelledError(f"Co-change analysis cancelled during {stage}")
+            report(stage, progress)
+        
+        metadata = self.graph_data_manager.get_project_metadata(project_id)
+        stored_graph = self.graph_data_manager.get_graph(project_id)
+        if metadata is None or stored_graph is None:
+            return None
+        
+        # Mining runs outside the project lock; only the patch is serialized
+        max_commits = min(max_commits or Config.COCHANGE_DEFAULT_COMMITS, Config.COCHANGE_MAX_COMMITS)
+        checkpoint('fetch', 0)
+        with clone_slots or contextlib.nullcontext():
+            git_dir, rev, subdir = self._history_source(metadata, max_commits)
+        checkpoint('mine', 30)
+        paths = {node.get('path', '').replace(os.sep, '/') for node in stored_graph.get('nodes', [])}
+        miner = GitHistoryMiner(git_dir, paths=paths, subdir=subdir)
+        summary = miner.mine(rev, max_commits, is_cancelled=is_cancelled)
+        co_changes = miner.co_changes(min_support, min_confidence)[:Config.COCHANGE_MAX_EDGES]
+        
+        with _project_lock(project_id):
+            checkpoint('save', 90)
+            stored_graph = self.graph_data_manager.get_graph(project_id)
+            if stored_graph is None:
+                return None
+            new_graph = self._patch(stored_graph, miner, co_changes)
+            self.graph_data_manager.update_graph(project_id, new_graph)
+            graph_version = self.graph_data_manager.get_graph_version(project_id)
+            graph_event_broker.publish_graph_delta(
+                project_id,
+                stored_graph,
+                {**new_graph, 'centrality_scores': stored_graph.get('centrality_scores', {})},
+                graph_version
+            )
+        
+        return {
+            **summary,
+            'graphVersion': graph_version,
+            'coChangeEdges': new_graph['metrics']['co_change_edge_count']
+        }
+    
+    def _history_source(self, metadata: Dict[str, Any], max_commits: int):
+        """Git directory, revision and subdirectory (or None) to mine for a project"""
+        from services.git.GitObjectCache import GitObjectCache
+        
+        # Local imports are mined in place when they are git working trees;
+        # an import of a subdirectory only sees that directory's history
+        source_path = metadata.get('source_path')
+        if source_path:
+            result = subprocess.run(
+                ['git', '-C', source_path, 'rev-parse', '--absolute-git-dir', '--show-prefix'],
+                capture_output=True, text=True
+            ) if os.path.isdir(source_path) else None
+            if result is None or result.returncode != 0:
+                raise ValueError('Project was imported without git history')
+            git_dir, _, prefix = result.stdout.partition('\n')
+            return git_dir.strip(), 'HEAD', prefix.strip() or None
+        
+        object_cache = GitObjectCache()
+        git_url = metadata['git_url']
+        commit = metadata.get('commit')
+        
+        # Commits and trees are enough for co-change; line counts come along
+        # when the cache already holds the blobs
+        head = object_cache.fetch(
+            git_url, commit, GitObjectCache.BLOBLESS, commit=commit, depth=max_commits
+        )
+        return object_cache.get_cache_path(git_url), head, None
+    
+    def _patch(self, stored_graph: Dict[str, Any], miner: GitHistoryMiner, co_changes) -> Dict[str, Any]:
+        hotspots = miner.hotspots()
+        ids_by_path = {}
+        nodes = []
+        for node in stored_graph.get('nodes', []):
+            path = node.get('path', '').replace(os.sep, '/')
+            ids_by_path[path] = node['id']
+            
+            node = {key: value for key, value in node.items() if key not in self.NODE_ATTRIBUTES}
+            history = miner.files.get(path)
+            if history is not None:
+                node.update(history.to_dict(), hotspot=hotspots.get(path, 0.0))
+            nodes.append(node)
+        
+        edges = [edge for edge in stored_graph.get('edges', []) if edge.get('type') != self.EDGE_TYPE]
+        co_change_count = 0
+        for pair in co_changes:
+            # Files may have been removed while the history was being mined
+            if pair['source'] not in ids_by_path or pair['target'] not in ids_by_path:
+                continue
+            co_change_count += 1
+            edges.append({
+                'source': ids_by_path[pair['source']],
+                'target': ids_by_path[pair['target']],
+                'type': self.EDGE_TYPE,
+                'line': 0,
+                'strength': pair['confidence'],
+                'support': pair['support']
+            })
+        
+        # Structural metrics keep describing import edges only
+        metrics = dict(stored_graph.get('metrics', {}))
+        metrics['co_change_edge_count'] = co_change_count
+        return {'nodes': nodes, 'edges': edges, 'metrics': metrics}
@@ -0,0 +1,142 @@
+# backend/src/services/graph/GraphBinaryEncoder.py
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Any, List
+
+class GraphBinaryEncoder:
+    """Encodes graph data as typed-array buffers for the 3D renderer.
+    
+    Layout (little-endian):
+        4 bytes   magic ``CFGB``
+        uint32    manifest length in bytes
+        manifest  UTF-8 JSON describing counts and sections, padded to 4 bytes
+        body      sections at the manifest offsets (relative to body start),
+                  each 4-byte aligned so it can be viewed as a typed array
+    
+    Node string columns and ``edge.type`` are uint32 indices into the string
+    table (``strings.offsets`` delimits UTF-8 slices of ``strings.data``).
+    ``edge.source`` / ``edge.target`` are int32 indices into the node arrays.
+    """
+    
+    MAGIC = b'CFGB'
+    FORMAT_VERSION = 1
+    
+    # Node attributes needed to build the binary payload
+    NODE_FIELDS = ['id', 'path', 'name', 'language', 'size', 'lines',
+                   'temperature', 'importance_score']
+    EDGE_FIELDS = ['source', 'target', 'type', 'strength']
+    
+    NODE_STRING_COLUMNS = ['id', 'path', 'name', 'language']
+    
+    def encode(self, graph_data: Dict[str, Any], graph_version: int = 0) -> bytes:
+        """Encode nodes, edges and centrality importance into a binary buffer"""
+        nodes = graph_data.get('nodes', [])
+        edges = graph_data.get('edges', [])
+        importance = graph_data.get('centrality_scores', {}).get('importance', {})
+        
+        strings = _StringTable()
+        node_index = {}
+        
+        node_strings = {column: array('I') for column in self.NODE_STRING_COLUMNS}
+        node_floats = {column: array('f') for column in ('size', 'lines', 'temperature', 'importance')}
+        
+        for index, node in enumerate(nodes):
+            node_id = node.get('id', '')
+            node_index[node_id] = index
+            
+            for column in self.NODE_STRING_COLUMNS:
+                node_strings[column].append(strings.add(str(node.get(column) or '')))
+            
+            node_floats['size'].append(float(node.get('size') or 0))
+            node_floats['lines'].append(float(node.get('lines') or 0))
+            node_floats['temperature'].append(float(node.get('temperature') or 0))
+            node_floats['importance'].append(
+                float(importance.get(node_id, node.get('importance_score') or 0))
+            )
+        
+        edge_source = array('i')
+        edge_target = array('i')
+        edge_type = array('I')
+        edge_strength = array('f')
+        
+        for edge in edges:
+            source = node_index.get(self._endpoint_id(edge.get('source')))
+            target = node_index.get(self._endpoint_id(edge.get('target')))
+            if source is None or target is None:
+                continue
+            
+            edge_source.append(source)
+            edge_target.append(target)
+            edge_type.append(strings.add(str(edge.get('type') or 'unknown')))
+            strength = edge.get('strength', 1.0)
+            edge_strength.append(float(strength if strength is not None else 1.0))
+        
+        sections = [(f'node.{column}', 'uint32', values) for column, values in node_strings.items()]
+        sections += [(f'node.{column}', 'float32', values) for column, values in node_floats.items()]
+        sections += [
+            ('edge.source', 'int32', edge_source),
+            ('edge.target', 'int32', edge_target),
+            ('edge.type', 'uint32', edge_type),
+            ('edge.strength', 'float32', edge_strength),
+            ('strings.offsets', 'uint32', strings.offsets),
+            ('strings.data', 'utf8', strings.data)
+        ]
+        
+        return self._pack(sections, {
+            'formatVersion': self.FORMAT_VERSION,
+            'graphVersion': graph_version,
+            'nodeCount': len(nodes),
+            'edgeCount': len(edge_source),
+            'stringCount': len(strings.offsets) - 1
+        })
+    
+    def _pack(self, sections: List, manifest: Dict[str, Any]) -> bytes:
+        """Lay out sections with 4-byte alignment and prepend the manifest"""
+        body = bytearray()
+        manifest['sections'] = []
+        
+        for name, kind, values in sections:
+            if isinstance(values, array):
+                if sys.byteorder == 'big':
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                raw = values.tobytes()
+                count = len(values)
+            else:
+                raw = bytes(values)
+                count = len(raw)
+            
+            manifest['sections'].append({
+                'name': name,
+                'type': kind,
+                'offset': len(body),
+                'count': count
+            })
+            body += raw
+            body += b'\0' * (-len(body) % 4)
+        
+        manifest_bytes = json.dumps(manifest, separators=(',', ':')).encode()
+        manifest_bytes += b' ' * (-len(manifest_bytes) % 4)
+        
+        return self.MAGIC + struct.pack('<I', len(manifest_bytes)) + manifest_bytes + bytes(body)
+    
+    def _endpoint_id(self, endpoint: Any) -> str:
+        # Edges may reference nodes by id or by embedded node object
+        return endpoint.get('id') if isinstance(endpoint, dict) else endpoint
+
+class _StringTable:
+    """Deduplicated UTF-8 string table"""
+    
+    def __init__(self):
+        self.index = {}
+        self.offsets = array('I', [0])
+        self.data = bytearray()
+    
+    def add(self, value: str) -> int:
+        if value not in self.index:
+            self.index[value] = len(self.offsets) - 1
+            self.data += value.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return self.index[value]
@@ -1,6 +1,6 @@
 # backend/src/services/graph/GraphBuilder.py
 import networkx as nx
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List, Set, Optional, Callable
 import os
 
 from services.parsing.ParserFactory import ParserFactory
@@ -10,8 +10,10 @@ from config import Config
 class GraphBuilder:
     """Builds dependency graphs from parsed code"""
     
-    def __init__(self):
+    def __init__(self, blob_store=None):
         self.parser_factory = ParserFactory()
+        self.blob_store = blob_store
+        self.discovery_stats: Dict[str, Any] = {}
     
     def build_graph(self, repo_path: str) -> Dict[str, Any]:
         """Build a complete dependency graph from repository"""
@@ -20,7 +22,7 @@ class GraphBuilder:
             source_files = self._discover_source_files(repo_path)
             
             # Parse all files
-            parsed_files = self._parse_files(source_files)
+            parsed_files = self._parse_files(source_files, repo_path)
             
             # Build graph structure
             graph = self._build_graph_structure(parsed_files, repo_path)
@@ -31,11 +33,13 @@ class GraphBuilder:
             return {
                 'nodes': graph['nodes'],
                 'edges': graph['edges'],
+                'symbols': graph['symbols'],
                 'metrics': metrics,
                 'metadata': {
                     'total_files': len(source_files),
                     'parsed_files': len(parsed_files),
-                    'repository_path': repo_path
+                    'repository_path': repo_path,
+                    'discovery': self.discovery_stats
                 }
             }
             
@@ -43,28 +47,36 @@ class GraphBuilder:
             raise RuntimeError(f"Failed to build graph: {str(e)}")
     
     def _discover_source_files(self, repo_path: str) -> List[str]:
-        """Discover all source code files in repository"""
-        source_files = []
+        """Discover all source code files in repository.
         
-        for root, dirs, files in os.walk(repo_path):
-            # Skip common non-source directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                      d not in ['node_modules', '__pycache__', 'venv', 'env', 'dist', 'build']]
-            
-            for file in files:
-                if FileUtils.is_allowed_file(file):
-                    file_path = os.path.join(root, file)
-                    # Make path relative to repository root
-                    rel_path = os.path.relpath(file_path, repo_path)
-                    source_files.append(rel_path)
+        Honors the repository's ``.gitignore`` files; counts end up in
+        ``discovery_stats``. Checkouts with a manifest are filtered from it
+        instead of scanned.
+        """
+        from services.git.RepositoryManifest import RepositoryManifest
+        from services.graph.SourceDiscovery import SourceDiscovery
         
+        manifest = RepositoryManifest.load(repo_path)
+        discovery = SourceDiscovery(repo_path)
+        source_files = discovery.discover(manifest.files if manifest is not None else None)
+        self.discovery_stats = discovery.stats
         return source_files
     
-    def _parse_files(self, source_files: List[str]) -> Dict[str, Dict[str, Any]]:
-        """Parse all source files and extract metadata"""
+    def _parse_files(self, source_files: List[str], repo_path: str = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None,
+                     blob_shas: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Parse all source files and extract metadata.
+        
+        With a blob store and a path -> blob SHA manifest, files whose
+        content was parsed before (in any project) reuse the cached result.
+        """
         parsed_files = {}
+        total = len(source_files)
         
-        for file_path in source_files:
+        for index, file_path in enumerate(source_files):
+            if progress_callback:
+                progress_callback(index, total)
+            
             try:
                 # Detect language
                 language = FileUtils.detect_language(file_path)
@@ -76,8 +88,21 @@ class GraphBuilder:
                 if not parser:
                     continue
                 
-                # Parse file
-                file_info = parser.parse_file(file_path)
+                # Parse file (paths are relative to the repository root)
+                full_path = os.path.join(repo_path, file_path) if repo_path else file_path
+                
+                blob_sha = None
+                if self.blob_store and blob_shas:
+                    blob_sha = blob_shas.get(file_path.replace(os.sep, '/'))
+                
+                file_info = self.blob_store.get_parse_result(blob_sha, language) if blob_sha else None
+                if file_info is not None:
+                    file_info.update(path=full_path, lastModified=os.path.getmtime(full_path))
+                else:
+                    file_info = parser.parse_file(full_path)
+                    if blob_sha and file_info and 'error' not in file_info:
+                        self.blob_store.put_parse_result(blob_sha, language, file_info)
+                
                 if file_info and 'error' not in file_info:
                     parsed_files[file_path] = file_info
                 
@@ -96,57 +121,124 @@ class GraphBuilder:
         
         # Create nodes
         for file_path, file_info in parsed_files.items():
-            node_id = self._generate_node_id(file_path)
-            file_map[file_path] = node_id
-            
-            node = {
-                'id': node_id,
-                'name': os.path.basename(file_path),
-                'path': file_path,
-                'language': file_info.get('language', 'unknown'),
-                'size': file_info.get('size', 0),
-                'lines': file_info.get('lines', 0),
-                'complexity': file_info.get('complexity', 'unknown'),
-                'functions': file_info.get('functions', []),
-                'classes': file_info.get('classes', []),
-                'lastModified': file_info.get('lastModified', 0)
-            }
-            
+            node = self._create_node(file_path, file_info)
+            file_map[file_path] = node['id']
             nodes.append(node)
         
         # Create edges from dependencies
         for file_path, file_info in parsed_files.items():
-            source_id = file_map[file_path]
-            dependencies = file_info.get('dependencies', [])
+            edges.extend(self._create_edges(file_path, file_info, file_map, repo_path))
+        
+        # Collect the project-wide symbol table
+        symbols = []
+        for file_path, file_info in parsed_files.items():
+            symbols.extend(self._extract_symbols(file_path, file_info, file_map[file_path]))
+        
+        return {'nodes': nodes, 'edges': edges, 'symbols': symbols}
+    
+    def _create_node(self, file_path: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a graph node for a parsed file"""
+        return {
+            'id': self._generate_node_id(file_path),
+            'name': os.path.basename(file_path),
+            'path': file_path,
+            'language': file_info.get('language', 'unknown'),
+            'size': file_info.get('size', 0),
+            'lines': file_info.get('lines', 0),
+            'complexity': file_info.get('complexity', 'unknown'),
+            'functions': file_info.get('functions', []),
+            'classes': file_info.get('classes', []),
+            'lastModified': file_info.get('lastModified', 0)
+        }
+    
+    def _extract_symbols(self, file_path: str, file_info: Dict[str, Any], node_id: str) -> List[Dict[str, Any]]:
+        """Flatten a parsed file's classes, interfaces and functions into symbol records"""
+        symbols = []
+        seen = set()
+        
+        def add(name: str, kind: str, line: int, container: Optional[str] = None):
+            if not name or (name, kind, line) in seen:
+                return
+            seen.add((name, kind, line))
+            symbols.append({
+                'name': name,
+                'kind': kind,
+                'path': file_path,
+                'nodeId': node_id,
+                'line': line or 0,
+                'container': container
+            })
+        
+        classes = file_info.get('classes', [])
+        for cls in classes:
+            add(cls.get('name'), 'class', cls.get('line'))
+        
+        for interface in file_info.get('interfaces', []):
+            add(interface.get('name'), 'interface', interface.get('line'))
+        
+        for function in file_info.get('functions', []):
+            name = function.get('name')
+            line = function.get('line') or 0
+            
+            # Parsers list methods as plain functions; attribute a function to
+            # the nearest preceding class that declares a method of that name
+            owner = None
+            for cls in classes:
+                if name in cls.get('methods', []) and (cls.get('line') or 0) <= line:
+                    if owner is None or (cls.get('line') or 0) > (owner.get('line') or 0):
+                        owner = cls
+            
+            if owner is not None:
+                add(name, 'method', line, owner.get('name'))
+            else:
+                add(name, 'function', line)
+        
+        return symbols
+    
+    def _create_edges(self, file_path: str, file_info: Dict[str, Any],
+                      file_map: Dict[str, str], repo_path: str) -> List[Dict[str, Any]]:
+        """Create outgoing dependency edges for a parsed file"""
+        edges = []
+        source_id = file_map[file_path]
+        dependencies = file_info.get('dependencies', [])
+        
+        for dep in dependencies:
+            target_path = self._resolve_dependency_path(dep, file_path, repo_path, file_map.keys())
             
-            for dep in dependencies:
-                target_path = self._resolve_dependency_path(dep, file_path, repo_path, file_map.keys())
+            if target_path and target_path in file_map:
+                target_id = file_map[target_path]
                 
-                if target_path and target_path in file_map:
-                    target_id = file_map[target_path]
+                # Avoid self-references
+                if source_id != target_id:
+                    edge = {
+                        'source': source_id,
+                        'target': target_id,
+                        'type': dep.get('type', 'unknown'),
+                        'line': dep.get('line', 0),
+                        'strength': 1.0
+                    }
                     
-                    # Avoid self-references
-                    if source_id != target_id:
-                        edge = {
-                            'source': source_id,
-                            'target': target_id,
-                            'type': dep.get('type', 'unknown'),
-                            'line': dep.get('line', 0),
-                            'strength': 1.0
-                        }
-                        
-                        edges.append(edge)
-        
-        return {'nodes': nodes, 'edges': edges}
+                    edges.append(edge)
+        
+        return edges
     
     def _resolve_dependency_path(self, dependency: Dict[str, Any], source_file: str, repo_path: str, available_files: Set[str]) -> str:
         """Resolve dependency to actual file path"""
+        # Find the first matching file
+        for candidate in self._dependency_candidates(dependency, source_file):
+            if candidate in available_files:
+                return candidate
+        
+        return None
+    
+    def _dependency_candidates(self, dependency: Dict[str, Any], source_file: str) -> List[str]:
+        """Normalized paths a dependency could refer to, in lookup order"""
         dep_name = dependency.get('name', '')
         dep_type = dependency.get('type', 'unknown')
         
         if dep_type == 'external':
             # External dependencies are not resolved to files
-            return None
+            return []
         
         # For relative and internal dependencies, try to find the actual file
         base_dir = os.path.dirname(source_file)
@@ -179,14 +271,7 @@ class GraphBuilder:
                 candidates.append(f"{candidate}/index{ext}")
                 candidates.append(f"{candidate}/__init__{ext}")
         
-        # Find the first matching file
-        for candidate in candidates:
-            # Normalize path
-            normalized = os.path.normpath(candidate)
-            if normalized in available_files:
-                return normalized
-        
-        return None
+        return [os.path.normpath(candidate) for candidate in candidates]
     
     def _generate_node_id(self, file_path: str) -> str:
         """Generate a unique node ID from file path"""
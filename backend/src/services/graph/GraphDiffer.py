@@ -0,0 +1,86 @@
+# backend/src/services/graph/GraphDiffer.py
+from typing import Dict, Any, List, Tuple, Optional
+
+class GraphDiffer:
+    """Computes compact deltas between two versions of a graph"""
+    
+    # Centrality changes smaller than this are not worth pushing
+    CENTRALITY_EPSILON = 1e-6
+    
+    def diff(self, old_graph: Dict[str, Any], new_graph: Dict[str, Any]) -> Dict[str, Any]:
+        """Diff nodes, edges and centrality scores between two graphs"""
+        old_nodes = {node.get('id'): node for node in (old_graph or {}).get('nodes', [])}
+        new_nodes = {node.get('id'): node for node in (new_graph or {}).get('nodes', [])}
+        
+        nodes_added = [new_nodes[node_id] for node_id in new_nodes if node_id not in old_nodes]
+        nodes_removed = [node_id for node_id in old_nodes if node_id not in new_nodes]
+        nodes_updated = []
+        
+        for node_id, new_node in new_nodes.items():
+            old_node = old_nodes.get(node_id)
+            if old_node is None or old_node == new_node:
+                continue
+            
+            changes = {key: value for key, value in new_node.items() if old_node.get(key) != value}
+            removed_attributes = [key for key in old_node if key not in new_node]
+            nodes_updated.append({
+                'id': node_id,
+                'changes': changes,
+                'removedAttributes': removed_attributes
+            })
+        
+        old_edges = {self.edge_key(edge): edge for edge in (old_graph or {}).get('edges', [])}
+        new_edges = {self.edge_key(edge): edge for edge in (new_graph or {}).get('edges', [])}
+        
+        delta = {
+            'nodesAdded': nodes_added,
+            'nodesRemoved': nodes_removed,
+            'nodesUpdated': nodes_updated,
+            'edgesAdded': [edge for key, edge in new_edges.items() if key not in old_edges],
+            'edgesRemoved': [self._edge_ref(edge) for key, edge in old_edges.items() if key not in new_edges]
+        }
+        
+        centrality = self.diff_centrality(
+            (old_graph or {}).get('centrality_scores', {}),
+            (new_graph or {}).get('centrality_scores', {})
+        )
+        if centrality:
+            delta['centrality'] = centrality
+        
+        return delta
+    
+    def diff_centrality(self, old_scores: Dict[str, Dict[str, float]],
+                        new_scores: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """Get the per-measure scores that changed"""
+        changed = {}
+        for measure, scores in (new_scores or {}).items():
+            old_measure = (old_scores or {}).get(measure, {})
+            updates = {
+                node_id: score for node_id, score in scores.items()
+                if node_id not in old_measure
+                or abs(old_measure[node_id] - score) > self.CENTRALITY_EPSILON
+            }
+            if updates:
+                changed[measure] = updates
+        return changed
+    
+    def is_empty(self, delta: Dict[str, Any]) -> bool:
+        """Check whether a delta carries no changes"""
+        return not any(delta.get(key) for key in (
+            'nodesAdded', 'nodesRemoved', 'nodesUpdated', 'edgesAdded', 'edgesRemoved', 'centrality'
+        ))
+    
+    @staticmethod
+    def edge_key(edge: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], str, int]:
+        """Identify an edge by its endpoints, import type and line"""
+        source = edge.get('source')
+        target = edge.get('target')
+        if isinstance(source, dict):
+            source = source.get('id')
+        if isinstance(target, dict):
+            target = target.get('id')
+        return (source, target, edge.get('type', 'unknown'), edge.get('line', 0))
+    
+    def _edge_ref(self, edge: Dict[str, Any]) -> Dict[str, Any]:
+        source, target, edge_type, line = self.edge_key(edge)
+        return {'source': source, 'target': target, 'type': edge_type, 'line': line}
@@ -0,0 +1,103 @@
+# backend/src/services/graph/GraphEventBroker.py
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from config import Config
+
+class GraphEventBroker:
+    """Per-project, sequence-numbered event log for live graph updates.
+    
+    Each project keeps a bounded ring buffer of recent events so clients can
+    resume from the last sequence number they saw. Clients that fall behind
+    the buffer (or reconnect after a restart) receive a ``reset`` event and
+    should re-fetch the full graph.
+    """
+    
+    def __init__(self, buffer_size: int = None):
+        self.buffer_size = buffer_size or Config.GRAPH_EVENT_BUFFER_SIZE
+        self._events: Dict[str, deque] = {}
+        self._sequences: Dict[str, int] = {}
+        self._condition = threading.Condition()
+    
+    def publish(self, project_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """Append an event for a project and wake waiting subscribers"""
+        with self._condition:
+            seq = self._sequences.get(project_id, 0) + 1
+            self._sequences[project_id] = seq
+            
+            events = self._events.setdefault(project_id, deque(maxlen=self.buffer_size))
+            events.append({
+                'seq': seq,
+                'type': event_type,
+                'timestamp': time.time(),
+                'data': data
+            })
+            
+            self._condition.notify_all()
+            return seq
+    
+    def publish_graph_delta(self, project_id: str, old_graph: Dict[str, Any],
+                            new_graph: Dict[str, Any], graph_version: Optional[int] = None) -> Optional[int]:
+        """Diff two graph versions and publish the delta if anything changed"""
+        from services.graph.GraphDiffer import GraphDiffer
+        differ = GraphDiffer()
+        
+        delta = differ.diff(old_graph, new_graph)
+        if differ.is_empty(delta):
+            return None
+        
+        delta['graphVersion'] = graph_version
+        return self.publish(project_id, 'graph_delta', delta)
+    
+    def forget(self, project_id: str):
+        """Drop a project's event log, e.g. when the project is deleted.
+        
+        Subscribers still waiting on it are woken and receive a reset.
+        """
+        with self._condition:
+            self._events.pop(project_id, None)
+            self._sequences.pop(project_id, None)
+            self._condition.notify_all()
+    
+    def get_last_sequence(self, project_id: str) -> int:
+        """Get the latest sequence number for a project"""
+        with self._condition:
+            return self._sequences.get(project_id, 0)
+    
+    def get_events_since(self, project_id: str, last_seq: int) -> List[Dict[str, Any]]:
+        """Get events after a sequence number, or a reset event if they are gone"""
+        with self._condition:
+            return self._events_since(project_id, last_seq)
+    
+    def wait_for_events(self, project_id: str, last_seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """Block until events newer than last_seq exist or the timeout expires"""
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._sequences.get(project_id, 0) != last_seq,
+                timeout=timeout
+            )
+            return self._events_since(project_id, last_seq)
+    
+    def _events_since(self, project_id: str, last_seq: int) -> List[Dict[str, Any]]:
+        current_seq = self._sequences.get(project_id, 0)
+        if last_seq == current_seq:
+            return []
+        
+        events = self._events.get(project_id, deque())
+        oldest_seq = events[0]['seq'] if events else current_seq + 1
+        
+        # Sequence from the future (server restart) or already evicted
+        if last_seq > current_seq or last_seq < oldest_seq - 1:
+            return [{
+                'seq': current_seq,
+                'type': 'reset',
+                'timestamp': time.time(),
+                'data': {'reason': 'sequence_unavailable'}
+            }]
+        
+        return [event for event in events if event['seq'] > last_seq]
+
+# Process-wide broker shared by publishers and the SSE endpoint
+graph_event_broker = GraphEventBroker()
@@ -0,0 +1,311 @@
+# backend/src/services/graph/IncrementalGraphUpdater.py
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+import networkx as nx
+
+from database.GraphDataManager import GraphDataManager
+from database.SymbolDataManager import SymbolDataManager
+from services.git.BlobStore import BlobStore
+from services.git.RepositoryManifest import RepositoryManifest
+from services.graph.GraphBuilder import GraphBuilder
+from services.graph.CentralityCalculator import CentralityCalculator
+from services.graph.GraphEventBroker import graph_event_broker
+from services.search.SearchIndexManager import search_index_manager
+
+# Serializes read-modify-write patches per project
+_project_locks: Dict[str, threading.Lock] = {}
+_project_locks_guard = threading.Lock()
+
+# Centrality refreshes run off the request path, one pending refresh per project
+_centrality_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='centrality')
+_centrality_pending = set()
+_centrality_guard = threading.Lock()
+
+# Importer indexes per project, used and replaced under the project lock
+_importer_indexes: Dict[str, 'ImporterIndex'] = {}
+
+def _project_lock(project_id: str) -> threading.Lock:
+    with _project_locks_guard:
+        return _project_locks.setdefault(project_id, threading.Lock())
+
+class ImporterIndex:
+    """Which files' imports look up which paths, for one set of stored nodes.
+    
+    Each file watches the candidate paths of its dependencies up to the one
+    that resolved (as ``HistoryAnalyzer._watch`` does), since a file added
+    or removed at any of them changes what the import resolves to.
+    ``nodes_hash`` is the stored graph's nodes hash the index was built for.
+    """
+    
+    def __init__(self, graph_builder: GraphBuilder, nodes_hash: Optional[str]):
+        self.graph_builder = graph_builder
+        self.nodes_hash = nodes_hash
+        self.dependencies: Dict[str, List[Dict[str, Any]]] = {}
+        self.watchers: Dict[str, Set[str]] = {}
+        self.watched: Dict[str, Set[str]] = {}
+    
+    def importers(self, paths: Iterable[str]) -> Set[str]:
+        """Files whose imports may resolve differently once ``paths`` appear or disappear"""
+        importers = set()
+        for path in paths:
+            importers |= self.watchers.get(path, set())
+        return importers
+    
+    def watch(self, source: str, dependencies: List[Dict[str, Any]], file_map: Dict[str, str]):
+        self.unwatch(source)
+        self.dependencies[source] = dependencies
+        
+        # Candidates up to the resolved one; a later candidate cannot win
+        watched = set()
+        for dependency in dependencies:
+            for candidate in self.graph_builder._dependency_candidates(dependency, source):
+                watched.add(candidate)
+                if candidate in file_map:
+                    break
+        
+        for candidate in watched:
+            self.watchers.setdefault(candidate, set()).add(source)
+        self.watched[source] = watched
+    
+    def unwatch(self, source: str):
+        self.dependencies.pop(source, None)
+        for candidate in self.watched.pop(source, ()):
+            watchers = self.watchers.get(candidate)
+            if watchers is not None:
+                watchers.discard(source)
+                if not watchers:
+                    del self.watchers[candidate]
+
+class IncrementalGraphUpdater:
+    """Patches a stored graph for changed files without rebuilding the repository"""
+    
+    # Node attributes owned by personalization or history mining rather than parsing
+    PRESERVED_ATTRIBUTES = ('temperature', 'importance_score', 'user_interactions', 'personalized',
+                            'commitCount', 'linesAdded', 'linesDeleted', 'authorCount', 'lastCommitted', 'hotspot')
+    
+    def __init__(self, db_manager=None):
+        self.graph_data_manager = GraphDataManager(db_manager)
+        self.symbol_data_manager = SymbolDataManager(self.graph_data_manager.db)
+        self.graph_builder = GraphBuilder(blob_store=BlobStore())
+        self.logger = logging.getLogger(__name__)
+    
+    def update_files(self, project_id: str, repo_path: str,
+                     changed_paths: Iterable[str] = (), deleted_paths: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """Reparse changed files, drop deleted ones and apply the delta to the stored graph.
+        
+        Paths are relative to the repository root. Outgoing edges are
+        recomputed for the changed files and for files whose imports may
+        resolve to a file that was added or removed (see ``ImporterIndex``).
+        New nodes get the project's version processing. Returns a summary of
+        the applied delta, or None if the project has no stored graph.
+        """
+        with _project_lock(project_id):
+            stored_graph = self.graph_data_manager.get_graph(project_id)
+            if stored_graph is None:
+                return None
+            
+            # Cached graphs are shared; patch copies of the lists
+            nodes = list(stored_graph.get('nodes', []))
+            edges = list(stored_graph.get('edges', []))
+            nodes_by_path = {node.get('path'): index for index, node in enumerate(nodes)}
+            previous_hash = self.graph_data_manager.get_nodes_hash(project_id)
+            importer_index = self._importer_index(project_id, repo_path, nodes, previous_hash)
+            # Patched in place below; only valid again once the graph is saved
+            importer_index.nodes_hash = None
+            
+            changed_paths = [os.path.normpath(path) for path in changed_paths]
+            deleted_paths = [os.path.normpath(path) for path in deleted_paths]
+            
+            # Parse first so the file map includes newly added files
+            parsed_files = self.graph_builder._parse_files(changed_paths, repo_path)
+            removed_paths = set(deleted_paths) | {
+                path for path in changed_paths
+                if path not in parsed_files and not os.path.exists(os.path.join(repo_path, path))
+            }
+            
+            removed_ids = set()
+            for path in removed_paths:
+                if path in nodes_by_path:
+                    removed_ids.add(nodes[nodes_by_path[path]]['id'])
+            added_paths = set(parsed_files) - set(nodes_by_path)
+            
+            new_nodes = []
+            for file_path, file_info in parsed_files.items():
+                node = self.graph_builder._create_node(file_path, file_info)
+                if file_path in nodes_by_path:
+                    old_node = nodes[nodes_by_path[file_path]]
+                    for key in self.PRESERVED_ATTRIBUTES:
+                        if key in old_node:
+                            node[key] = old_node[key]
+                    nodes[nodes_by_path[file_path]] = node
+                else:
+                    nodes_by_path[file_path] = len(nodes)
+                    nodes.append(node)
+                    new_nodes.append(node)
+            self._apply_version_processing(project_id, new_nodes)
+            
+            nodes = [node for node in nodes if node['id'] not in removed_ids]
+            file_map = {node['path']: node['id'] for node in nodes}
+            
+            # Reparsed files, plus importers of files that appeared or
+            # disappeared; the rest keep the dependencies indexed for them
+            for path in removed_paths:
+                importer_index.unwatch(path)
+            relinked = {}
+            for path in importer_index.importers(added_paths | removed_paths) - removed_paths:
+                if path in file_map and path in importer_index.dependencies:
+                    relinked[path] = importer_index.dependencies[path]
+            for file_path, file_info in parsed_files.items():
+                relinked[file_path] = file_info.get('dependencies', [])
+            
+            # Replace outgoing import edges of relinked files and edges touching
+            # removed files; co-change edges come from history, not parsing
+            reparsed_ids = {file_map[path] for path in parsed_files}
+            relinked_ids = {file_map[path] for path in relinked}
+            edges = [
+                edge for edge in edges
+                if self._endpoint(edge, 'source') not in removed_ids
+                and self._endpoint(edge, 'target') not in removed_ids
+                and (edge.get('type') == 'co-change' or self._endpoint(edge, 'source') not in relinked_ids)
+            ]
+            for file_path, dependencies in relinked.items():
+                edges.extend(self.graph_builder._create_edges(
+                    file_path, {'dependencies': dependencies}, file_map, repo_path
+                ))
+                importer_index.watch(file_path, dependencies, file_map)
+            
+            new_graph = {
+                'nodes': nodes,
+                'edges': edges,
+                'metrics': self._update_metrics(stored_graph.get('metrics', {}), nodes, edges)
+            }
+            
+            symbols = []
+            for file_path, file_info in parsed_files.items():
+                symbols.extend(self.graph_builder._extract_symbols(file_path, file_info, file_map[file_path]))
+            self.symbol_data_manager.replace_symbols(
+                project_id, symbols, paths=set(parsed_files) | removed_paths
+            )
+            
+            self.graph_data_manager.update_graph(project_id, new_graph)
+            graph_version = self.graph_data_manager.get_graph_version(project_id)
+            importer_index.nodes_hash = self.graph_data_manager.get_nodes_hash(project_id)
+            
+            search_index_manager.apply_changes(
+                self.graph_data_manager,
+                project_id,
+                previous_hash,
+                upserted_nodes=[node for node in nodes if node['id'] in reparsed_ids],
+                removed_ids=removed_ids
+            )
+            
+            graph_event_broker.publish_graph_delta(
+                project_id,
+                stored_graph,
+                {**new_graph, 'centrality_scores': stored_graph.get('centrality_scores', {})},
+                graph_version
+            )
+        
+        self.schedule_centrality_refresh(project_id)
+        
+        return {
+            'graphVersion': graph_version,
+            'reparsedFiles': len(parsed_files),
+            'relinkedFiles': len(relinked),
+            'removedFiles': len(removed_ids),
+            'nodeCount': len(nodes),
+            'edgeCount': len(edges)
+        }
+    
+    def _importer_index(self, project_id: str, repo_path: str, nodes: List[Dict[str, Any]],
+                        nodes_hash: Optional[str]) -> ImporterIndex:
+        """The project's importer index, rebuilt if the stored nodes changed since.
+        
+        Called with the project lock held. Rebuilding reads the parse cache
+        for every file whose manifest hash it knows, so it rarely parses.
+        """
+        importer_index = _importer_indexes.get(project_id)
+        if importer_index is not None and importer_index.nodes_hash == nodes_hash:
+            return importer_index
+        
+        importer_index = _importer_indexes[project_id] = ImporterIndex(self.graph_builder, nodes_hash)
+        manifest = RepositoryManifest.load(repo_path)
+        blob_shas = {path: entry['hash'] for path, entry in manifest.files.items()} if manifest else None
+        parsed_files = self.graph_builder._parse_files(
+            [node['path'] for node in nodes], repo_path, blob_shas=blob_shas
+        )
+        file_map = {node['path']: node['id'] for node in nodes}
+        for file_path, file_info in parsed_files.items():
+            importer_index.watch(file_path, file_info.get('dependencies', []), file_map)
+        return importer_index
+    
+    def _apply_version_processing(self, project_id: str, new_nodes: List[Dict[str, Any]]):
+        """Give new nodes the attributes version processing gave the rest"""
+        if not new_nodes:
+            return
+        
+        try:
+            from services.personalization.PersonalizationFactory import PersonalizationFactory
+            metadata = self.graph_data_manager.get_project_metadata(project_id) or {}
+            processor = PersonalizationFactory().create_graph_processor(metadata.get('version', 'personalized'))
+            processor.process_graph({'nodes': new_nodes, 'edges': []})
+        except Exception as e:
+            self.logger.error(f"Graph processing failed for new nodes of {project_id}: {e}")
+    
+    def schedule_centrality_refresh(self, project_id: str):
+        """Queue a background centrality refresh unless one is already pending"""
+        with _centrality_guard:
+            if project_id in _centrality_pending:
+                return
+            _centrality_pending.add(project_id)
+        
+        _centrality_executor.submit(self._refresh_centrality, project_id)
+    
+    def _refresh_centrality(self, project_id: str):
+        """Recompute centrality for the latest stored graph and push the changes"""
+        with _centrality_guard:
+            _centrality_pending.discard(project_id)
+        
+        try:
+            with _project_lock(project_id):
+                graph_data = self.graph_data_manager.get_graph(project_id)
+                if graph_data is None:
+                    return
+                
+                previous = graph_data.get('centrality_scores', {})
+                centrality_scores = CentralityCalculator().refresh_centralities(graph_data, previous)
+                self.graph_data_manager.save_centrality_scores(project_id, centrality_scores)
+                
+                graph_event_broker.publish_graph_delta(
+                    project_id,
+                    graph_data,
+                    {**graph_data, 'centrality_scores': centrality_scores},
+                    self.graph_data_manager.get_graph_version(project_id)
+                )
+        except Exception as e:
+            self.logger.error(f"Centrality refresh failed for {project_id}: {e}")
+    
+    def _update_metrics(self, metrics: Dict[str, Any], nodes: List[Dict[str, Any]],
+                        edges: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Refresh the cheap structural metrics; centrality tops are left to the refresh"""
+        edges = [edge for edge in edges if edge.get('type') != 'co-change']
+        G = nx.DiGraph()
+        G.add_nodes_from(node['id'] for node in nodes)
+        G.add_edges_from((self._endpoint(edge, 'source'), self._endpoint(edge, 'target')) for edge in edges)
+        
+        return {
+            **metrics,
+            'node_count': len(nodes),
+            'edge_count': len(edges),
+            'density': nx.density(G) if len(nodes) > 1 else 0,
+            'is_connected': nx.is_weakly_connected(G) if len(nodes) > 0 else False,
+            'average_degree': sum(dict(G.degree()).values()) / len(nodes) if len(nodes) > 0 else 0
+        }
+    
+    def _endpoint(self, edge: Dict[str, Any], key: str) -> str:
+        endpoint = edge.get(key)
+        return endpoint.get('id') if isinstance(endpoint, dict) else endpoint
@@ -0,0 +1,248 @@
+# backend/src/services/graph/SourceDiscovery.py
+import os
+import re
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from config import Config
+from utils.FileUtils import FileUtils
+
+class GitIgnoreSpec:
+    """Compiled patterns of one ``.gitignore`` (or ``info/exclude``) file.
+    
+    Patterns are matched against paths relative to the directory holding
+    the file, with ``/`` separators. ``match`` returns True (ignored),
+    False (re-included by a ``!`` pattern) or None (no pattern applies).
+    """
+    
+    def __init__(self, lines: Iterable[str]):
+        self.patterns: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            translated = self._translate(line)
+            if translated:
+                self.patterns.append(translated)
+        
+        # Without negations any match decides, so one alternation per entry
+        # type answers in a single regex call
+        self._has_negation = any(negate for _, negate, _ in self.patterns)
+        if not self._has_negation:
+            self._any = self._combine(self.patterns)
+            self._files_only = self._combine([p for p in self.patterns if not p[2]])
+    
+    @classmethod
+    def from_file(cls, path: str) -> Optional['GitIgnoreSpec']:
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                spec = cls(f.read().splitlines())
+        except OSError:
+            return None
+        return spec if spec.patterns else None
+    
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        if not self._has_negation:
+            regex = self._any if is_dir else self._files_only
+            return True if regex is not None and regex.match(rel_path) else None
+        
+        for regex, negate, dir_only in reversed(self.patterns):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+        return None
+    
+    @staticmethod
+    def _combine(patterns) -> Optional[re.Pattern]:
+        if not patterns:
+            return None
+        return re.compile('|'.join(f'(?:{regex.pattern})' for regex, _, _ in patterns))
+    
+    @classmethod
+    def _translate(cls, line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+        if not line or line.startswith('#'):
+            return None
+        
+        # Trailing spaces are dropped unless escaped
+        line = re.sub(r'(?<!\\) +$', '', line)
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith(('\\!', '\\#')):
+            line = line[1:]
+        
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+        
+        # A slash anywhere but the end anchors the pattern to this directory
+        anchored = '/' in line
+        line = line.lstrip('/')
+        
+        regex = ''
+        i = 0
+        if line.startswith('**/'):
+            regex, i = '(?:.*/)?', 3
+        while i < len(line):
+            char = line[i]
+            if line.startswith('/**/', i):
+                regex += '/(?:.*/)?'
+                i += 4
+            elif line.startswith('/**', i) and i + 3 == len(line):
+                regex += '/.*'
+                i += 3
+            elif line.startswith('**', i):
+                regex += '.*'
+                i += 2
+            elif char == '*':
+                regex += '[^/]*'
+                i += 1
+            elif char == '?':
+                regex += '[^/]'
+                i += 1
+            elif char == '[':
+                end = line.find(']', i + 2 if line[i + 1:i + 2] in ('!', '^') else i + 1)
+                if end < 0:
+                    regex += re.escape(char)
+                    i += 1
+                    continue
+                body = line[i + 1:end]
+                if body[:1] in ('!', '^'):
+                    body = '^' + body[1:]
+                regex += '[' + body.replace('\\', '\\\\') + ']'
+                i = end + 1
+            elif char == '\\' and i + 1 < len(line):
+                regex += re.escape(line[i + 1])
+                i += 2
+            else:
+                regex += re.escape(char)
+                i += 1
+        
+        prefix = '' if anchored else '(?:.*/)?'
+        return re.compile(f'{prefix}{regex}$'), negate, dir_only
+
+# (directory relative to the repository root, spec), deepest last
+IgnoreChain = Tuple[Tuple[str, GitIgnoreSpec], ...]
+
+class SourceDiscovery:
+    """Finds the source files of a checkout, honoring its ignore files.
+    
+    Nested ``.gitignore`` files and ``.git/info/exclude`` apply as in git:
+    deeper files take precedence, later patterns win within a file, and a
+    directory that is ignored is pruned as a whole, since nothing below it
+    can be re-included. Dot-directories and ``Config.IGNORED_DIRECTORIES``
+    are always skipped. After ``discover``, ``stats`` holds how many files
+    were discovered and how many files and directories were ignored.
+    """
+    
+    def __init__(self, repo_path: str):
+        self.repo_path = repo_path
+        self.stats: Dict[str, Any] = {}
+        
+        root_chain = ()
+        exclude = GitIgnoreSpec.from_file(os.path.join(repo_path, '.git', 'info', 'exclude'))
+        if exclude is not None:
+            root_chain = (('', exclude),)
+        self._root_chain: IgnoreChain = root_chain
+    
+    def discover(self, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """Relative paths of source files to analyze.
+        
+        Scans the checkout with ``os.scandir``, or, given ``paths`` (e.g.
+        from a repository manifest), filters those instead; then only one
+        ``.gitignore`` lookup per directory touches the disk.
+        """
+        self.stats = {'discovered': 0, 'ignoredFiles': 0, 'ignoredDirectories': 0, 'ignoreFiles': 0}
+        source_files = self._scan() if paths is None else self._filter(paths)
+        self.stats['discovered'] = len(source_files)
+        return source_files
+    
+    def _scan(self) -> List[str]:
+        source_files = []
+        stack = [('', self._root_chain)]
+        
+        while stack:
+            rel_dir, chain = stack.pop()
+            try:
+                with os.scandir(os.path.join(self.repo_path, rel_dir)) as iterator:
+                    entries = list(iterator)
+            except OSError:
+                continue
+            
+            if any(entry.name == '.gitignore' for entry in entries):
+                chain = self._extend(chain, rel_dir)
+            
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                
+                if is_dir:
+                    if self._skip_directory(entry.name) or self._ignored(chain, rel_path, True):
+                        self.stats['ignoredDirectories'] += 1
+                    else:
+                        stack.append((rel_path, chain))
+                elif FileUtils.is_allowed_file(entry.name):
+                    if self._ignored(chain, rel_path, False):
+                        self.stats['ignoredFiles'] += 1
+                    else:
+                        source_files.append(rel_path.replace('/', os.sep))
+        
+        return source_files
+    
+    def _filter(self, paths: Iterable[str]) -> List[str]:
+        # Directory -> (ignored, chain), resolved once per directory
+        directories: Dict[str, Tuple[bool, IgnoreChain]] = {}
+        
+        def resolve(rel_dir: str) -> Tuple[bool, IgnoreChain]:
+            state = directories.get(rel_dir)
+            if state is not None:
+                return state
+            
+            if not rel_dir:
+                ignored, chain = False, self._root_chain
+            else:
+                parent, _, name = rel_dir.rpartition('/')
+                ignored, chain = resolve(parent)
+                if not ignored and (self._skip_directory(name) or self._ignored(chain, rel_dir, True)):
+                    ignored = True
+                    self.stats['ignoredDirectories'] += 1
+            
+            if not ignored and os.path.isfile(os.path.join(self.repo_path, rel_dir, '.gitignore')):
+                chain = self._extend(chain, rel_dir)
+            
+            directories[rel_dir] = (ignored, chain)
+            return ignored, chain
+        
+        source_files = []
+        for path in paths:
+            rel_path = path.replace(os.sep, '/')
+            if not FileUtils.is_allowed_file(rel_path):
+                continue
+            
+            ignored, chain = resolve(rel_path.rpartition('/')[0])
+            if ignored:
+                continue
+            if self._ignored(chain, rel_path, False):
+                self.stats['ignoredFiles'] += 1
+            else:
+                source_files.append(path)
+        
+        return source_files
+    
+    def _extend(self, chain: IgnoreChain, rel_dir: str) -> IgnoreChain:
+        spec = GitIgnoreSpec.from_file(os.path.join(self.repo_path, rel_dir, '.gitignore'))
+        if spec is None:
+            return chain
+        self.stats['ignoreFiles'] += 1
+        return chain + ((rel_dir, spec),)
+    
+    def _skip_directory(self, name: str) -> bool:
+        return name.startswith('.') or name in Config.IGNORED_DIRECTORIES
+    
+    def _ignored(self, chain: IgnoreChain, rel_path: str, is_dir: bool) -> bool:
+        for base, spec in reversed(chain):
+            result = spec.match(rel_path[len(base) + 1:] if base else rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
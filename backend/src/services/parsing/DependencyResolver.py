@@ -36,32 +36,24 @@ class DependencyResolver:
         dependents = []
         
         try:
-            # Walk through all files in repository
-            for root, dirs, files in os.walk(repo_path):
-                # Skip hidden directories and common ignore patterns
-                dirs[:] = [d for d in dirs if not d.startswith('.') and 
-                          d not in ['node_modules', '__pycache__', 'venv']]
+            for file_path in self._candidate_files(repo_path):
+                # Skip the target file itself
+                if file_path == target_file:
+                    continue
                 
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    
-                    # Skip the target file itself
-                    if file_path == target_file:
-                        continue
-                    
-                    # Get dependencies of this file
-                    deps = self.resolve_file_dependencies(file_path)
-                    
-                    # Check if target file is in dependencies
-                    for dep in deps:
-                        if self._is_dependency_match(dep, target_file, file_path, repo_path):
-                            dependents.append({
-                                'path': os.path.relpath(file_path, repo_path),
-                                'name': os.path.basename(file_path),
-                                'line': dep.get('line', 0),
-                                'type': dep.get('type', 'unknown')
-                            })
-                            break
+                # Get dependencies of this file
+                deps = self.resolve_file_dependencies(file_path)
+                
+                # Check if target file is in dependencies
+                for dep in deps:
+                    if self._is_dependency_match(dep, target_file, file_path, repo_path):
+                        dependents.append({
+                            'path': os.path.relpath(file_path, repo_path),
+                            'name': os.path.basename(file_path),
+                            'line': dep.get('line', 0),
+                            'type': dep.get('type', 'unknown')
+                        })
+                        break
             
             return dependents
             
@@ -69,6 +61,15 @@ class DependencyResolver:
             print(f"Error finding reverse dependencies: {e}")
             return []
     
+    def _candidate_files(self, repo_path: str) -> List[str]:
+        """Absolute paths of files that may depend on others"""
+        from services.git.RepositoryManifest import RepositoryManifest
+        from services.graph.SourceDiscovery import SourceDiscovery
+        
+        manifest = RepositoryManifest.load(repo_path)
+        paths = SourceDiscovery(repo_path).discover(manifest.files if manifest is not None else None)
+        return [os.path.join(repo_path, path) for path in paths]
+    
     def _is_dependency_match(self, dependency: Dict[str, Any], target_file: str, 
                            source_file: str, repo_path: str) -> bool:
         """Check if a dependency matches the target file"""
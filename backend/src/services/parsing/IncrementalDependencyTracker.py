@@ -0,0 +1,144 @@
+# backend/src/services/parsing/IncrementalDependencyTracker.py
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import Config
+from .ParserFactory import ParserFactory
+
+class EditorBuffer:
+    """An open editor buffer whose imports are re-scanned only where it is edited.
+    
+    Imports are tracked per line, so an edit costs a scan of the lines it
+    touches rather than a parse of the whole file.
+    """
+    
+    def __init__(self, content: str, parser, version_id: Optional[int] = None):
+        self.parser = parser
+        self.version_id = version_id
+        self.lock = threading.Lock()
+        self.last_used = time.time()
+        
+        self.lines = content.split('\n')
+        self.line_imports = [self._scan_line(line) for line in self.lines]
+        self.import_counts = Counter(key for imports in self.line_imports for key, _ in imports)
+    
+    def apply_edits(self, edits: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Apply Monaco-style edits in order and return (added, removed) imports.
+        
+        Each edit is ``{'range': {startLineNumber, startColumn, endLineNumber,
+        endColumn}, 'text': str}`` with 1-based positions.
+        """
+        before = Counter(self.import_counts)
+        details = {}
+        
+        for edit in edits:
+            for key, dependency in self._apply_edit(edit['range'], edit.get('text', '')):
+                details[key] = dependency
+        
+        added = [details[key] for key in self.import_counts if before[key] == 0 and key in details]
+        removed = [
+            {'name': name, 'type': dep_type}
+            for (name, dep_type) in before if self.import_counts[(name, dep_type)] == 0
+        ]
+        return added, removed
+    
+    def get_dependencies(self) -> List[Dict[str, Any]]:
+        """Get all imports currently in the buffer with their line numbers"""
+        dependencies = []
+        for line_number, imports in enumerate(self.line_imports, 1):
+            for _, dependency in imports:
+                dependencies.append({**dependency, 'line': line_number})
+        return dependencies
+    
+    def _apply_edit(self, edit_range: Dict[str, int], text: str) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+        start_line = max(1, min(edit_range['startLineNumber'], len(self.lines)))
+        end_line = max(start_line, min(edit_range['endLineNumber'], len(self.lines)))
+        start_column = edit_range['startColumn']
+        end_column = edit_range['endColumn']
+        
+        prefix = self.lines[start_line - 1][:start_column - 1]
+        suffix = self.lines[end_line - 1][end_column - 1:]
+        new_lines = (prefix + text + suffix).split('\n')
+        
+        # Drop imports of the replaced lines, then scan only the new lines
+        for imports in self.line_imports[start_line - 1:end_line]:
+            for key, _ in imports:
+                self.import_counts[key] -= 1
+                if self.import_counts[key] <= 0:
+                    del self.import_counts[key]
+        
+        new_imports = [self._scan_line(line) for line in new_lines]
+        for imports in new_imports:
+            for key, _ in imports:
+                self.import_counts[key] += 1
+        
+        self.lines[start_line - 1:end_line] = new_lines
+        self.line_imports[start_line - 1:end_line] = new_imports
+        
+        return [item for imports in new_imports for item in imports]
+    
+    def _scan_line(self, line: str) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+        # Cheap reject: every supported import form contains one of these words
+        if 'import' not in line and 'require' not in line:
+            return []
+        
+        imports = []
+        for dependency in self.parser.extract_line_dependencies(line):
+            key = (dependency.get('name', ''), dependency.get('type', 'unknown'))
+            imports.append((key, {k: v for k, v in dependency.items() if k != 'line'}))
+        return imports
+
+class IncrementalDependencyTracker:
+    """Keeps open editor buffers per session and reports import changes per edit"""
+    
+    def __init__(self, max_sessions: int = None, session_ttl: int = None):
+        self.max_sessions = max_sessions or Config.EDITOR_SESSION_LIMIT
+        self.session_ttl = session_ttl or Config.EDITOR_SESSION_TTL
+        self.parser_factory = ParserFactory()
+        self._buffers: "OrderedDict[Tuple[str, str, str], EditorBuffer]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def open_buffer(self, session_id: str, project_id: str, file_path: str,
+                    content: str, version_id: Optional[int] = None) -> Optional[EditorBuffer]:
+        """Open (or resynchronize) a buffer with the full editor content"""
+        from utils.FileUtils import FileUtils
+        language = FileUtils.detect_language(file_path)
+        parser = self.parser_factory.create_parser(language) if language else None
+        if not parser:
+            return None
+        
+        buffer = EditorBuffer(content, parser, version_id)
+        with self._lock:
+            key = (session_id, project_id, file_path)
+            self._buffers[key] = buffer
+            self._buffers.move_to_end(key)
+            self._evict()
+        return buffer
+    
+    def get_buffer(self, session_id: str, project_id: str, file_path: str) -> Optional[EditorBuffer]:
+        """Get an open buffer, refreshing its idle timer"""
+        with self._lock:
+            key = (session_id, project_id, file_path)
+            buffer = self._buffers.get(key)
+            if buffer:
+                buffer.last_used = time.time()
+                self._buffers.move_to_end(key)
+            return buffer
+    
+    def close_buffer(self, session_id: str, project_id: str, file_path: str) -> bool:
+        """Close an open buffer"""
+        with self._lock:
+            return self._buffers.pop((session_id, project_id, file_path), None) is not None
+    
+    def _evict(self):
+        """Drop idle buffers and the least recently used beyond the limit"""
+        cutoff = time.time() - self.session_ttl
+        for key in [key for key, buffer in self._buffers.items() if buffer.last_used < cutoff]:
+            del self._buffers[key]
+        while len(self._buffers) > self.max_sessions:
+            self._buffers.popitem(last=False)
+
+# Process-wide tracker shared by the file routes
+dependency_tracker = IncrementalDependencyTracker()
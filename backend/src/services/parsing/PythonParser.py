@@ -93,6 +93,10 @@ class PythonParser(BaseParser):
         
         return dependencies
     
+    def extract_line_dependencies(self, line: str) -> List[Dict[str, Any]]:
+        """Extract imports from a single line without building an AST"""
+        return self._extract_dependencies_regex(line)
+    
     def _extract_functions(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """Extract function definitions"""
         functions = []
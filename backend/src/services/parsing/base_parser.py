@@ -13,4 +13,8 @@ class BaseParser(ABC):
     @abstractmethod
     def extract_dependencies(self, content: str) -> List[Dict[str, Any]]:
         """Extract dependencies from file content"""
-        pass
\ No newline at end of file
+        pass
+    
+    def extract_line_dependencies(self, line: str) -> List[Dict[str, Any]]:
+        """Extract dependencies declared on a single source line"""
+        return self.extract_dependencies(line)
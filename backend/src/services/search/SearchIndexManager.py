@@ -0,0 +1,88 @@
+# backend/src/services/search/SearchIndexManager.py
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from config import Config
+from utils.CacheUtils import MemoryLRUCache
+from services.search.TrigramSearchIndex import TrigramSearchIndex
+
+class SearchIndexManager:
+    """Per-project trigram indexes, cached in memory and keyed by node content.
+    
+    Entries are tagged with the ``nodes_hash`` of the stored graph rather than
+    its version, so centrality-only saves (which bump the version but leave
+    names and paths alone) keep the index warm.
+    """
+    
+    def __init__(self, max_projects: int = None, max_bytes: int = None):
+        self.cache = MemoryLRUCache(
+            max_entries=max_projects or Config.SEARCH_INDEX_MAX_PROJECTS,
+            max_bytes=max_bytes or Config.SEARCH_INDEX_MAX_BYTES
+        )
+    
+    def index_graph(self, graph_data_manager, project_id: str,
+                    nodes: List[Dict[str, Any]]) -> TrigramSearchIndex:
+        """Build and cache the index for freshly saved nodes"""
+        nodes_hash = graph_data_manager.get_nodes_hash(project_id)
+        index = TrigramSearchIndex(nodes)
+        self.cache.set(self._key(graph_data_manager, project_id), (nodes_hash, index), index.estimate_size())
+        return index
+    
+    def apply_changes(self, graph_data_manager, project_id: str, previous_hash: Optional[str],
+                      upserted_nodes: Iterable[Dict[str, Any]] = (), removed_ids: Iterable[str] = ()):
+        """Patch a cached index after an incremental graph update.
+        
+        The patch only applies if the cached index matches ``previous_hash``;
+        otherwise the entry is dropped and rebuilt lazily on the next search.
+        """
+        key = self._key(graph_data_manager, project_id)
+        entry = self.cache.get(key)
+        if entry is None:
+            return
+        
+        cached_hash, index = entry
+        if cached_hash != previous_hash:
+            self.invalidate(graph_data_manager, project_id)
+            return
+        
+        index.apply_changes(upserted_nodes, removed_ids)
+        nodes_hash = graph_data_manager.get_nodes_hash(project_id)
+        self.cache.set(key, (nodes_hash, index), index.estimate_size())
+    
+    def get_index(self, graph_data_manager, project_id: str) -> Optional[TrigramSearchIndex]:
+        """Get the index for the stored graph, building it on a miss"""
+        nodes_hash = graph_data_manager.get_nodes_hash(project_id)
+        key = self._key(graph_data_manager, project_id)
+        
+        entry = self.cache.get(key)
+        if entry is not None and nodes_hash is not None and entry[0] == nodes_hash:
+            return entry[1]
+        
+        graph_data = graph_data_manager.get_graph(project_id)
+        if graph_data is None:
+            self.invalidate(graph_data_manager, project_id)
+            return None
+        
+        # Tag with the hash read before loading: if a save lands in between,
+        # the tag is stale and the next lookup rebuilds rather than serving
+        # an index that claims to be newer than it is
+        index = TrigramSearchIndex(graph_data.get('nodes', []))
+        self.cache.set(key, (nodes_hash, index), index.estimate_size())
+        return index
+    
+    def search(self, graph_data_manager, project_id: str, query: str,
+               limit: int = 20) -> List[Tuple[Dict[str, Any], float]]:
+        """Top ``limit`` (node, score) matches for a query"""
+        index = self.get_index(graph_data_manager, project_id)
+        if index is None:
+            return []
+        return index.search(query, limit)
+    
+    def invalidate(self, graph_data_manager, project_id: str):
+        """Drop the cached index for a project"""
+        key = self._key(graph_data_manager, project_id)
+        self.cache.invalidate(lambda cache_key: cache_key == key)
+    
+    def _key(self, graph_data_manager, project_id: str) -> Tuple[str, str]:
+        return (graph_data_manager.db.db_path, project_id)
+
+search_index_manager = SearchIndexManager()
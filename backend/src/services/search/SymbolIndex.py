@@ -0,0 +1,83 @@
+# backend/src/services/search/SymbolIndex.py
+from typing import Dict, Any, List, Optional
+
+from config import Config
+from utils.CacheUtils import MemoryLRUCache
+from database.SymbolDataManager import SymbolDataManager
+from services.search.TrigramSearchIndex import TrigramSearchIndex
+
+class SymbolIndex:
+    """Prefix and fuzzy lookup over a project's persisted symbol table.
+    
+    Prefix lookups go straight to the indexed ``symbols`` table. Fuzzy
+    lookups use a name-only trigram index loaded from that table and cached
+    in memory, tagged with the graph's ``nodes_hash`` since symbols are only
+    rewritten alongside nodes.
+    """
+    
+    MODES = ('auto', 'prefix', 'fuzzy')
+    
+    def __init__(self, max_projects: int = None, max_bytes: int = None):
+        self.cache = MemoryLRUCache(
+            max_entries=max_projects or Config.SEARCH_INDEX_MAX_PROJECTS,
+            max_bytes=max_bytes or Config.SEARCH_INDEX_MAX_BYTES
+        )
+    
+    def search(self, graph_data_manager, project_id: str, query: str, kind: Optional[str] = None,
+               mode: str = 'auto', limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Find symbols by name, best first. Returns None if the project has no graph.
+        
+        ``auto`` returns prefix matches first and fills the remaining slots
+        with fuzzy matches.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of: {', '.join(self.MODES)}")
+        if kind and kind not in SymbolDataManager.KINDS:
+            raise ValueError(f"kind must be one of: {', '.join(SymbolDataManager.KINDS)}")
+        
+        nodes_hash = graph_data_manager.get_nodes_hash(project_id)
+        if nodes_hash is None:
+            return None
+        
+        symbol_data_manager = SymbolDataManager(graph_data_manager.db)
+        results = []
+        seen = set()
+        
+        if mode in ('auto', 'prefix'):
+            for symbol in symbol_data_manager.find_by_prefix(project_id, query, kind, limit):
+                exact = symbol['name'].lower() == query.lower()
+                results.append({**symbol, 'score': 1.0 if exact else 0.9})
+                seen.add(symbol['id'])
+        
+        if mode in ('auto', 'fuzzy') and len(results) < limit:
+            index = self._get_index(graph_data_manager, symbol_data_manager, project_id, nodes_hash)
+            
+            # Over-fetch when filtering by kind so the filter does not starve the page
+            fetch = limit * 4 if kind else limit
+            for symbol, score in index.search(query, fetch + len(seen)):
+                if symbol['id'] in seen or (kind and symbol['kind'] != kind):
+                    continue
+                results.append({**symbol, 'score': score})
+                seen.add(symbol['id'])
+                if len(results) >= limit:
+                    break
+        
+        return results[:limit]
+    
+    def _get_index(self, graph_data_manager, symbol_data_manager: SymbolDataManager,
+                   project_id: str, nodes_hash: str) -> TrigramSearchIndex:
+        key = (graph_data_manager.db.db_path, project_id)
+        entry = self.cache.get(key)
+        if entry is not None and entry[0] == nodes_hash:
+            return entry[1]
+        
+        index = TrigramSearchIndex(symbol_data_manager.get_symbols(project_id), index_paths=False)
+        self.cache.set(key, (nodes_hash, index), index.estimate_size())
+        return index
+    
+    def invalidate(self, graph_data_manager, project_id: str):
+        """Drop the cached fuzzy index for a project"""
+        key = (graph_data_manager.db.db_path, project_id)
+        self.cache.invalidate(lambda cache_key: cache_key == key)
+
+symbol_index = SymbolIndex()
@@ -0,0 +1,244 @@
+# backend/src/services/search/TrigramSearchIndex.py
+import re
+import json
+import math
+import heapq
+import threading
+from array import array
+from collections import Counter
+from bisect import bisect_left
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+# Splits identifiers and paths into segments: separators plus camelCase humps
+_SEGMENT_SEPARATORS = re.compile(r'[\s/\\._\-]+')
+_CAMEL_BOUNDARY = re.compile(r'[A-Z]+(?=[A-Z][a-z0-9])|[A-Z]?[a-z0-9]+|[A-Z]+')
+
+def split_segments(text: str) -> List[str]:
+    """Split a name or path into lowercase segments (``GraphDataManager.py`` -> graph, data, manager, py)"""
+    segments = []
+    for part in _SEGMENT_SEPARATORS.split(text):
+        segments.extend(match.lower() for match in _CAMEL_BOUNDARY.findall(part))
+    return segments
+
+def trigrams(text: str) -> set:
+    """Distinct trigrams of a lowercase string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class TrigramSearchIndex:
+    """Inverted trigram index over node names and paths.
+    
+    Each indexed node gets a dense document id; postings map a trigram to a
+    sorted ``array`` of document ids. Segment initials (``gdm`` for
+    ``GraphDataManager``) are indexed alongside the name so acronym queries
+    find candidates too. Removed or replaced nodes are tombstoned and their
+    replacements appended, which keeps postings sorted without rewriting
+    them; the index compacts itself once tombstones dominate. Path indexing
+    can be turned off for name-only lookups such as symbols.
+    """
+    
+    # Minimum fraction of query trigrams a fuzzy candidate must contain
+    MIN_TRIGRAM_OVERLAP = 0.5
+    
+    # Fuzzy candidates scored per requested result
+    FUZZY_CANDIDATE_FACTOR = 5
+    
+    # Rebuild postings once this fraction of documents is tombstoned
+    COMPACT_RATIO = 0.25
+    
+    def __init__(self, nodes: Iterable[Dict[str, Any]] = (), index_paths: bool = True):
+        self.index_paths = index_paths
+        self._lock = threading.RLock()
+        self._reset()
+        for node in nodes:
+            self._add(node)
+    
+    def _reset(self):
+        self._nodes: List[Optional[Dict[str, Any]]] = []
+        self._names: List[str] = []
+        self._paths: List[str] = []
+        self._initials: List[str] = []
+        self._payload_sizes: List[int] = []
+        self._payload_bytes = 0
+        self._postings: Dict[str, array] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._dead = 0
+    
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+    
+    def _add(self, node: Dict[str, Any]):
+        node_id = node.get('id')
+        if node_id in self._doc_ids:
+            self._remove(node_id)
+        
+        doc_id = len(self._nodes)
+        name = node.get('name', '') or ''
+        path = (node.get('path', '') or '').replace('\\', '/') if self.index_paths else ''
+        initials = ''.join(segment[0] for segment in split_segments(name))
+        # Retained node dicts are counted at their serialized size
+        payload_size = len(json.dumps(node, separators=(',', ':'), default=str))
+        
+        self._nodes.append(node)
+        self._payload_sizes.append(payload_size)
+        self._payload_bytes += payload_size
+        self._names.append(name.lower())
+        self._paths.append(path.lower())
+        self._initials.append(initials)
+        self._doc_ids[node_id] = doc_id
+        
+        for gram in trigrams(name.lower()) | trigrams(path.lower()) | trigrams(initials):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('I')
+            postings.append(doc_id)
+    
+    def _remove(self, node_id: str):
+        doc_id = self._doc_ids.pop(node_id, None)
+        if doc_id is not None:
+            self._nodes[doc_id] = None
+            self._payload_bytes -= self._payload_sizes[doc_id]
+            self._dead += 1
+    
+    def apply_changes(self, upserted_nodes: Iterable[Dict[str, Any]] = (), removed_ids: Iterable[str] = ()):
+        """Add or replace nodes and drop removed ones in place"""
+        with self._lock:
+            for node_id in removed_ids:
+                self._remove(node_id)
+            for node in upserted_nodes:
+                self._add(node)
+            
+            if self._nodes and self._dead > len(self._nodes) * self.COMPACT_RATIO:
+                live_nodes = [node for node in self._nodes if node is not None]
+                self._reset()
+                for node in live_nodes:
+                    self._add(node)
+    
+    def search(self, query: str, limit: int = 20) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to ``limit`` (node, score) pairs, best first.
+        
+        Whitespace-separated terms must all match; a node's score is the
+        mean of its per-term scores.
+        """
+        terms = [term for term in query.lower().replace('\\', '/').split() if term]
+        if not terms or limit <= 0:
+            return []
+        
+        with self._lock:
+            candidates = None
+            for term in terms:
+                term_candidates = self._candidates(term, limit)
+                if candidates is None:
+                    candidates = {doc_id: [overlap] for doc_id, overlap in term_candidates.items()}
+                else:
+                    candidates = {
+                        doc_id: overlaps + [term_candidates[doc_id]]
+                        for doc_id, overlaps in candidates.items() if doc_id in term_candidates
+                    }
+                if not candidates:
+                    return []
+            
+            scored = []
+            for doc_id, overlaps in candidates.items():
+                total = 0.0
+                for term, overlap in zip(terms, overlaps):
+                    score = self._score(term, doc_id, overlap)
+                    if score <= 0:
+                        break
+                    total += score
+                else:
+                    scored.append((total / len(terms), -len(self._paths[doc_id]), doc_id))
+            
+            best = heapq.nlargest(limit, scored)
+            return [(self._nodes[doc_id], round(score, 4)) for score, _, doc_id in best]
+    
+    def _candidates(self, term: str, limit: int) -> Dict[int, float]:
+        """Documents that may match a term, mapped to the fraction of its trigrams they contain.
+        
+        Widens to fuzzy matches only when exact ones are scarce.
+        """
+        grams = trigrams(term)
+        if not grams:
+            # Too short for trigrams: scan the lowered string tables, which is
+            # still far cheaper than scanning every node dict
+            return {
+                doc_id: 1.0 for doc_id, name in enumerate(self._names)
+                if self._nodes[doc_id] is not None
+                and (term in name or term in self._paths[doc_id]
+                     or self._initials[doc_id].startswith(term))
+            }
+        
+        postings = sorted((self._postings.get(gram, array('I')) for gram in grams), key=len)
+        
+        # Exact pass: intersect from the rarest posting list outwards
+        exact = {doc_id for doc_id in postings[0] if self._nodes[doc_id] is not None}
+        for posting in postings[1:]:
+            if not exact:
+                break
+            exact = {doc_id for doc_id in exact if self._contains(posting, doc_id)}
+        
+        candidates = dict.fromkeys(exact, 1.0)
+        if len(candidates) >= limit:
+            return candidates
+        
+        # Fuzzy pass for typos: count trigram hits per document. Counter
+        # consumes the arrays in C, which beats per-document lookups when
+        # the query is made of common trigrams. Fuzzy matches cannot be
+        # substrings, so only the best-overlapping few are worth scoring.
+        required = max(1, math.ceil(len(grams) * self.MIN_TRIGRAM_OVERLAP))
+        hits = Counter()
+        for posting in postings:
+            hits.update(posting)
+        
+        fuzzy = heapq.nlargest(
+            limit * self.FUZZY_CANDIDATE_FACTOR,
+            (item for item in hits.items()
+             if item[1] >= required and item[0] not in candidates and self._nodes[item[0]] is not None),
+            key=lambda item: item[1]
+        )
+        for doc_id, count in fuzzy:
+            candidates[doc_id] = count / len(grams)
+        return candidates
+    
+    @staticmethod
+    def _contains(posting: array, doc_id: int) -> bool:
+        index = bisect_left(posting, doc_id)
+        return index < len(posting) and posting[index] == doc_id
+    
+    def _score(self, term: str, doc_id: int, overlap: float) -> float:
+        """Score one term against a document (0 means no match)"""
+        name = self._names[doc_id]
+        path = self._paths[doc_id]
+        stem = name.rsplit('.', 1)[0]
+        
+        if term == name or term == stem:
+            return 1.0
+        if name.startswith(term):
+            return 0.9
+        if len(term) >= 2 and self._initials[doc_id].startswith(term):
+            return 0.85
+        
+        position = name.find(term)
+        if position > 0:
+            return 0.8 if self._at_boundary(self._nodes[doc_id].get('name', ''), position) else 0.7
+        
+        position = path.find(term)
+        if position >= 0 and path:
+            return 0.6 if position == 0 or path[position - 1] == '/' else 0.5
+        
+        # Trigram overlap only counts as a fuzzy match when it is incomplete;
+        # all trigrams present without a substring hit is scattered noise
+        if overlap >= 1.0 or overlap < self.MIN_TRIGRAM_OVERLAP:
+            return 0.0
+        return 0.4 * overlap
+    
+    @staticmethod
+    def _at_boundary(original: str, position: int) -> bool:
+        """Whether a match starts a segment (after a separator or on a camelCase hump)"""
+        previous, current = original[position - 1], original[position]
+        return (not previous.isalnum()) or (previous.islower() and current.isupper())
+    
+    def estimate_size(self) -> int:
+        """Approximate memory held by postings, string tables and live nodes, in bytes"""
+        postings = sum(posting.itemsize * len(posting) + 64 for posting in self._postings.values())
+        strings = sum(len(name) + len(path) + 100 for name, path in zip(self._names, self._paths))
+        return postings + strings + self._payload_bytes
@@ -2,7 +2,9 @@
 import json
 import os
 import hashlib
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Callable, Hashable
 from datetime import datetime, timedelta
 
 class CacheUtils:
@@ -53,4 +55,77 @@ class CacheUtils:
             
         except Exception as e:
             print(f"Failed to get cache: {e}")
-            return None
\ No newline at end of file
+            return None
+
+class MemoryLRUCache:
+    """Thread-safe in-process LRU cache bounded by entry count and approximate size"""
+    
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value and mark it as most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def set(self, key: Hashable, value: Any, size: int = 0):
+        """Store a value, evicting least recently used entries when over budget"""
+        with self._lock:
+            # Never cache a single value larger than the whole budget
+            if size > self.max_bytes:
+                return
+            
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     self.current_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove all entries whose key matches the predicate"""
+        with self._lock:
+            stale_keys = [key for key in self._entries if predicate(key)]
+            for key in stale_keys:
+                self.current_bytes -= self._entries.pop(key)[1]
+            return len(stale_keys)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss and memory statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -1,5 +1,6 @@
 # backend/src/utils/FileUtils.py
 import os
+import tempfile
 import mimetypes
 import magic
 from typing import List, Optional
@@ -82,12 +83,29 @@ class FileUtils:
         # Ensure directory exists
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write a sibling and swap it in: checkouts may hardlink into the
+        # shared blob store, so writing through the existing inode would
+        # change every project sharing the file
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # mkstemp creates 0600; the written file is the project's own copy
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, file_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
     
     @staticmethod
     def get_directory_size(directory: str) -> int:
         """Get total size of directory in bytes"""
+        # Repository checkouts are answered from their manifest
+        from services.git.RepositoryManifest import RepositoryManifest
+        manifest = RepositoryManifest.load(directory)
+        if manifest is not None:
+            return manifest.total_size()
+        
         total_size = 0
         for dirpath, dirnames, filenames in os.walk(directory):
             for filename in filenames:
@@ -27,6 +27,15 @@ class ValidationUtils:
             re.match(ssh_pattern, url)
         )
     
+    @staticmethod
+    def is_valid_git_ref(ref: str) -> bool:
+        """Validate a branch, tag or commit name"""
+        if not ref or not isinstance(ref, str) or len(ref) > 255:
+            return False
+        if ref.startswith(('-', '/')) or ref.endswith(('/', '.', '.lock')) or '..' in ref or '@{' in ref:
+            return False
+        return re.match(r'^[\w\-./]+$', ref) is not None
+    
     @staticmethod
     def is_valid_uuid(uuid_string: str) -> bool:
         """Validate UUID format"""
@@ -56,6 +65,19 @@ class ValidationUtils:
         
         return True
     
+    @staticmethod
+    def is_importable_path(path: str, roots: List[str]) -> bool:
+        """Check that an absolute path resolves (symlinks included) inside one of ``roots``"""
+        if not path or not isinstance(path, str) or not os.path.isabs(path):
+            return False
+        
+        resolved = os.path.realpath(path)
+        for root in roots:
+            root = os.path.realpath(root)
+            if resolved == root or resolved.startswith(root.rstrip(os.sep) + os.sep):
+                return True
+        return False
+    
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe file system operations"""
@@ -29,7 +29,13 @@ const HomePage = () => {
       
       if (response.ok) {
         const { projectId } = await response.json();
-        navigate(`/project/${projectId}?version=${version}`);
+        const job = await waitForAnalysis(projectId);
+        
+        if (job.status === 'completed') {
+          navigate(`/project/${projectId}?version=${version}`);
+        } else {
+          setStatus(job.error || `Analysis ${job.status}`);
+        }
       }
     } catch (error) {
       console.error('Analysis failed:', error);
@@ -38,6 +44,25 @@ const HomePage = () => {
     setLoading(false);
   };
 
+  const waitForAnalysis = async (projectId) => {
+    // Poll the background analysis job until it finishes
+    while (true) {
+      const response = await fetch(`/api/repository/${projectId}/status`);
+      const job = await response.json();
+      
+      setProgress(Math.round(job.progress || 0));
+      if (job.stage) {
+        setStatus(`${job.stage.charAt(0).toUpperCase()}${job.stage.slice(1)}...`);
+      }
+      
+      if (!response.ok || ['completed', 'failed', 'cancelled'].includes(job.status)) {
+        return job;
+      }
+      
+      await new Promise(resolve => setTimeout(resolve, 1000));
+    }
+  };
+
   return (
     <div className="home-page">
       <header className="home-header">
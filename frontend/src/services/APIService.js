@@ -46,13 +46,48 @@ class APIService {
   }
 
   // Repository Management
-  async analyzeRepository(gitUrl, version = 'personalized') {
+  async analyzeRepository(gitUrl, version = 'personalized', ref) {
     return this.request('/repository/analyze', {
       method: 'POST',
-      body: JSON.stringify({ gitUrl, version })
+      body: JSON.stringify(ref ? { gitUrl, version, ref } : { gitUrl, version })
     });
   }
 
+  async importLocalRepository(path, version = 'personalized') {
+    return this.request('/repository/import', {
+      method: 'POST',
+      body: JSON.stringify({ path, version })
+    });
+  }
+
+  async uploadRepositoryArchive(file, version = 'personalized') {
+    const formData = new FormData();
+    formData.append('archive', file);
+    formData.append('version', version);
+
+    // Let the browser set the multipart boundary
+    return this.request('/repository/upload', {
+      method: 'POST',
+      headers: {},
+      body: formData
+    });
+  }
+
+  async analyzeRepositoryHistory(gitUrl, { ref, commits } = {}) {
+    return this.request('/repository/history', {
+      method: 'POST',
+      body: JSON.stringify({ gitUrl, ref, commits })
+    });
+  }
+
+  async getRepositoryHistory(jobId) {
+    return this.request(`/repository/${jobId}/history`);
+  }
+
+  async getAnalysisQueue() {
+    return this.request('/repository/queue');
+  }
+
   async getProjectData(projectId) {
     return this.request(`/project/${projectId}`);
   }
@@ -61,6 +96,23 @@ class APIService {
     return this.request(`/repository/${projectId}/status`);
   }
 
+  async watchRepository(projectId, backend) {
+    return this.request(`/repository/${projectId}/watch`, {
+      method: 'POST',
+      body: JSON.stringify(backend ? { backend } : {})
+    });
+  }
+
+  async unwatchRepository(projectId) {
+    return this.request(`/repository/${projectId}/watch`, {
+      method: 'DELETE'
+    });
+  }
+
+  async getWatchStats(projectId) {
+    return this.request(`/repository/${projectId}/watch`);
+  }
+
   // File Operations
   async getFileContent(filePath) {
     return this.request(`/files/${encodeURIComponent(filePath)}`);
@@ -77,19 +129,92 @@ class APIService {
     return this.request(`/files/${encodeURIComponent(filePath)}/dependencies`);
   }
 
+  async openEditorBuffer(filePath, projectId, content, versionId) {
+    return this.request(`/files/${encodeURIComponent(filePath)}/edits`, {
+      method: 'POST',
+      body: JSON.stringify({ project_id: projectId, content, versionId })
+    });
+  }
+
+  async sendEditorEdits(filePath, projectId, changes, baseVersionId, versionId) {
+    // changes: Monaco IModelContentChange[] from onDidChangeModelContent
+    return this.request(`/files/${encodeURIComponent(filePath)}/edits`, {
+      method: 'POST',
+      body: JSON.stringify({
+        project_id: projectId,
+        edits: changes.map(({ range, text }) => ({ range, text })),
+        baseVersionId,
+        versionId
+      })
+    });
+  }
+
   async getFileDependents(filePath) {
     return this.request(`/files/${encodeURIComponent(filePath)}/dependents`);
   }
 
   // Graph Operations
-  async getGraphData(projectId) {
-    return this.request(`/graph/${projectId}`);
+  async getGraphData(projectId, { fields, exclude } = {}) {
+    // Optional sparse fieldsets, e.g. fields: ['id', 'path', 'language']
+    const params = new URLSearchParams();
+    if (fields) params.set('fields', fields.join(','));
+    if (exclude) params.set('exclude', exclude.join(','));
+    const query = params.toString();
+    return this.request(`/graph/${projectId}${query ? `?${query}` : ''}`);
+  }
+
+  async getGraphBinary(projectId) {
+    // Typed-array graph layout, decoded with GraphBinaryDecoder
+    const response = await fetch(`${this.baseURL}/graph/${projectId}?format=binary`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.arrayBuffer();
+  }
+
+  async getNodeDetails(projectId, nodeId) {
+    return this.request(`/graph/${projectId}/nodes/${encodeURIComponent(nodeId)}`);
+  }
+
+  async streamGraphData(projectId, onRecord) {
+    // NDJSON stream: header, nodes, edges, metrics, centrality, end
+    const response = await fetch(`${this.baseURL}/graph/${projectId}?stream=ndjson`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+
+      let newline;
+      while ((newline = buffer.indexOf('\n')) >= 0) {
+        const line = buffer.slice(0, newline).trim();
+        buffer = buffer.slice(newline + 1);
+        if (line) onRecord(JSON.parse(line));
+      }
+
+      if (done) break;
+    }
   }
 
   async getCentralityData(projectId) {
     return this.request(`/graph/${projectId}/centrality`);
   }
 
+  async analyzeCoChanges(projectId, { commits, minSupport, minConfidence } = {}) {
+    // Queues a job adding churn attributes to nodes and weighted 'co-change'
+    // edges; poll the returned statusUrl (getRepositoryStatus(jobId))
+    return this.request(`/graph/${projectId}/cochange`, {
+      method: 'POST',
+      body: JSON.stringify({ commits, minSupport, minConfidence })
+    });
+  }
+
   async updateGraphData(projectId, graphData) {
     return this.request(`/graph/${projectId}`, {
       method: 'PUT',
@@ -152,6 +277,14 @@ class APIService {
     });
   }
 
+  async searchSymbols(projectId, query, { kind, mode, limit } = {}) {
+    const params = new URLSearchParams({ q: query });
+    if (kind) params.set('kind', kind);
+    if (mode) params.set('mode', mode);
+    if (limit) params.set('limit', String(limit));
+    return this.request(`/graph/${projectId}/symbols?${params}`);
+  }
+
   // Suggestions
   async getSuggestions(currentFile, context = {}) {
     return this.request('/suggestions', {
@@ -0,0 +1,52 @@
+// frontend/src/services/GraphBinaryDecoder.js
+// Decodes the ?format=binary graph payload into typed arrays that can be
+// handed to WebGL buffers without any per-node JSON work.
+
+const MAGIC = 'CFGB';
+
+const ARRAY_TYPES = {
+  int32: Int32Array,
+  uint32: Uint32Array,
+  float32: Float32Array,
+  utf8: Uint8Array
+};
+
+export function decodeGraphBinary(buffer) {
+  const header = new DataView(buffer, 0, 8);
+  const magic = String.fromCharCode(
+    header.getUint8(0), header.getUint8(1), header.getUint8(2), header.getUint8(3)
+  );
+  if (magic !== MAGIC) {
+    throw new Error('Invalid graph binary payload');
+  }
+
+  const manifestLength = header.getUint32(4, true);
+  const decoder = new TextDecoder();
+  const manifest = JSON.parse(decoder.decode(new Uint8Array(buffer, 8, manifestLength)));
+  const bodyStart = 8 + manifestLength;
+
+  const sections = {};
+  manifest.sections.forEach(({ name, type, offset, count }) => {
+    const ArrayType = ARRAY_TYPES[type];
+    sections[name] = new ArrayType(buffer, bodyStart + offset, count);
+  });
+
+  const offsets = sections['strings.offsets'];
+  const data = sections['strings.data'];
+  const stringCache = new Array(manifest.stringCount);
+
+  const getString = (index) => {
+    if (stringCache[index] === undefined) {
+      stringCache[index] = decoder.decode(data.subarray(offsets[index], offsets[index + 1]));
+    }
+    return stringCache[index];
+  };
+
+  return {
+    graphVersion: manifest.graphVersion,
+    nodeCount: manifest.nodeCount,
+    edgeCount: manifest.edgeCount,
+    sections,
+    getString
+  };
+}
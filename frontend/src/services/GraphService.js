@@ -30,6 +30,110 @@ class GraphService {
     }
   }
 
+  async streamGraphData(projectId) {
+    // Notify subscribers with node batches so the view can start placing
+    // nodes before the whole graph has downloaded
+    const graph = { nodes: [], edges: [], metrics: {}, centrality_scores: {} };
+    let pendingNodes = [];
+
+    const flushNodes = () => {
+      if (pendingNodes.length === 0) return;
+      this.notify({ type: 'graph_nodes_streamed', data: pendingNodes });
+      pendingNodes = [];
+    };
+
+    try {
+      await APIService.streamGraphData(projectId, (record) => {
+        switch (record.kind) {
+          case 'node':
+            graph.nodes.push(record.data);
+            pendingNodes.push(record.data);
+            if (pendingNodes.length >= 500) flushNodes();
+            break;
+          case 'edge':
+            flushNodes();
+            graph.edges.push(record.data);
+            break;
+          case 'metrics':
+            graph.metrics = record.data;
+            break;
+          case 'centrality':
+            graph.centrality_scores = record.data;
+            break;
+          default:
+            break;
+        }
+      });
+      flushNodes();
+
+      this.currentGraph = graph;
+      this.notify({ type: 'graph_loaded', data: graph });
+      return graph;
+    } catch (error) {
+      console.error('Failed to stream graph data:', error);
+      throw error;
+    }
+  }
+
+  connectLiveUpdates(projectId) {
+    // EventSource resends Last-Event-ID on reconnect, so missed deltas are replayed
+    this.disconnectLiveUpdates();
+    this.eventSource = new EventSource(`${APIService.baseURL}/graph/${projectId}/events`);
+
+    this.eventSource.addEventListener('graph_delta', (event) => {
+      const delta = JSON.parse(event.data);
+      this.applyDelta(delta);
+      this.notify({ type: 'graph_delta', data: delta });
+    });
+
+    this.eventSource.addEventListener('reset', async () => {
+      // The server no longer holds the events we missed
+      await this.loadGraphData(projectId);
+    });
+  }
+
+  disconnectLiveUpdates() {
+    if (this.eventSource) {
+      this.eventSource.close();
+      this.eventSource = null;
+    }
+  }
+
+  applyDelta(delta) {
+    if (!this.currentGraph) return;
+
+    const edgeKey = (edge) => {
+      const source = typeof edge.source === 'string' ? edge.source : edge.source?.id;
+      const target = typeof edge.target === 'string' ? edge.target : edge.target?.id;
+      return `${source}|${target}|${edge.type || 'unknown'}|${edge.line || 0}`;
+    };
+
+    const removedNodes = new Set(delta.nodesRemoved || []);
+    const updates = new Map((delta.nodesUpdated || []).map(update => [update.id, update]));
+    const nodes = this.currentGraph.nodes
+      .filter(node => !removedNodes.has(node.id))
+      .map(node => {
+        const update = updates.get(node.id);
+        if (!update) return node;
+        const updated = { ...node, ...update.changes };
+        (update.removedAttributes || []).forEach(key => delete updated[key]);
+        return updated;
+      })
+      .concat(delta.nodesAdded || []);
+
+    const removedEdges = new Set((delta.edgesRemoved || []).map(edgeKey));
+    const edges = (this.currentGraph.edges || [])
+      .filter(edge => !removedEdges.has(edgeKey(edge)))
+      .concat(delta.edgesAdded || []);
+
+    const centrality = { ...(this.currentGraph.centrality_scores || {}) };
+    Object.entries(delta.centrality || {}).forEach(([measure, scores]) => {
+      centrality[measure] = { ...(centrality[measure] || {}), ...scores };
+    });
+
+    this.currentGraph = { ...this.currentGraph, nodes, edges, centrality_scores: centrality };
+  }
+
   async updateGraph(updates) {
     if (!this.currentGraph) return;
 